@@ -0,0 +1,54 @@
+# ai_scheduler.py
+# Time-sliced enemy thinking. Behavior decisions (target selection, attack
+# rolls, burrow and phase choices) run for a bounded number of enemies per
+# tick, round-robin, within a budget on the time those decisions take; the
+# rest only steer and move on their last decision. With few enemies everyone thinks every tick.
+
+THINK_PER_TICK = 24     # most enemies that think in one tick
+THINK_MIN = 4           # enemies that always think, budget or not
+THINK_BUDGET_US = 1500  # microseconds of thinking per tick
+
+
+class ThinkScheduler:
+    """Decides which enemies think this tick. budget_us=None drops the time
+    budget so the choice depends only on counts, which keeps headless runs
+    reproducible."""
+    def __init__(self, per_tick=THINK_PER_TICK, budget_us=THINK_BUDGET_US, min_per_tick=THINK_MIN):
+        self.per_tick = per_tick
+        self.budget_us = budget_us
+        self.min_per_tick = min_per_tick
+        self.cursor = 0
+        # counters for the last tick
+        self.thought = 0
+        self.deferred = 0
+        self.spent_us = 0.0
+
+    def schedule(self, enemies, cost=None):
+        """Yield (enemy, think) for every enemy, starting after the last one that
+        thought in the previous tick. cost(enemy), read once the caller is done
+        with a thinking enemy, gives the seconds its decisions took and counts
+        against the budget; without it only the counts apply."""
+        n = len(enemies)
+        start = self.cursor % n if n else 0
+        budget = self.budget_us / 1e6 if self.budget_us is not None else None
+        thought = 0
+        spent = 0.0
+        for k in range(n):
+            e = enemies[(start + k) % n]
+            if thought < self.per_tick and (thought < self.min_per_tick or budget is None
+                                            or spent < budget):
+                yield e, True
+                if cost is not None:
+                    spent += cost(e)
+                thought += 1
+            else:
+                yield e, False
+        self.cursor = start + thought
+        self.thought = thought
+        self.deferred = n - thought
+        self.spent_us = spent * 1e6
+
+
+def think_time(enemy):
+    """Seconds the enemy's last think() took, as recorded by Enemy.update."""
+    return enemy.think_time
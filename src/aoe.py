@@ -0,0 +1,87 @@
+# aoe.py
+# Area-of-effect system: owns every active AOE (Worry Spheres today) and
+# resolves all effect-vs-target overlaps in one batched pass per tick.
+import game_clock
+from bisect import bisect_left, bisect_right
+
+
+def resolve_hits(effects, targets, now):
+    """Apply every effect to the targets inside its radius, respecting tick cooldowns.
+    Returns the (effect, target) pairs that took damage.
+
+    Target centers are read once and sorted by x, so each effect only
+    tests the slice of targets within its horizontal reach. Cooldown
+    entries for targets that are no longer present are dropped.
+    """
+    if not effects:
+        return []
+    n = len(targets)
+    xs = [0] * n
+    ys = [0] * n
+    for i, t in enumerate(targets):
+        xs[i] = t.rect.centerx
+        ys[i] = t.rect.centery
+    order = sorted(range(n), key=xs.__getitem__)
+    sorted_x = [xs[i] for i in order]
+    live = {id(t) for t in targets}
+    hits = []
+
+    for fx in effects:
+        # forget targets that died or despawned so ids can't be confused later
+        if fx.last_tick:
+            for key in [k for k in fx.last_tick if k not in live]:
+                del fx.last_tick[key]
+        r = fx.radius(now)
+        if r <= 0:
+            continue
+        r2 = r * r
+        lo = bisect_left(sorted_x, fx.x - r)
+        hi = bisect_right(sorted_x, fx.x + r)
+        for k in range(lo, hi):
+            i = order[k]
+            dx = sorted_x[k] - fx.x
+            dy = ys[i] - fx.y
+            if dx*dx + dy*dy <= r2 and fx.hit(targets[i], now):
+                hits.append((fx, targets[i]))
+    return hits
+
+
+class AOESystem:
+    """Collection of active area effects updated and drawn together.
+
+    Effects need x, y, a last_tick dict, radius(now), expired(now),
+    hit(target, now) -> bool and draw(surf, camera_x, shake_y).
+    """
+    def __init__(self):
+        self.effects = []
+
+    def __len__(self):
+        return len(self.effects)
+
+    def __iter__(self):
+        return iter(self.effects)
+
+    def add(self, effect):
+        self.effects.append(effect)
+        return effect
+
+    def clear(self):
+        self.effects = []
+
+    def update(self, targets, now=None):
+        """Drop expired effects and apply the rest; returns the (effect, target)
+        hits of this tick."""
+        if now is None:
+            now = game_clock.now()
+        alive = []
+        for fx in self.effects:
+            if fx.expired(now):
+                fx.dead = True
+            else:
+                alive.append(fx)
+        self.effects = alive
+        return resolve_hits(alive, targets, now)
+
+    def draw(self, surf, camera_x=0, shake_y=0):
+        for fx in self.effects:
+            fx.draw(surf, camera_x, shake_y)
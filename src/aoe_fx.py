@@ -0,0 +1,140 @@
+# aoe_fx.py
+# Pre-rendered animation frames for area-of-effect visuals (Worry Sphere and
+# the Worrier attack rings). Frames are built once per parameter set at
+# quantized radius/alpha steps and played back by index, so drawing an AOE
+# is a single blit instead of building surfaces every frame.
+import math
+import random
+import pygame
+
+# Number of radius steps for an expanding sphere (radius 0 .. max_radius)
+SPHERE_STEPS = 40
+# Phases of the Worrier aura wave baked per attack frame
+RING_PHASES = 8
+# Sizes are padded by the aura wave so it is never clipped
+WAVE_AMPLITUDE = 5
+
+_animations = {}
+
+
+class AOEAnimation:
+    """A list of pre-rendered frames, optionally with several phases per frame.
+
+    frames[i][phase] is a (surface, offset) pair where offset is the distance
+    from the effect's center to the surface's top-left corner.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, index, phase=0):
+        index = max(0, min(len(self.frames) - 1, index))
+        variants = self.frames[index]
+        return variants[phase % len(variants)]
+
+    def blit(self, surf, cx, cy, index, phase=0):
+        """Draw frame index centered at (cx, cy)."""
+        image, offset = self.frame(index, phase)
+        if image is not None:
+            surf.blit(image, (cx - offset, cy - offset))
+
+
+def _render_sphere(radius, alpha, color):
+    if radius <= 0:
+        return (None, 0)
+    s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(s, (*color, alpha), (radius, radius), radius)
+    return (s, radius)
+
+
+def sphere_animation(max_radius, color=(255, 160, 180), steps=SPHERE_STEPS):
+    """Expanding translucent sphere: step i has radius max_radius*i/steps and fades out."""
+    key = ("sphere", max_radius, color, steps)
+    anim = _animations.get(key)
+    if anim is None:
+        frames = []
+        for i in range(steps + 1):
+            progress = i / steps
+            radius = int(max_radius * progress)
+            alpha = int(200 * (1 - progress))
+            frames.append([_render_sphere(radius, alpha, color)])
+        anim = _animations[key] = AOEAnimation(frames)
+    return anim
+
+
+def sphere_index(progress, steps=SPHERE_STEPS):
+    """Frame index for a sphere at the given 0..1 progress."""
+    return int(progress * steps + 0.5)
+
+
+def _render_rings(sphere_radius, progress, phase, rng, rings=3, particles=5, wave=True):
+    size = sphere_radius * 2 + 4 + WAVE_AMPLITUDE * 2
+    center = size // 2
+    s = pygame.Surface((size, size), pygame.SRCALPHA)
+    for i in range(rings):
+        ring_progress = progress * (1 - i * 0.2)
+        if ring_progress <= 0:
+            continue
+        ring_radius = int(sphere_radius * (1 - i * 0.2))
+        ring_alpha = int(200 * ring_progress)
+
+        # Expanding ring
+        pygame.draw.circle(s, (255, 180, 180, ring_alpha), (center, center), ring_radius, 3)
+
+        # Energy particles
+        for _ in range(particles):
+            particle_angle = rng.uniform(0, math.pi * 2)
+            particle_dist = rng.uniform(0.5, 0.9) * ring_radius
+            particle_x = center + math.cos(particle_angle) * particle_dist
+            particle_y = center + math.sin(particle_angle) * particle_dist
+            particle_size = rng.randint(2, 4)
+            pygame.draw.circle(s, (255, 80, 80, ring_alpha),
+                               (int(particle_x), int(particle_y)), particle_size)
+
+        # Aura wave
+        if not wave:
+            continue
+        wave_points = []
+        num_points = 20
+        for j in range(num_points):
+            angle = j * (2 * math.pi / num_points)
+            wave = math.sin(angle * 4 + phase) * WAVE_AMPLITUDE
+            wave_points.append((center + math.cos(angle) * (ring_radius + wave),
+                                center + math.sin(angle) * (ring_radius + wave)))
+        pygame.draw.lines(s, (255, 120, 120, ring_alpha), True, wave_points, 2)
+    return (s, center)
+
+
+def ring_animation(attack_range, attack_frames=12, phases=RING_PHASES, rings=3, particles=5, wave=True):
+    """Worrier attack rings indexed by remaining attack frame, with several wave phases each.
+    rings / particles / wave select the effect density (see quality.py)."""
+    key = ("rings", attack_range, attack_frames, phases, rings, particles, wave)
+    anim = _animations.get(key)
+    if anim is None:
+        # fixed seed so particle layouts are stable between runs
+        rng = random.Random(attack_range * 1000 + attack_frames)
+        frames = []
+        for f in range(attack_frames + 1):
+            progress = f / float(attack_frames)
+            sphere_radius = int(attack_range * progress)
+            if sphere_radius <= 0:
+                frames.append([(None, 0)])
+                continue
+            frames.append([_render_rings(sphere_radius, progress, p * 2 * math.pi / phases, rng,
+                                         rings, particles, wave)
+                           for p in range(phases)])
+        anim = _animations[key] = AOEAnimation(frames)
+    return anim
+
+
+def tier_rings(attack_range, fx):
+    """ring_animation at the ring density of quality tier fx."""
+    return ring_animation(attack_range, rings=fx.worrier_rings,
+                          particles=fx.ring_particles, wave=fx.ring_wave)
+
+
+def ring_phase(now, phases=RING_PHASES):
+    """Wave phase index for a timestamp (the wave turns at 10 rad/s)."""
+    return int((now * 10) / (2 * math.pi) * phases) % phases
@@ -0,0 +1,70 @@
+# archetypes.py
+# Enemy archetypes loaded from enemies.json: stats, physics constants,
+# hitbox and behavior per kind. Enemy copies an archetype onto itself and
+# binds its behavior handler once at spawn, so per-frame code reads plain
+# attributes instead of comparing kind or behavior names. A new enemy kind
+# is a new entry in the file; "sprite" picks which procedural sprite it uses.
+import json
+import os
+from collections import namedtuple
+
+ARCHETYPE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "enemies.json")
+
+# behavior name -> Enemy method that runs it
+BEHAVIORS = {
+    "patrol": "update_grub_behavior",
+    "chase": "update_spider_behavior",
+    "bounce": "update_slime_behavior",
+    "phase": "update_ghost_behavior",
+}
+
+Archetype = namedtuple("Archetype", [
+    "kind", "sprite", "behavior",
+    "max_health", "speed", "damage", "attack_range", "attack_cooldown",
+    "wide_attack",   # grub-style attack area, twice the usual size
+    "gravity", "max_fall",
+    "wall_jump",     # chance to jump instead of turning when walking into a wall
+    "phasing",       # moves through tiles, no gravity, fades in and out
+    "hitbox",        # (left, top, right, bottom) insets from the sprite rect
+    "state",         # kind-specific attributes and their starting values
+])
+
+REQUIRED = ("behavior", "max_health", "speed", "damage", "attack_range", "attack_cooldown")
+DEFAULTS = {"wide_attack": False, "gravity": 0.7, "max_fall": 12, "wall_jump": 0.0,
+            "phasing": False, "hitbox": (4, 4, 4, 4)}
+
+
+def parse_archetype(kind, spec):
+    missing = [name for name in REQUIRED if name not in spec]
+    if missing:
+        raise ValueError(f"enemy archetype {kind!r} is missing {', '.join(missing)}")
+    if spec["behavior"] not in BEHAVIORS:
+        raise ValueError(f"enemy archetype {kind!r} has unknown behavior {spec['behavior']!r}")
+    values = {**DEFAULTS, **spec}
+    unknown = set(values) - set(Archetype._fields)
+    if unknown:
+        raise ValueError(f"enemy archetype {kind!r} has unknown fields {', '.join(sorted(unknown))}")
+    values["kind"] = kind
+    values.setdefault("sprite", kind)
+    values["hitbox"] = tuple(values["hitbox"])
+    values.setdefault("state", {})
+    return Archetype(**values)
+
+
+def load_archetypes(path=ARCHETYPE_PATH):
+    """{kind: Archetype} in file order."""
+    with open(path) as f:
+        data = json.load(f)
+    return {kind: parse_archetype(kind, spec) for kind, spec in data.items()}
+
+
+ARCHETYPES = load_archetypes()
+# kinds in file order; indices are used as event tags and in snapshots
+ENEMY_KINDS = tuple(ARCHETYPES)
+
+
+def archetype(kind):
+    try:
+        return ARCHETYPES[kind]
+    except KeyError:
+        raise ValueError(f"unknown enemy kind {kind!r}") from None
@@ -1,9 +1,16 @@
 # assets.py
 # Procedural pixel art generator. All sprites are generated at runtime using pixel patterns
 import pygame
+from functools import lru_cache
 from settings import PIXEL_SCALE, VIRTUAL_WIDTH, VIRTUAL_HEIGHT
 import math
 
+# Every enemy kind with a sprite below
+ENEMY_KINDS = ("grub", "spider", "slime", "ghost")
+
+# Generators below are pure, so results are cached and shared; callers copy
+# or flip the surfaces before changing them.
+
 def make_surface(w, h):
     """Create a small 'pixel' surface (not scaled)."""
     # use SRCALPHA so we can scale cleanly
@@ -14,6 +21,7 @@ def scale_surface(surf):
     size = (surf.get_width() * PIXEL_SCALE, surf.get_height() * PIXEL_SCALE)
     return pygame.transform.scale(surf, size)
 
+@lru_cache(maxsize=None)
 def generate_player_sprite(char_class="Wizard"):
     """Return (idle_surf, attack_surf, dash_surf) scaled surfaces for player."""
     base_w, base_h = 12, 18
@@ -86,6 +94,7 @@ def generate_player_sprite(char_class="Wizard"):
 
     return scale_surface(idle), scale_surface(attack), scale_surface(dash)
 
+@lru_cache(maxsize=None)
 def generate_enemy_sprite(kind="grub"):
     """Detailed enemy pixel art surface with unique designs per type"""
     w, h = 16, 16
@@ -190,6 +199,7 @@ def generate_enemy_sprite(kind="grub"):
     
     return scale_surface(s)
 
+@lru_cache(maxsize=None)
 def generate_tile(tile_type="grass"):
     """Return a small tile surface (16x16) scaled up"""
     w,h = 16,16
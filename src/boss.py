@@ -1,16 +1,24 @@
 import pygame
 import random
+from world_ui import BOSS_BAR, bar_frame
+from projectiles import BOSS_SHOT
+from physics import Body
+import game_clock
 
 class Boss:
     def __init__(self, x, y):
         self.rect = pygame.Rect(x, y, 64, 64)  # larger than normal enemies
+        self.body = Body()
         self.health = 200
         self.vx = 0
         self.vy = 0
-        self.attack_timer = 0
+        self.attack_timer = 0       # seconds since the last shot
         self.attack_cooldown = 1.5  # seconds between attacks
+        self.last_update = game_clock.now()
         self.dead = False
         self.color = (150, 50, 50)  # reddish color
+        # (kind, dir_x, dir_y) of a projectile to fire, collected by the game each frame
+        self.shot = None
 
     def update(self, tiles, player_rect):
         if self.dead:
@@ -20,6 +28,14 @@ class Boss:
         dx = player_rect.centerx - self.rect.centerx
         self.vx = 2 if dx > 0 else -2
         
+        # Aimed shot every attack_cooldown seconds of game time
+        now = game_clock.now()
+        self.attack_timer += now - self.last_update
+        self.last_update = now
+        if self.attack_timer >= self.attack_cooldown:
+            self.attack_timer = 0
+            self.shot = (BOSS_SHOT, dx, player_rect.centery - self.rect.centery)
+
         # Random jumps
         if random.random() < 0.02:  # 2% chance per update
             self.vy = -10
@@ -28,31 +44,20 @@ class Boss:
         self.vy += 0.5
         
         # Move and handle collisions
-        self.rect.x += self.vx
-        for tile in tiles:
-            if self.rect.colliderect(tile):
-                if self.vx > 0:
-                    self.rect.right = tile.left
-                else:
-                    self.rect.left = tile.right
-                self.vx = 0
-
-        self.rect.y += self.vy
-        for tile in tiles:
-            if self.rect.colliderect(tile):
-                if self.vy > 0:
-                    self.rect.bottom = tile.top
-                    self.vy = 0
-                else:
-                    self.rect.top = tile.bottom
-                    self.vy = 1
+        hit_x, hit_y = self.body.move(self.rect, self.vx, self.vy, tiles)
+        if hit_x:
+            self.vx = 0
+        if hit_y > 0:
+            self.vy = 0
+        elif hit_y < 0:
+            self.vy = 1
 
     def take_damage(self, amount):
         self.health -= amount
         if self.health <= 0:
             self.dead = True
 
-    def draw(self, surface, camera_x, shake_y=0):
+    def draw(self, surface, camera_x, shake_y=0, overlay=None):
         if not self.dead:
             # Adjust position for camera
             draw_rect = self.rect.copy()
@@ -62,10 +67,8 @@ class Boss:
             pygame.draw.rect(surface, self.color, draw_rect)
             
             # Draw health bar with camera offset
-            health_rect = pygame.Rect(
-                self.rect.x - camera_x, 
-                self.rect.y - 10 + shake_y,
-                self.rect.width * (self.health / 200), 
-                5
-            )
-            pygame.draw.rect(surface, (255, 0, 0), health_rect)
+            bar_pos = (self.rect.x - camera_x, self.rect.y - 10 + shake_y)
+            if overlay is not None:
+                overlay.add_bar(BOSS_BAR, bar_pos[0], bar_pos[1], self.health / 200)
+            else:
+                surface.blit(bar_frame(BOSS_BAR, self.health / 200), bar_pos)
@@ -1,16 +1,25 @@
 # enemy.py - Improved enemy system with better AI
 import pygame
 from assets import generate_enemy_sprite
+from world_ui import ENEMY_BAR, bar_frame
+from render_queue import target, LAYER_ENEMIES
+from projectiles import WEB
+from physics import Body
+from archetypes import archetype, BEHAVIORS
 import random
-import time
+import game_clock
+import quality
 import math
+import time
 
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, x, y, kind="grub"):
         super().__init__()
-        self.surf = generate_enemy_sprite(kind)
+        arch = archetype(kind)
+        self.surf = generate_enemy_sprite(arch.sprite)
         self.image = self.surf
         self.rect = self.image.get_rect(topleft=(x,y))
+        self.body = Body()
         self.kind = kind
         
         # Physics
@@ -31,65 +40,47 @@ class Enemy(pygame.sprite.Sprite):
         self.aggression = random.uniform(0.4, 0.8)  # How likely to attack
         self.confidence = random.uniform(0.5, 1.0)  # How close to get
         self.hit_particles = []
-        
-        # Enemy-specific stats and behaviors
-        if kind == "grub":
-            self.max_health = 35
-            self.health = self.max_health
-            self.speed = 0.8
-            self.damage = 12
-            self.attack_range = 45
-            self.attack_cooldown = 2.0
-            self.behavior = "patrol"
-            self.burrow_cooldown = 0
-            self.burrowed = False
-            self.burrow_time = 0
-            
-        elif kind == "spider":
-            self.max_health = 25
-            self.health = self.max_health
-            self.speed = 1.4
-            self.damage = 15
-            self.attack_range = 70
-            self.attack_cooldown = 1.8
-            self.behavior = "chase"
-            self.jump_cooldown = 0
-            self.web_cooldown = 0
-            self.web_charges = 2
-            
-        elif kind == "slime":
-            self.max_health = 45
-            self.health = self.max_health
-            self.speed = 0.7
-            self.damage = 10
-            self.attack_range = 35
-            self.attack_cooldown = 2.2
-            self.behavior = "bounce"
-            self.jump_timer = 0
-            self.size = 2
-            self.regeneration = 1.0
-            
-        elif kind == "ghost":
-            self.max_health = 30
-            self.health = self.max_health
-            self.speed = 1.1
-            self.damage = 14
-            self.attack_range = 55
-            self.attack_cooldown = 1.9
-            self.behavior = "phase"
-            self.phase_timer = 0
-            self.visible = True
-            self.energy = 100
-            self.energy_regen = 8
+        self.grid = None  # LevelGrid for cheap ledge/wall probes
+        self.flow = None  # shared FlowField toward the player
+        self.climb = 0    # side of the ledge being jumped up to, 0 when not climbing
+        self.think_time = 0.0  # seconds the last think() took, for the think budget
+        # (kind, dir_x, dir_y) of a projectile to fire, collected by the game each frame
+        self.shot = None
+        
+        # Stats, physics constants and behavior from the kind's archetype (enemies.json)
+        self.max_health = arch.max_health
+        self.health = self.max_health
+        self.speed = arch.speed
+        self.damage = arch.damage
+        self.attack_range = arch.attack_range
+        self.attack_cooldown = arch.attack_cooldown
+        self.wide_attack = arch.wide_attack
+        self.gravity = arch.gravity
+        self.max_fall = arch.max_fall
+        self.wall_jump = arch.wall_jump
+        self.phasing = arch.phasing
+        self.hitbox_inset = arch.hitbox
+        self.behavior = arch.behavior
+        # plain function, not a bound method, so the enemy holds no reference cycle
+        self.behave = getattr(Enemy, BEHAVIORS[arch.behavior])
+        for name, value in arch.state.items():
+            setattr(self, name, value)
         
         self.level = 1
         self.exp_value = 10 * self.level
         self.status_effects = []
         self.combo_counter = 0
-        self.last_ability_time = time.time()
+        self.last_ability_time = game_clock.now()
+        self.last_think = self.last_ability_time
 
-    def update(self, tiles, player_rect=None):
-        now = time.time()
+    def update(self, tiles, player_rect=None, grid=None, think=True, flow=None):
+        """One tick. Behavior decisions only run when think is set (see
+        ai_scheduler); otherwise the enemy steers and moves on its last decision."""
+        now = game_clock.now()
+        if grid is not None:
+            self.grid = grid
+        if flow is not None:
+            self.flow = flow
         dt = now - self.last_ability_time
         self.last_ability_time = now
         
@@ -104,34 +95,14 @@ class Enemy(pygame.sprite.Sprite):
         
         # Update behavior based on player
         if player_rect:
-            dx = player_rect.centerx - self.rect.centerx
-            dy = player_rect.centery - self.rect.centery
-            dist = math.sqrt(dx*dx + dy*dy)
-            
-            # Adjust attack range based on aggression and health
-            health_percent = self.health / self.max_health
-            attack_range_modifier = self.aggression * (0.5 + health_percent)
-            effective_attack_range = self.attack_range * (0.8 + attack_range_modifier)
-            
-            # Update behavior
-            if self.behavior == "patrol":
-                self.update_grub_behavior(dist, dx, dy, dt, now)
-            elif self.behavior == "chase":
-                self.update_spider_behavior(dist, dx, dy, dt, now)
-            elif self.behavior == "bounce":
-                self.update_slime_behavior(dist, dx, dy, dt, now)
-            elif self.behavior == "phase":
-                self.update_ghost_behavior(dist, dx, dy, dt, now)
-            
-            # Attack logic
-            if dist <= effective_attack_range and now - self.last_attack >= self.attack_cooldown:
-                # Aggression-based attack chance
-                attack_chance = self.aggression + (1 - health_percent) * 0.3
-                if random.random() < attack_chance:
-                    self.attacking = True
-                    self.last_attack = now
-                    self.attack_frame = 10
+            if think:
+                t = time.perf_counter()
+                attacked = self.think(player_rect, now)
+                self.think_time = time.perf_counter() - t
+                if attacked:
                     return True
+            else:
+                self.steer()
         
         # Apply physics
         self.apply_physics(tiles)
@@ -148,6 +119,67 @@ class Enemy(pygame.sprite.Sprite):
         
         return False
     
+    def think(self, player_rect, now):
+        """Behavior selection and attack roll. Timers inside the behaviors advance
+        by the time since this enemy last thought. Returns True on an attack."""
+        dt = now - self.last_think
+        self.last_think = now
+        dx = player_rect.centerx - self.rect.centerx
+        dy = player_rect.centery - self.rect.centery
+        dist = math.sqrt(dx*dx + dy*dy)
+        
+        # Adjust attack range based on aggression and health
+        health_percent = self.health / self.max_health
+        attack_range_modifier = self.aggression * (0.5 + health_percent)
+        effective_attack_range = self.attack_range * (0.8 + attack_range_modifier)
+        
+        # Update behavior
+        self.behave(self, dist, dx, dy, dt, now)
+        
+        # Attack logic
+        if dist <= effective_attack_range and now - self.last_attack >= self.attack_cooldown:
+            # Aggression-based attack chance
+            attack_chance = self.aggression + (1 - health_percent) * 0.3
+            if random.random() < attack_chance:
+                self.attacking = True
+                self.last_attack = now
+                self.attack_frame = 10
+                return True
+        return False
+    
+    def path_heading(self, dx):
+        """(direction, rise) toward the player: along the shared flow field when it
+        has a sideways move for this cell, else straight at the player. rise is the
+        height of a ledge to jump up first, 0 for none."""
+        if self.flow is not None:
+            direction, rise = self.flow.sample(self.rect)
+            if direction:
+                return direction, rise
+        return math.copysign(1, dx), 0
+    
+    def path_jump_speed(self, rise):
+        """Upward speed that clears a ledge rise pixels up under this enemy's gravity."""
+        return -math.sqrt(2 * self.gravity * (rise + 6))
+    
+    def clear_of_ledge(self, direction):
+        """True when the rect is inside its column, so jumping straight up does not
+        catch the underside of the ledge on the direction side."""
+        ts = self.flow.grid.tile_size
+        left = self.rect.centerx // ts * ts
+        if direction > 0:
+            return self.rect.right <= left + ts
+        return self.rect.left >= left
+    
+    def steer(self):
+        """Cheap per-tick steering between thinks: walkers turn at ledges and walls,
+        except at a ledge the flow field says to drop off."""
+        if self.grid and self.on_ground and self.vx and not self.phasing:
+            direction = 1 if self.vx > 0 else -1
+            on_path = self.flow is not None and self.flow.sample(self.rect)[0] == direction
+            if ((not on_path and not self.grid.ground_ahead(self.rect, direction)) or
+                    self.grid.wall_ahead(self.rect, direction)):
+                self.vx = -self.vx
+    
     def update_grub_behavior(self, dist, dx, dy, dt, now):
         """Grub behavior: Patrol with burrowing"""
         patrol_range = 150
@@ -160,12 +192,22 @@ class Enemy(pygame.sprite.Sprite):
                 self.burrow_time = now
                 self.vx = 0
             elif dist < patrol_range:
-                # Chase player cautiously
-                self.vx = math.copysign(self.speed * (dist / patrol_range), dx)
+                # Chase player cautiously, around obstacles; grubs cannot jump, so
+                # they wait below a ledge the path climbs
+                direction, rise = self.path_heading(dx)
+                if rise:
+                    direction = 0
+                self.vx = direction * self.speed * (dist / patrol_range)
             else:
                 # Idle patrol
                 if random.random() < 0.01:
                     self.vx = random.choice([-1, 1]) * self.speed
+                # Turn around at ledges and walls instead of walking off
+                if self.grid and self.on_ground and self.vx:
+                    direction = 1 if self.vx > 0 else -1
+                    if (not self.grid.ground_ahead(self.rect, direction) or
+                            self.grid.wall_ahead(self.rect, direction)):
+                        self.vx = -self.vx
         else:
             # Burrowed behavior
             if now - self.burrow_time > 2.0:
@@ -184,21 +226,38 @@ class Enemy(pygame.sprite.Sprite):
         optimal_range = 80
         
         if dist < chase_range:
+            rise = 0
             if dist < optimal_range:
                 # Maintain distance, strafe around player
                 self.vx = -math.copysign(self.speed * 0.6, dx)
             else:
-                # Chase player
-                self.vx = math.copysign(self.speed * 1.2, dx)
+                # Chase player along the flow field, jumping up ledges on the way
+                direction, rise = self.path_heading(dx)
+                if rise and not self.clear_of_ledge(direction):
+                    # back off until a straight jump clears the ledge
+                    direction = -direction
+                    rise = 0
+                self.vx = direction * self.speed * 1.2
             
-            # Jump frequently
-            if self.on_ground and self.jump_cooldown <= 0 and random.random() < 0.08 * self.aggression:
-                self.vy = -7
-                self.jump_cooldown = 1.5
+            if self.on_ground and self.jump_cooldown <= 0:
+                if rise:
+                    self.vy = self.path_jump_speed(rise)
+                    self.climb = direction
+                    self.jump_cooldown = 0.5
+                # Jump frequently
+                elif random.random() < 0.08 * self.aggression:
+                    self.vy = -7
+                    self.jump_cooldown = 1.5
+            elif rise:
+                self.vx = 0  # lined up beside the ledge, wait to jump
             
             # Occasional web attack
             if self.web_cooldown <= 0 and random.random() < 0.03 * self.aggression:
                 self.web_cooldown = 2.0
+                if self.web_charges > 0:
+                    self.web_charges -= 1
+                    # lobbed slightly upward towards the player
+                    self.shot = (WEB, dx, dy - abs(dx) * 0.3)
         
         if self.jump_cooldown > 0:
             self.jump_cooldown -= dt
@@ -216,7 +275,15 @@ class Enemy(pygame.sprite.Sprite):
             # Jump toward or away from player
             if dist < 200:
                 jump_power = -5 - (200 - dist) / 80
-                self.vx = math.copysign(self.speed * 1.3, dx)
+                direction, rise = self.path_heading(dx)
+                if rise and not self.clear_of_ledge(direction):
+                    # slide back until a straight jump clears the ledge
+                    self.vx = -direction * self.speed
+                    return
+                self.vx = direction * self.speed * 1.3
+                if rise:
+                    jump_power = min(jump_power, self.path_jump_speed(rise))
+                    self.climb = direction
             else:
                 self.vx = random.choice([-1, 1]) * self.speed
                 jump_power = -4
@@ -249,10 +316,9 @@ class Enemy(pygame.sprite.Sprite):
     
     def apply_physics(self, tiles):
         """Apply movement and collision physics"""
-        if self.behavior == "phase":
+        if self.phasing:
             # Ghosts have special physics
-            self.rect.x += int(self.vx)
-            self.rect.y += int(self.vy)
+            self.body.move(self.rect, self.vx, self.vy, ())
             
             # Wrap around screen or gentle collision
             for t in tiles:
@@ -261,43 +327,35 @@ class Enemy(pygame.sprite.Sprite):
             return
         
         # Standard physics
-        # Horizontal movement
-        self.rect.x += int(self.vx)
-        for t in tiles:
-            if self.rect.colliderect(t):
-                if self.vx > 0:
-                    self.rect.right = t.left
-                else:
-                    self.rect.left = t.right
-                
-                if self.kind == "spider" and random.random() < 0.3:
-                    self.vy = -4  # Wall jump
-                else:
-                    self.vx *= -0.8
+        # Horizontal movement. Climbing a ledge, hold still while rising so the
+        # jump does not catch its underside, then drift onto it until landing
+        hit_x = 0
+        if self.climb and self.vy >= 0:
+            self.vx = self.climb * self.speed
+        if not self.climb or self.vy >= 0:
+            hit_x, _ = self.body.move(self.rect, self.vx, 0, tiles)
+        if hit_x:
+            if self.wall_jump and random.random() < self.wall_jump:
+                self.vy = -4  # Wall jump
+            else:
+                self.vx *= -0.8
         
         # Vertical movement
         if not self.on_ground:
-            gravity = 0.5 if self.kind == "slime" else 0.7
-            self.vy += gravity
+            self.vy += self.gravity
         
-        max_fall = 10 if self.kind == "spider" else 12
-        self.vy = min(self.vy, max_fall)
+        self.vy = min(self.vy, self.max_fall)
         
-        self.rect.y += int(self.vy)
-        self.on_ground = False
-        for t in tiles:
-            if self.rect.colliderect(t):
-                if self.vy > 0:
-                    self.rect.bottom = t.top
-                    self.on_ground = True
-                    self.vy = 0
-                else:
-                    self.rect.top = t.bottom
-                    self.vy = 0
+        _, hit_y = self.body.move(self.rect, 0, self.vy, tiles)
+        self.on_ground = hit_y > 0
+        if hit_y:
+            self.vy = 0
+        if self.on_ground:
+            self.climb = 0
     
     def take_damage(self, damage):
         """Handle taking damage with visual feedback"""
-        now = time.time()
+        now = game_clock.now()
         if now - self.last_hurt < 0.15:
             return
         
@@ -317,16 +375,18 @@ class Enemy(pygame.sprite.Sprite):
                 'color': (255, 200, 200)
             })
     
-    def draw(self, surf, camera_x, shake_y=0):
-        """Draw enemy with effects"""
+    def draw(self, surf, camera_x, shake_y=0, overlay=None, queue=None):
+        """Draw enemy with effects; the health bar goes to overlay and the rest to
+        queue's enemy layer when they are given"""
+        out = target(surf, queue, LAYER_ENEMIES)
         draw_pos = (self.rect.x - camera_x, self.rect.y + shake_y)
-        now = time.time()
+        now = game_clock.now()
         
         # Get base image
         base_image = self.image.copy()
         
         # Phase effect for ghosts
-        if self.behavior == "phase":
+        if self.phasing:
             if not self.visible:
                 base_image.set_alpha(100)
             else:
@@ -339,60 +399,48 @@ class Enemy(pygame.sprite.Sprite):
             flash_surf = base_image.copy()
             flash_surf.fill((255, 255, 255))
             flash_surf.set_alpha(flash_alpha)
-            surf.blit(flash_surf, draw_pos)
+            out.blit(flash_surf, draw_pos)
         
         # Draw base sprite
-        surf.blit(base_image, draw_pos)
+        out.blit(base_image, draw_pos)
         
-        # Draw hit particles
+        # Draw hit particles (all of them move; the quality tier caps how many are drawn)
+        shown = quality.tier().hit_particles
         for particle in list(self.hit_particles):
             particle['x'] += particle['vx']
             particle['y'] += particle['vy']
             particle['life'] -= 0.05
             if particle['life'] <= 0:
                 self.hit_particles.remove(particle)
-            else:
+            elif shown > 0:
+                shown -= 1
                 alpha = int(255 * (particle['life'] / 0.5))
                 p_surf = pygame.Surface((3, 3))
                 p_surf.fill(particle['color'])
                 p_surf.set_alpha(alpha)
                 p_pos = (int(particle['x'] - camera_x), int(particle['y'] + shake_y))
-                surf.blit(p_surf, p_pos)
-        
-        # Draw health bar
-        health_width = 24
-        health_height = 3
-        bar_y = draw_pos[1] - 8
+                out.blit(p_surf, p_pos)
         
-        # Background
-        pygame.draw.rect(surf, (60, 60, 60), 
-                        (draw_pos[0] + 4, bar_y, health_width, health_height))
-        
-        # Health bar
+        # Health bar (pre-rendered, batched with the other world overlays)
         health_percent = self.health / self.max_health
-        health_color = (100, 255, 100) if health_percent > 0.5 else (255, 255, 100) if health_percent > 0.2 else (255, 100, 100)
-        pygame.draw.rect(surf, health_color,
-                        (draw_pos[0] + 4, bar_y, int(health_width * health_percent), health_height))
-        pygame.draw.rect(surf, (0, 0, 0), (draw_pos[0] + 4, bar_y, health_width, health_height), 1)
+        bar_pos = (draw_pos[0] + 4, draw_pos[1] - 8)
+        if overlay is not None:
+            overlay.add_bar(ENEMY_BAR, bar_pos[0], bar_pos[1], health_percent)
+        else:
+            out.blit(bar_frame(ENEMY_BAR, health_percent), bar_pos)
         
         # Attack telegraph
         if self.attacking and self.attack_frame > 0:
             attack_progress = self.attack_frame / 10.0
-            pygame.draw.circle(surf, (255, 100, 100, 100), 
+            out.draw(pygame.draw.circle, (255, 100, 100, 100), 
                              (int(draw_pos[0] + 8), int(draw_pos[1] + 8)), 
                              int(20 * attack_progress))
     
     def get_hitbox(self):
-        """Get collision hitbox based on enemy type"""
-        if self.kind == "spider":
-            return pygame.Rect(self.rect.x + 6, self.rect.y + 4, 
-                             self.rect.width - 12, self.rect.height - 6)
-        elif self.kind == "slime":
-            return pygame.Rect(self.rect.x + 2, self.rect.y + self.rect.height//2,
-                             self.rect.width - 4, self.rect.height//2)
-        else:
-            return pygame.Rect(self.rect.x + 4, self.rect.y + 4,
-                             self.rect.width - 8, self.rect.height - 8)
+        """Get collision hitbox from the archetype's insets"""
+        left, top, right, bottom = self.hitbox_inset
+        return pygame.Rect(self.rect.x + left, self.rect.y + top,
+                           self.rect.width - left - right, self.rect.height - top - bottom)
     
     def get_attack_rect(self):
         """Get attack hitbox"""
@@ -402,7 +450,7 @@ class Enemy(pygame.sprite.Sprite):
         progress = self.attack_frame / 10.0
         attack_size = int(30 * progress)
         
-        if self.kind == "grub":
+        if self.wide_attack:
             return pygame.Rect(self.rect.centerx - attack_size, self.rect.centery - attack_size,
                              attack_size * 2, attack_size * 2)
         else:
@@ -0,0 +1,162 @@
+# events.py
+# Combat / progress event bus. Events are written into a preallocated ring
+# buffer as they happen and handed to subscribers in one batch per tick, so
+# gameplay code only records what happened and the side effects (damage
+# numbers, hitstop, telemetry) live in one place.
+import queue
+import struct
+import threading
+from array import array
+
+# Event kinds
+DAMAGE = 1      # value = amount, tag = DAMAGE_* source
+KILL = 2        # tag = enemy kind index (-1 for the boss)
+SPAWN = 3       # tag = enemy kind index
+CHECKPOINT = 4  # tag = checkpoint index
+STAGE = 5       # tag = stage index
+DEATH = 6       # tag = lives left
+
+KIND_NAMES = {DAMAGE: "damage", KILL: "kill", SPAWN: "spawn",
+              CHECKPOINT: "checkpoint", STAGE: "stage", DEATH: "death"}
+
+# Damage sources (the tag of a DAMAGE event)
+DAMAGE_HIT = 0    # player attack on an enemy
+DAMAGE_BOSS = 1   # player attack on the boss
+DAMAGE_DASH = 2   # dash contact
+DAMAGE_HURT = 3   # an enemy hit the player
+DAMAGE_PULSE = 4  # Worrier's instant pulse
+DAMAGE_SPHERE = 5 # Worry Sphere tick
+
+RING_SIZE = 1024  # power of two
+
+
+class EventBus:
+    """Fixed-capacity event ring with batched, per-kind dispatch."""
+    def __init__(self, capacity=RING_SIZE):
+        assert capacity & (capacity - 1) == 0, "capacity must be a power of two"
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.kinds = bytearray(capacity)
+        self.tags = array('i', bytes(4 * capacity))
+        self.times = array('d', bytes(8 * capacity))
+        self.xs = array('d', bytes(8 * capacity))
+        self.ys = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.seq = 0          # events ever emitted
+        self.dispatched = 0   # events already handed to subscribers
+        self.dropped = 0      # overwritten before they could be dispatched
+        self._handlers = {}   # kind -> [handler(kind, t, x, y, value, tag)]
+        self._batch_handlers = []
+
+    def emit(self, kind, t, x=0.0, y=0.0, value=0.0, tag=0):
+        i = self.seq & self._mask
+        self.kinds[i] = kind
+        self.tags[i] = tag
+        self.times[i] = t
+        self.xs[i] = x
+        self.ys[i] = y
+        self.values[i] = value
+        self.seq += 1
+
+    def subscribe(self, handler, *kinds):
+        """Call handler(kind, t, x, y, value, tag) for each event of the given kinds
+        (every kind when none are given)."""
+        for kind in kinds or KIND_NAMES:
+            self._handlers.setdefault(kind, []).append(handler)
+
+    def subscribe_batch(self, handler):
+        """Call handler() once after each non-empty dispatch."""
+        self._batch_handlers.append(handler)
+
+    def pending(self):
+        return self.seq - self.dispatched
+
+    def dispatch(self):
+        """Deliver every event emitted since the last dispatch, oldest first."""
+        start = self.dispatched
+        if self.seq - start > self.capacity:
+            self.dropped += self.seq - start - self.capacity
+            start = self.seq - self.capacity
+        if start == self.seq:
+            return 0
+        handlers = self._handlers
+        for s in range(start, self.seq):
+            i = s & self._mask
+            kind = self.kinds[i]
+            for handler in handlers.get(kind, ()):
+                handler(kind, self.times[i], self.xs[i], self.ys[i], self.values[i], self.tags[i])
+        count = self.seq - start
+        self.dispatched = self.seq
+        for handler in self._batch_handlers:
+            handler()
+        return count
+
+
+# Telemetry file: MAGIC + version, then fixed-size little-endian records
+# (kind, tag, seconds since session start, x, y, value)
+TELEMETRY_MAGIC = b"41WE"
+TELEMETRY_VERSION = 1
+TELEMETRY_HEADER = struct.Struct("<4sB")
+RECORD = struct.Struct("<Bhffff")
+
+
+class TelemetryExporter:
+    """Packs events into a buffer and appends full buffers to a file from a
+    writer thread, so the game loop never waits on disk."""
+    def __init__(self, path, start_time, records_per_flush=256):
+        self.path = path
+        self.start_time = start_time
+        self.records_per_flush = records_per_flush
+        self._buf = bytearray(RECORD.size * records_per_flush)
+        self._used = 0
+        self._queue = queue.Queue()
+        with open(path, "wb") as f:
+            f.write(TELEMETRY_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION))
+        self._thread = threading.Thread(target=self._writer, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def attach(self, bus):
+        bus.subscribe(self.record)
+        bus.subscribe_batch(self.end_batch)
+
+    def record(self, kind, t, x, y, value, tag):
+        if self._used == len(self._buf):
+            self._hand_off()
+        RECORD.pack_into(self._buf, self._used, kind, tag, t - self.start_time, x, y, value)
+        self._used += RECORD.size
+
+    def end_batch(self):
+        # flush at the end of a tick once the buffer is at least half full
+        if self._used * 2 >= len(self._buf):
+            self._hand_off()
+
+    def _hand_off(self):
+        if self._used:
+            self._queue.put(bytes(self._buf[:self._used]))
+            self._used = 0
+
+    def _writer(self):
+        with open(self.path, "ab") as f:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    return
+                f.write(chunk)
+                f.flush()
+
+    def close(self):
+        """Write what is buffered and wait for the writer to finish."""
+        self._hand_off()
+        self._queue.put(None)
+        self._thread.join()
+
+
+def read_telemetry(path):
+    """Yield (kind, tag, t, x, y, value) tuples from a telemetry file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = TELEMETRY_HEADER.unpack_from(data, 0)
+    if magic != TELEMETRY_MAGIC or version != TELEMETRY_VERSION:
+        raise ValueError("not a telemetry file of this version")
+    end = len(data) - (len(data) - TELEMETRY_HEADER.size) % RECORD.size
+    yield from RECORD.iter_unpack(data[TELEMETRY_HEADER.size:end])
@@ -0,0 +1,111 @@
+# floating_text.py
+# Floating combat numbers. Digit glyphs are rendered once per color into an
+# atlas and numbers are composed from them, and the numbers themselves live
+# in a fixed-capacity pool instead of a list of per-hit dicts.
+from ui import get_font
+
+DIGITS = "0123456789"
+POOL_SIZE = 64
+RISE_SPEED = -2   # pixels per frame
+LIFETIME = 1.0    # seconds; alpha fades with the remaining life
+
+_atlases = {}
+
+
+class DigitAtlas:
+    """Pre-rendered 0-9 glyphs in one color."""
+    def __init__(self, color, size=14, bold=True):
+        font = get_font(size, bold=bold)
+        self.glyphs = [font.render(d, True, color) for d in DIGITS]
+        self.advances = [g.get_width() for g in self.glyphs]
+
+    def blit_number(self, surf, digits, x, y, alpha=255):
+        """Blit a number given as a sequence of digit values with its top-left at (x, y)."""
+        glyphs = self.glyphs
+        advances = self.advances
+        run = []
+        for d in digits:
+            g = glyphs[d]
+            g.set_alpha(alpha)
+            run.append((g, (x, y)))
+            x += advances[d]
+        # one call per number: glyph alphas are shared, so they cannot wait longer
+        surf.blits(run, False)
+
+
+def digit_atlas(color, size=14, bold=True):
+    key = (tuple(color), size, bold)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = DigitAtlas(color, size, bold)
+    return atlas
+
+
+class FloatingTextPool:
+    """Fixed-capacity pool of rising, fading numbers. Live entries are kept packed
+    in slots [0, count); when full, the oldest entry is replaced."""
+    def __init__(self, capacity=POOL_SIZE):
+        self.capacity = capacity
+        self.count = 0
+        self.xs = [0.0] * capacity
+        self.ys = [0.0] * capacity
+        self.lives = [0.0] * capacity
+        self.digits = [()] * capacity
+        self.atlases = [None] * capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, amount, color):
+        if self.count < self.capacity:
+            i = self.count
+            self.count += 1
+        else:
+            lives = self.lives
+            i = min(range(self.capacity), key=lives.__getitem__)
+        self.xs[i] = x
+        self.ys[i] = y
+        self.lives[i] = LIFETIME
+        self.digits[i] = tuple(DIGITS.index(c) for c in str(abs(int(amount))))
+        self.atlases[i] = digit_atlas(color)
+
+    def amount(self, i):
+        n = 0
+        for d in self.digits[i]:
+            n = n * 10 + d
+        return n
+
+    def update(self, dt):
+        lives = self.lives
+        ys = self.ys
+        i = 0
+        while i < self.count:
+            lives[i] -= dt
+            if lives[i] <= 0:
+                self._remove(i)
+                continue
+            ys[i] += RISE_SPEED
+            i += 1
+
+    def _remove(self, i):
+        # move the last live entry into the freed slot
+        last = self.count - 1
+        if i != last:
+            self.xs[i] = self.xs[last]
+            self.ys[i] = self.ys[last]
+            self.lives[i] = self.lives[last]
+            self.digits[i] = self.digits[last]
+            self.atlases[i] = self.atlases[last]
+        self.atlases[last] = None
+        self.count = last
+
+    def clear(self):
+        for i in range(self.count):
+            self.atlases[i] = None
+        self.count = 0
+
+    def draw(self, surf, camera_x=0, shake_y=0):
+        for i in range(self.count):
+            alpha = int(255 * self.lives[i])
+            self.atlases[i].blit_number(surf, self.digits[i], int(self.xs[i] - camera_x),
+                                        int(self.ys[i] + shake_y), alpha)
@@ -0,0 +1,117 @@
+# flow_field.py
+# One shared flow field toward the player over the level's tile grid. A
+# breadth-first search runs backwards from the player's cell along the moves
+# a ground enemy can make (walk, step off a ledge and fall, jump straight up
+# beside a ledge of up to JUMP_CELLS and drift onto it) and stores, per cell,
+# which way to go next. Enemies read their cell in O(1); the search reruns
+# only when the player reaches a new cell.
+from array import array
+from collections import deque
+
+UNREACHED = 0xFFFF
+JUMP_CELLS = 4   # ledge height, in cells, a path may jump up (level 2's platforms are 4 up)
+
+
+class FlowField:
+    def __init__(self, grid, jump_cells=JUMP_CELLS):
+        self.grid = grid
+        self.jump_cells = jump_cells
+        n = grid.cols * grid.rows
+        self.dist = array('H', [UNREACHED]) * n
+        self.dir_x = array('b', bytes(n))  # first sideways move on the path: -1, 0 or 1
+        self.jump = bytearray(n)           # cells the next move jumps up, 0 for none
+        self.target = None
+        self.builds = 0
+        # empty cells with solid ground right below
+        cols, cells = grid.cols, grid.cells
+        self.standable = bytearray(n)
+        for i in range(n - cols):
+            if not cells[i] and cells[i + cols]:
+                self.standable[i] = 1
+
+    def cell_of(self, rect):
+        """Cell index of rect's feet, or -1 outside the grid."""
+        g = self.grid
+        cx = rect.centerx // g.tile_size
+        cy = (rect.bottom - 1) // g.tile_size
+        if 0 <= cx < g.cols and 0 <= cy < g.rows:
+            return cy * g.cols + cx
+        return -1
+
+    def target_cell(self, rect):
+        """The player's cell, dropped to the ground below while airborne so jumps
+        do not rebuild the field every few frames."""
+        i = self.cell_of(rect)
+        if i < 0:
+            return i
+        cells, cols = self.grid.cells, self.grid.cols
+        n = len(cells)
+        while not self.standable[i] and i + cols < n and not cells[i + cols]:
+            i += cols
+        return i
+
+    def update(self, rect):
+        """Point the field at rect (the player); returns True if it was rebuilt."""
+        i = self.target_cell(rect)
+        if i == self.target:
+            return False
+        self.target = i
+        self.build(i)
+        return True
+
+    def build(self, target):
+        cols, rows, cells = self.grid.cols, self.grid.rows, self.grid.cells
+        dist, dir_x, jump, standable = self.dist, self.dir_x, self.jump, self.standable
+        n = cols * rows
+        for i in range(n):
+            dist[i] = UNREACHED
+            dir_x[i] = 0
+            jump[i] = 0
+        self.builds += 1
+        if target < 0 or cells[target]:
+            return
+        dist[target] = 0
+        queue = deque([target])
+        while queue:
+            v = queue.popleft()
+            d = dist[v] + 1
+            # sideways into v: walking from the ground (or off a ledge), or drifting
+            # from the top of a jump onto ground; on a tie with a jump, walking wins
+            for u, step in ((v - 1, 1), (v + 1, -1)):
+                if u // cols != v // cols or u < 0 or cells[u]:
+                    continue
+                if not (standable[u] or standable[v]):
+                    continue
+                if dist[u] == UNREACHED:
+                    dist[u] = d
+                    queue.append(u)
+                elif dist[u] != d or not jump[u]:
+                    continue
+                dir_x[u] = step
+                jump[u] = 0
+            # falling into v from the cell above
+            u = v - cols
+            if u >= 0 and not cells[u] and dist[u] == UNREACHED:
+                dist[u] = d
+                dir_x[u] = dir_x[v]
+                queue.append(u)
+            # jumping into v from ground up to jump_cells below, through empty cells
+            u = v
+            for k in range(1, self.jump_cells + 1):
+                u += cols
+                if u >= n or cells[u]:
+                    break
+                if standable[u] and dist[u] == UNREACHED:
+                    dist[u] = d
+                    dir_x[u] = dir_x[v]
+                    jump[u] = k
+                    queue.append(u)
+
+    def sample(self, rect):
+        """(direction, rise) for something standing at rect: direction is -1, 1 or 0
+        (no sideways move, or no path), rise is the height in pixels of the ledge
+        to jump up first, 0 for none."""
+        i = self.cell_of(rect)
+        if i < 0 or self.dist[i] == UNREACHED:
+            return 0, 0
+        return self.dir_x[i], self.jump[i] * self.grid.tile_size
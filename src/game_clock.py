@@ -0,0 +1,31 @@
+# game_clock.py
+# Source of "now" for every gameplay timer. It is wall-clock time by default;
+# headless simulations install a SimClock so a run can go as fast as the CPU
+# allows and stay reproducible for a given seed.
+import time
+
+_source = time.time
+
+
+def now():
+    """Current gameplay time in seconds."""
+    return _source()
+
+
+def install(source):
+    """Use source() for gameplay time; None restores wall-clock time."""
+    global _source
+    _source = source if source is not None else time.time
+
+
+class SimClock:
+    """Manually advanced clock for fixed-step simulation."""
+    def __init__(self, start=1000.0):
+        # start well above 0 so "long ago" defaults like last_attack = -1 stay in the past
+        self.t = start
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, dt):
+        self.t += dt
@@ -1,17 +1,68 @@
 # game_states.py
 import pygame
-import time
+import game_clock
 import math
-from ui import draw_hud
-from level import build_level_from_array, LEVELS, TILE_SIZE
+from ui import draw_hud, get_font
+from level import TILE_SIZE
+from stage_loader import StagePreloader, PRELOAD_MARGIN
+from snapshot import pack_state, unpack_state
 from player import Player
 from warrior import Warrior
 from worry_sphere import WorrySphere
+from aoe import AOESystem
+from projectiles import ProjectilePool, PROJECTILE_KINDS, ARROW, OWNER_PLAYER, OWNER_ENEMY
+from floating_text import FloatingTextPool
+from postfx import PostFX
+from world_ui import WorldOverlay
+from render_queue import (RenderQueue, LAYER_TILES, LAYER_WORLD, LAYER_EFFECTS, LAYER_BOSS,
+                          LAYER_OVERLAY, LAYER_TEXT)
+import quality
+from archetypes import ENEMY_KINDS
+from events import (EventBus, DAMAGE, KILL, SPAWN, CHECKPOINT, STAGE, DEATH,
+                    DAMAGE_HIT, DAMAGE_BOSS, DAMAGE_DASH, DAMAGE_HURT, DAMAGE_PULSE,
+                    DAMAGE_SPHERE)
 from enemy import Enemy
+from ai_scheduler import ThinkScheduler, think_time
+from flow_field import FlowField
 from boss import Boss
 from settings import LEVEL_WIDTH, LEVEL_HEIGHT, VIRTUAL_WIDTH, VIRTUAL_HEIGHT
 import random
 
+# Enemy kinds drawn from when spawning, per stage
+STAGE_ENEMY_TYPES = {
+    0: ["grub", "grub", "spider", "slime"],  # Stage 1: Variety
+    1: ["grub", "spider", "slime", "ghost"],  # Stage 2: More variety
+    2: ["spider", "slime", "ghost", "ghost"]  # Stage 3: Hardest
+}
+
+# Per damage source: floating number color (None = no number), hitstop, shake
+DAMAGE_EFFECTS = {
+    DAMAGE_HIT: ((255, 200, 100), 0.05, 2),
+    DAMAGE_BOSS: ((255, 255, 100), 0.05, 2),
+    DAMAGE_DASH: ((100, 200, 255), 0.06, 3),
+    DAMAGE_HURT: ((255, 100, 100), 0.08, 4),
+    DAMAGE_PULSE: (None, 0, 0),
+    DAMAGE_SPHERE: (None, 0, 0),
+}
+
+# Full-screen feedback: red flash when hurt, purple tint during the betrayal,
+# vignette below this fraction of max health
+HURT_FLASH_COLOR = (255, 60, 60)
+CUTSCENE_TINT = ((120, 40, 140), 60)
+LOW_HEALTH_FRACTION = 0.3
+
+# The guide sprite is drawn around guide_pos and reaches this far below it
+GUIDE_FOOT_OFFSET = 14
+
+_guide_label = None
+
+def guide_label():
+    """The guide's name tag, rendered once."""
+    global _guide_label
+    if _guide_label is None:
+        _guide_label = get_font(12).render('Guide', True, (240, 240, 240))
+    return _guide_label
+
 class GameStateManager:
     def __init__(self, screen):
         self.screen = screen
@@ -21,6 +72,11 @@ class GameStateManager:
         self.boss = None
         self.tiles = []
         self.tile_surfaces = []
+        self.grid = None
+        # shared path directions toward the player, rebuilt when the player changes cell
+        self.flow = None
+        # prepares the next stage in the background before it is needed
+        self.preloader = StagePreloader()
         self.guide_alive = True
         self.guide_text = "Welcome, traveler. Let's find 41 Water."
         self.guide_help_count = 0
@@ -43,47 +99,88 @@ class GameStateManager:
         self.spawn_point = (32, 32)
         # Checkpoints
         self.checkpoints = []  # list of {'rect':Rect,'activated':bool}
+        self.checkpoint_state = None  # snapshot restored on respawn
 
         # Fade / death animation
         self.fade_state = None  # None, 'out', 'in'
         self.fade_start = 0
         self.fade_duration = 1.0
+        # screen-space effects (shake, tint, vignette, flash, fade)
+        self.postfx = PostFX()
+        # health bars and labels, drawn in one pass after the entities
+        self.overlay = WorldOverlay()
+        # per-frame blit batching for the world pass
+        self.render_queue = RenderQueue()
         
         # Combat effects (Hollow Knight-style)
         self.screen_shake = 0
         self.hitstop_until = 0
-        self.damage_numbers = []
+        self.damage_numbers = FloatingTextPool()
+        # Active area effects (worry spheres)
+        self.aoe = AOESystem()
+        # Arrows, webs and boss shots in flight
+        self.projectiles = ProjectilePool()
+        # which enemies make behavior decisions each tick
+        self.thinker = ThinkScheduler()
+        # Combat / progress events, dispatched once at the end of each tick
+        self.events = EventBus()
+        self.events.subscribe(self.on_damage_event, DAMAGE)
+        # frame-synchronous collector (gc_manager.GCManager), set by the main loop
+        self.gc_manager = None
         
         # Enhanced morality system
         self.mercy_count = 0
         self.aggression_count = 0
         self.exploration_secrets = 0
+        # choice points needed for the good / neutral endings
+        self.good_ending_threshold = 5
+        self.neutral_ending_threshold = 2
+
+        # Balance overrides (used by sweep.py): attributes applied after every
+        # load_stage, and per-kind enemy attributes applied at spawn ('*' = all)
+        self.stage_overrides = {}
+        self.enemy_overrides = {}
+        # attack input is edge-triggered
+        self.last_attack_pressed = False
 
     def start_new(self, char_class):
         # build first stage
         self.stage_index = 0
         self.load_stage(self.stage_index, char_class)
 
+    def make_player(self, char_class, x, y):
+        # instantiate appropriate player class
+        if char_class == "Warrior":
+            # use Warrior subclass
+            return Warrior(x, y)
+        return Player(x, y, char_class)
+
+    def make_enemy(self, x, y, kind):
+        e = Enemy(x, y, kind=kind)
+        for key in ('*', kind):
+            for attr, value in self.enemy_overrides.get(key, {}).items():
+                setattr(e, attr, value)
+                if attr == 'max_health':
+                    e.health = value
+        return e
+
+    def set_level(self, level, flow=None):
+        """Swap in a compiled level's collision, tiles and grid, plus its flow
+        field when one was prepared ahead of time."""
+        self.tiles = level.rects
+        self.tile_surfaces = level.tile_surfaces
+        self.grid = level.grid
+        self.flow = flow if flow is not None else FlowField(level.grid)
+
     def load_stage(self, idx, char_class):
-        arr = LEVELS[idx]
-        tiles, tile_surfaces = build_level_from_array(arr)
-        self.tiles = tiles
-        self.tile_surfaces = tile_surfaces
-        # find player spawn (P)
-        spawn = None
-        for y, row in enumerate(arr):
-            for x, ch in enumerate(row):
-                if ch == "P":
-                    spawn = (x * TILE_SIZE, y * TILE_SIZE)
+        level, flow = self.preloader.take(idx)
+        self.set_level(level, flow)
+        # player spawn (P)
+        spawn = level.spawn
         if spawn is None:
             spawn = (32, 32)
         if self.player is None:
-            # instantiate appropriate player class
-            if char_class == "Warrior":
-                # use Warrior subclass
-                self.player = Warrior(spawn[0], spawn[1])
-            else:
-                self.player = Player(spawn[0], spawn[1], char_class)
+            self.player = self.make_player(char_class, spawn[0], spawn[1])
             # give player initial lives
             self.player.lives = self.lives
         else:
@@ -97,14 +194,8 @@ class GameStateManager:
 
         # Create two automatic checkpoints across the level (1/3 and 2/3)
         self.checkpoints = []
-        checkpoint_xs = [int(self.level_width * 0.33), int(self.level_width * 0.66)]
-        for cx in checkpoint_xs:
-            # find a ground tile at this x
-            spawn_y = None
-            for t in self.tiles:
-                if t.left <= cx <= t.right:
-                    if spawn_y is None or t.top < spawn_y:
-                        spawn_y = t.top
+        for cx, spawn_y in level.checkpoints:
+            # ground under each checkpoint comes precomputed from the level heightmap
             if spawn_y is None:
                 spawn_y = VIRTUAL_HEIGHT - TILE_SIZE * 2
             cp_rect = pygame.Rect(cx - 8, spawn_y - TILE_SIZE, 16, TILE_SIZE)
@@ -113,17 +204,16 @@ class GameStateManager:
         # Initialize enemy spawning system
         self.enemies = []
         self.enemies_to_defeat = 10  # Consistent number per level
-        self.enemy_types = {
-            0: ["grub", "grub", "spider", "slime"],  # Stage 1: Variety
-            1: ["grub", "spider", "slime", "ghost"],  # Stage 2: More variety
-            2: ["spider", "slime", "ghost", "ghost"]  # Stage 3: Hardest
-        }
+        self.enemy_types = STAGE_ENEMY_TYPES
         self.max_enemies = 10  # Always 10 enemies per level
         self.min_spawn_distance = 200  # Minimum distance from player for spawning
-        self.last_spawn_time = time.time()
+        self.last_spawn_time = game_clock.now()
         self.spawn_cooldown = 2.5  # Time between spawn attempts
         self.enemies_defeated = 0
         
+        for attr, value in self.stage_overrides.items():
+            setattr(self, attr, value)
+
         # Add initial enemies to start
         self.spawn_initial_enemies()
 
@@ -140,9 +230,10 @@ class GameStateManager:
             # Do not spawn the boss immediately. Place the guide near the center of the level.
             self.boss = None
             self.guide_present = True
-            # place guide roughly in middle of level on ground
+            # place guide roughly in middle of level, standing on the ground there
             gp_x = int(self.level_width * 0.5)
-            gp_y = VIRTUAL_HEIGHT - TILE_SIZE * 3
+            ground = self.grid.ground_at(gp_x)
+            gp_y = ground - GUIDE_FOOT_OFFSET if ground is not None else VIRTUAL_HEIGHT - TILE_SIZE * 3
             self.guide_pos = (gp_x, gp_y)
             self.guide_betrayed = False
         else:
@@ -150,22 +241,31 @@ class GameStateManager:
             self.guide_present = False
 
         # clear any existing worry spheres when loading stage
-        self.worry_spheres = []
+        self.aoe.clear()
+        self.projectiles.clear()
+
+        self.events.emit(STAGE, game_clock.now(), spawn[0], spawn[1], tag=idx)
+
+        # respawning before the first checkpoint restores the stage start
+        self.checkpoint_state = self.snapshot()
+        if self.gc_manager:
+            self.gc_manager.stage_loaded()
+
+    def quiet_frame(self):
+        """True while a short pause would go unnoticed: hitstop, cutscenes, fades."""
+        return (game_clock.now() < self.hitstop_until or self.cutscene_active
+                or self.fade_state is not None)
 
     def update(self, dt, inputs):
         # inputs is dict of keys
-        now = time.time()
+        now = game_clock.now()
         
         # Hitstop - freeze gameplay briefly for impact
         if now < self.hitstop_until:
             return
         
         # Update damage numbers
-        for dmg in list(self.damage_numbers):
-            dmg['y'] += dmg['vy']
-            dmg['life'] -= dt
-            if dmg['life'] <= 0:
-                self.damage_numbers.remove(dmg)
+        self.damage_numbers.update(dt)
         
         # Decay screen shake
         if self.screen_shake > 0:
@@ -183,6 +283,7 @@ class GameStateManager:
                 self.fade_start = now
                 self.fade_duration = self.respawn_delay
                 self.player.dead = True
+                self.events.emit(DEATH, now, self.player.rect.centerx, self.player.rect.centery, tag=self.lives)
                 # clear movement
                 self.player.vx = self.player.vy = 0
                 # optional: move player off-screen while dead
@@ -196,7 +297,13 @@ class GameStateManager:
                 if now < self.respawn_time:
                     # still waiting, do not process inputs
                     return
-                # respawn now
+                # respawn now: roll the world back to the last checkpoint,
+                # keeping the life that was just lost
+                lives = self.lives
+                if self.checkpoint_state is not None:
+                    self.restore(self.checkpoint_state, restore_rng=False)
+                self.lives = lives
+                self.player.lives = lives
                 self.respawn_time = None
                 self.player.dead = False
                 self.player.health = self.player.max_health
@@ -224,12 +331,14 @@ class GameStateManager:
 
         # Update player physics
         self.player.update(dt, self.tiles)
+        self.flow.update(self.player.rect)
 
         # Check for checkpoint activation
-        for cp in self.checkpoints:
+        for i, cp in enumerate(self.checkpoints):
             if not cp['activated'] and self.player.rect.colliderect(cp['rect']):
                 cp['activated'] = True
-                cp['activation_time'] = time.time()
+                cp['activation_time'] = game_clock.now()
+                self.events.emit(CHECKPOINT, now, cp['rect'].centerx, cp['rect'].y, tag=i)
                 # set new spawn point slightly above the checkpoint
                 self.spawn_point = (cp['rect'].x, cp['rect'].y - TILE_SIZE)
                 self.guide_text = "Checkpoint reached. Your progress is saved."
@@ -241,6 +350,7 @@ class GameStateManager:
                 ]
                 if len(checkpoint_stories) > sum(cp['activated'] for cp in self.checkpoints):
                     self.guide_text = checkpoint_stories[sum(cp['activated'] for cp in self.checkpoints) - 1]
+                self.checkpoint_state = self.snapshot()
 
         # Update camera after player moved so spawn area is correct
         self.update_camera()
@@ -252,19 +362,18 @@ class GameStateManager:
         has_protection = (now - getattr(self.player, 'spawn_time', 0)) < getattr(self.player, 'spawn_protection', 0)
 
         # Update enemies and handle their attacks
-        for e in list(self.enemies):
-            attacked = e.update(self.tiles, self.player.rect)
+        for e, think in self.thinker.schedule(list(self.enemies), think_time):
+            attacked = e.update(self.tiles, self.player.rect, self.grid, think, self.flow)
+            if e.shot:
+                self.fire(e, *e.shot)
             if attacked:
                 attack_rect = e.get_attack_rect()
                 if attack_rect and attack_rect.colliderect(self.player.rect) and not has_protection:
                     # Apply damage with combat effects
                     self.player.health -= e.damage
                     self.player.spawn_time = now  # invulnerability window
-                    
-                    # Combat effects (Hollow Knight-style)
-                    self.trigger_hitstop(0.08)
-                    self.add_screen_shake(4)
-                    self.spawn_damage_number(self.player.rect.centerx, self.player.rect.top, e.damage, (255, 100, 100))
+                    self.events.emit(DAMAGE, now, self.player.rect.centerx, self.player.rect.top,
+                                     e.damage, DAMAGE_HURT)
                     
                     # Immediate knockback player away from enemy
                     knock_dir = 1 if self.player.rect.centerx > e.rect.centerx else -1
@@ -276,11 +385,17 @@ class GameStateManager:
 
         # Remove dead enemies and track defeats
         old_count = len(self.enemies)
+        for e in self.enemies:
+            if getattr(e, "dead", False):
+                self.events.emit(KILL, now, e.rect.centerx, e.rect.centery, tag=ENEMY_KINDS.index(e.kind))
         self.enemies = [e for e in self.enemies if not getattr(e, "dead", False)]
         new_count = len(self.enemies)
         if old_count > new_count:
             # Enemy(ies) were defeated
             self.enemies_defeated += (old_count - new_count)
+            # nearly clear: build the next stage off-thread so the transition is a swap
+            if self.enemies_defeated >= self.enemies_to_defeat - PRELOAD_MARGIN:
+                self.preloader.request(self.stage_index + 1, self.player.rect.size)
             if self.enemies_defeated >= self.enemies_to_defeat:
                 self.guide_text = f"All enemies defeated! Proceed to the right exit. ({self.enemies_defeated}/{self.enemies_to_defeat})"
             else:
@@ -316,12 +431,15 @@ class GameStateManager:
         # Boss update
         if self.boss:
             self.boss.update(self.tiles, self.player.rect)
+            if self.boss.shot:
+                self.fire(self.boss, *self.boss.shot)
 
-        # Update worry spheres
-        for ws in list(getattr(self, 'worry_spheres', [])):
-            ws.update(self.enemies)
-            if ws.dead:
-                self.worry_spheres.remove(ws)
+        # Update worry spheres: all spheres against all enemies in one pass
+        for fx, e in self.aoe.update(self.enemies, now):
+            self.events.emit(DAMAGE, now, e.rect.centerx, e.rect.top, fx.damage, DAMAGE_SPHERE)
+
+        # Move projectiles, then resolve their hits in one pass per side
+        self.update_projectiles(now, has_protection)
 
         # Betrayal trigger: if the guide is present in final stage and the player approaches,
         # start a short cutscene that ends with the guide transforming into the boss.
@@ -333,7 +451,7 @@ class GameStateManager:
 
         # Handle cutscene timing: when a cutscene finishes, perform its action.
         if self.cutscene_active:
-            if time.time() >= self.cutscene_end_time:
+            if game_clock.now() >= self.cutscene_end_time:
                 # end cutscene and transform guide into boss
                 self.cutscene_active = False
                 self.guide_turns_boss()
@@ -345,25 +463,53 @@ class GameStateManager:
         if len(self.enemies) < 2 and self.guide_help_count < 3:
             self.guide_help_count += 1
 
+    def tick(self, dt, inputs):
+        """One full gameplay frame: simulation, attack input, dash contact and
+        then the frame's events."""
+        self.update(dt, inputs)
+
+        # attacks
+        # handle attack press (only when pressed, not held)
+        if inputs.get("attack") and not self.last_attack_pressed:
+            did = self.player_attack_check()
+            if did:
+                # if you attack the guide (we don't have direct guide sprite), but we can simulate:
+                # if there are few enemies and you still attack rapidly, reduce guide trust
+                if len(self.enemies) == 0:
+                    self.player.choice_points -= 1
+        self.last_attack_pressed = bool(inputs.get("attack"))
+
+        # dash collisions
+        self.dash_collision_check()
+
+        # win check for boss
+        if self.boss and self.boss.health <= 0:
+            # show guide betrayal: set guide text and allow Enter to finish
+            self.guide_text = "I guided you... but I needed 41 Water more than you."
+
+        self.events.dispatch()
+
     def player_attack_check(self):
         # check attack hit detection using player's attack hitbox
         if self.player.attack():
             # Get the proper attack hitbox from the player
             hitbox = self.player.get_attack_hitbox()
             # If Worrier, spawn a persistent worry sphere instead of just instant hit
+            if getattr(self.player, 'char_class', '') == 'Ranger':
+                # loose an arrow from the bow hand
+                self.projectiles.spawn(ARROW, self.player.rect.centerx + self.player.facing * 8,
+                                       self.player.rect.centery - 2, self.player.facing)
             if getattr(self.player, 'char_class', '') == 'Worrier':
                 # spawn sphere at player's center
                 cx = self.player.rect.centerx
                 cy = self.player.rect.centery
-                ws = WorrySphere(cx, cy, max_radius=80, lifetime=1.2, damage=28, tick=0.25)
-                if not hasattr(self, 'worry_spheres'):
-                    self.worry_spheres = []
-                self.worry_spheres.append(ws)
+                self.aoe.add(WorrySphere(cx, cy, max_radius=80, lifetime=1.2, damage=28, tick=0.25))
                 # optionally apply a small instant pulse as well
                 if hitbox:
                     for e in self.enemies:
                         if hitbox.colliderect(e.get_hitbox()):
                             e.take_damage(10)
+                            self.events.emit(DAMAGE, game_clock.now(), e.rect.centerx, e.rect.top, 10, DAMAGE_PULSE)
             
             if hitbox:
                 # Class-specific damage values
@@ -375,14 +521,11 @@ class GameStateManager:
                 damage = damage_map.get(self.player.char_class, 20)
                 
                 # damage enemies with combat effects
-                any_hit = False
+                now = game_clock.now()
                 for e in self.enemies:
                     if hitbox.colliderect(e.get_hitbox()):
                         e.take_damage(damage)
-                        any_hit = True
-                        
-                        # Combat effects
-                        self.spawn_damage_number(e.rect.centerx, e.rect.top, damage, (255, 200, 100))
+                        self.events.emit(DAMAGE, now, e.rect.centerx, e.rect.top, damage, DAMAGE_HIT)
                         
                         # Immediate knockback by directly shifting position
                         knock_dir = 1 if e.rect.centerx > self.player.rect.centerx else -1
@@ -394,26 +537,18 @@ class GameStateManager:
                 
                 # if boss present
                 if self.boss and hitbox.colliderect(self.boss.rect):
-                    self.boss.take_damage(damage)
-                    any_hit = True
-                    self.spawn_damage_number(self.boss.rect.centerx, self.boss.rect.top, damage, (255, 255, 100))
-                    
-                # Add hitstop and shake if any hit landed
-                if any_hit:
-                    self.trigger_hitstop(0.05)
-                    self.add_screen_shake(2)
+                    self.damage_boss(damage, DAMAGE_BOSS)
             return True
         return False
 
     def dash_collision_check(self):
         # if dashing, touching enemies damages them, and player is invulnerable briefly
         if self.player.dashing:
-            any_hit = False
+            now = game_clock.now()
             for e in self.enemies:
                 if self.player.rect.colliderect(e.rect):
                     e.take_damage(40)
-                    any_hit = True
-                    self.spawn_damage_number(e.rect.centerx, e.rect.top, 40, (100, 200, 255))
+                    self.events.emit(DAMAGE, now, e.rect.centerx, e.rect.top, 40, DAMAGE_DASH)
                     
                     # Strong immediate knockback from dash
                     knock_dir = 1 if e.rect.centerx > self.player.rect.centerx else -1
@@ -424,38 +559,62 @@ class GameStateManager:
                     e.vy = -4
                     
             if self.boss and self.player.rect.colliderect(self.boss.rect):
-                self.boss.take_damage(15)
-                any_hit = True
-                self.spawn_damage_number(self.boss.rect.centerx, self.boss.rect.top, 15, (100, 200, 255))
-                
-            if any_hit:
-                self.trigger_hitstop(0.06)
-                self.add_screen_shake(3)
+                self.damage_boss(15, DAMAGE_DASH)
+
+    def fire(self, shooter, kind, dir_x, dir_y):
+        """Launch the projectile an enemy or the boss asked for this frame."""
+        shooter.shot = None
+        self.projectiles.spawn(kind, shooter.rect.centerx, shooter.rect.centery, dir_x, dir_y)
+
+    def update_projectiles(self, now, has_protection):
+        projectiles = self.projectiles
+        projectiles.update(self.grid, self.level_width, self.level_height)
+        spent = []
+        targets = list(self.enemies)
+        if self.boss and not self.boss.dead:
+            targets.append(self.boss)
+        for slot, t in projectiles.hits(OWNER_PLAYER, targets):
+            damage = PROJECTILE_KINDS[projectiles.kinds[slot]].damage
+            if t is self.boss:
+                self.damage_boss(damage, DAMAGE_BOSS)
+            else:
+                t.take_damage(damage)
+                self.events.emit(DAMAGE, now, t.rect.centerx, t.rect.top, damage, DAMAGE_HIT)
+            spent.append(slot)
+        if not (has_protection or self.player.dashing or self.player.dead):
+            for slot, _ in projectiles.hits(OWNER_ENEMY, [self.player]):
+                damage = PROJECTILE_KINDS[projectiles.kinds[slot]].damage
+                self.player.health -= damage
+                self.player.spawn_time = now  # invulnerability window
+                self.events.emit(DAMAGE, now, self.player.rect.centerx, self.player.rect.top,
+                                 damage, DAMAGE_HURT)
+                spent.append(slot)
+                break
+        projectiles.remove_many(spent)
+
+    def damage_boss(self, amount, source):
+        was_dead = self.boss.dead
+        self.boss.take_damage(amount)
+        now = game_clock.now()
+        self.events.emit(DAMAGE, now, self.boss.rect.centerx, self.boss.rect.top, amount, source)
+        if self.boss.dead and not was_dead:
+            self.events.emit(KILL, now, self.boss.rect.centerx, self.boss.rect.centery, tag=-1)
 
     def spawn_initial_enemies(self):
         """Spawn initial enemies away from the player's starting position"""
+        # pick straight from the precomputed empty cells instead of random retries
+        candidates = self.grid.free_cells_in(int(VIRTUAL_WIDTH * 0.7), int(LEVEL_WIDTH * 0.8),
+                                             40, int(VIRTUAL_HEIGHT * 0.7))
+        if not candidates:
+            return
         for i in range(3):  # Start with fewer enemies
-            valid_spawn = False
-            attempts = 0
-            while not valid_spawn and attempts < 10:
-                ex = random.randint(int(VIRTUAL_WIDTH * 0.7), int(LEVEL_WIDTH * 0.8))
-                ey = random.randint(40, int(VIRTUAL_HEIGHT * 0.7))
-                # Check if spawn point is valid (not inside tiles)
-                valid_spawn = True
-                spawn_rect = pygame.Rect(ex, ey, 32, 32)
-                for tile in self.tiles:
-                    if spawn_rect.colliderect(tile):
-                        valid_spawn = False
-                        break
-                attempts += 1
-            
-            if valid_spawn:
-                enemy_kind = random.choice(self.enemy_types[self.stage_index])
-                self.enemies.append(Enemy(ex, ey, kind=enemy_kind))
+            ex, ey = self.ground_spawn_pos(*random.choice(candidates))
+            enemy_kind = random.choice(self.enemy_types[self.stage_index])
+            self.add_enemy(ex, ey, enemy_kind)
 
     def try_spawn_enemy(self):
         """Attempt to spawn a new enemy if conditions are met"""
-        now = time.time()
+        now = game_clock.now()
         if (now - self.last_spawn_time < self.spawn_cooldown or 
             len(self.enemies) >= self.max_enemies):
             return
@@ -469,35 +628,36 @@ class GameStateManager:
         if spawn_left >= spawn_right:
             return
 
-        valid_spawn = False
-        attempts = 0
-        while not valid_spawn and attempts < 10:
-            ex = random.randint(spawn_left, spawn_right)
-            ey = random.randint(40, int(VIRTUAL_HEIGHT * 0.7))
-            
-            # Check distance from player
-            dx = ex - self.player.rect.centerx
-            dy = ey - self.player.rect.centery
-            dist = (dx*dx + dy*dy) ** 0.5
-            
-            if dist < self.min_spawn_distance:
-                attempts += 1
-                continue
-
-            # Check if spawn point is valid (not inside tiles)
-            valid_spawn = True
-            spawn_rect = pygame.Rect(ex, ey, 32, 32)
-            for tile in self.tiles:
-                if spawn_rect.colliderect(tile):
-                    valid_spawn = False
-                    break
-            attempts += 1
-
-        if valid_spawn:
+        # Empty cells in range that are far enough from the player
+        px = self.player.rect.centerx
+        py = self.player.rect.centery
+        min_dist_sq = self.min_spawn_distance * self.min_spawn_distance
+        candidates = []
+        for cell in self.grid.free_cells_in(spawn_left, spawn_right, 40, int(VIRTUAL_HEIGHT * 0.7)):
+            ex, ey = self.ground_spawn_pos(*cell)
+            dx = ex - px
+            dy = ey - py
+            if dx*dx + dy*dy >= min_dist_sq:
+                candidates.append((ex, ey))
+
+        if candidates:
+            ex, ey = random.choice(candidates)
             enemy_kind = random.choice(self.enemy_types[self.stage_index])
-            self.enemies.append(Enemy(ex, ey, kind=enemy_kind))
+            self.add_enemy(ex, ey, enemy_kind)
             self.last_spawn_time = now
 
+    def add_enemy(self, x, y, kind):
+        self.enemies.append(self.make_enemy(x, y, kind))
+        self.events.emit(SPAWN, game_clock.now(), x, y, tag=ENEMY_KINDS.index(kind))
+
+    def ground_spawn_pos(self, cx, cy):
+        """Top-left for an enemy spawned in an empty cell, dropped onto the surface below it."""
+        ex, ey = self.grid.cell_topleft(cx, cy)
+        ground = self.grid.ground_below(ex + TILE_SIZE // 2, ey + TILE_SIZE)
+        if ground is not None:
+            ey = ground - TILE_SIZE
+        return ex, ey
+
     def update_camera(self):
         # Update camera position to follow player
         target_x = self.player.rect.centerx - VIRTUAL_WIDTH // 2
@@ -521,72 +681,24 @@ class GameStateManager:
         self.update_camera()
         
         # Screen shake offset
-        shake_x = random.randint(-int(self.screen_shake), int(self.screen_shake)) if self.screen_shake > 0 else 0
-        shake_y = random.randint(-int(self.screen_shake), int(self.screen_shake)) if self.screen_shake > 0 else 0
+        shake_x, shake_y = self.postfx.begin_frame(self.screen_shake)
         camera_with_shake = self.camera_x - shake_x
         
-        # tiles (with camera offset and shake)
+        queue = self.render_queue
+        now = game_clock.now()
+
+        # tiles (with camera offset and shake): one batch for the whole strip
+        tiles = queue.layer(LAYER_TILES)
         for tile_surf, pos in self.tile_surfaces:
             camera_adjusted_pos = (pos[0] - camera_with_shake, pos[1] + shake_y)
             # Only draw if on screen
             if -tile_surf.get_width() <= camera_adjusted_pos[0] <= VIRTUAL_WIDTH:
-                surf.blit(tile_surf, camera_adjusted_pos)
-            # Draw checkpoints with enhanced visuals
-            for cp in self.checkpoints:
-                draw_x = cp['rect'].x - camera_with_shake
-                draw_y = cp['rect'].y
-                if -32 <= draw_x <= VIRTUAL_WIDTH:
-                    now = time.time()
-                    activation_time = cp.get('activation_time', now)
-                    
-                    if cp['activated']:
-                        # Fade from gray to green over 1 second
-                        progress = min(1.0, (now - activation_time))
-                        green = int(180 + (75 * progress))  # 180 -> 255
-                        gray = int(180 - (80 * progress))   # 180 -> 100
-                        color = (gray, green, gray)
-                        
-                        # Expanding activation ring
-                        ring_size = int(20 * progress)
-                        if progress < 1.0:
-                            ring_rect = (
-                                draw_x - ring_size//2,
-                                draw_y - ring_size//2,
-                                cp['rect'].width + ring_size,
-                                cp['rect'].height + ring_size
-                            )
-                            pygame.draw.rect(surf, (100, 255, 100), ring_rect, 2)
-                        
-                        # Pulsing glow effect
-                        pulse = (math.sin(now * 4) + 1) / 2
-                        glow_alpha = int(60 + 40 * pulse)
-                        glow_surf = pygame.Surface((cp['rect'].width + 8, cp['rect'].height + 8))
-                        glow_surf.fill((100, 255, 100))
-                        glow_surf.set_alpha(glow_alpha)
-                        surf.blit(glow_surf, (draw_x - 4, draw_y - 4))
-                        
-                        # Draw checkpoint symbol
-                        symbol_x = draw_x + cp['rect'].width // 2
-                        symbol_y = draw_y + cp['rect'].height // 2
-                        symbol_color = (50, 200, 50)
-                        points = [
-                            (symbol_x - 4, symbol_y),
-                            (symbol_x, symbol_y + 4),
-                            (symbol_x + 8, symbol_y - 8)
-                        ]
-                        pygame.draw.lines(surf, symbol_color, False, points, 2)
-                    else:
-                        # Inactive checkpoint
-                        color = (180, 180, 180)
-                        # Subtle hover effect when player is near
-                        if self.player:
-                            dist_to_player = abs(self.player.rect.centerx - (cp['rect'].x + cp['rect'].width//2))
-                            if dist_to_player < 100:
-                                hover = (100 - dist_to_player) / 100
-                                color = (180, min(255, 180 + int(75 * hover)), 180)
-                    
-                    # Draw main checkpoint rectangle
-                    pygame.draw.rect(surf, color, (draw_x, draw_y, cp['rect'].width, cp['rect'].height))        # enemies (with camera offset)
+                tiles.blit(tile_surf, camera_adjusted_pos)
+
+        # Draw checkpoints with enhanced visuals
+        world = queue.layer(LAYER_WORLD)
+        self.draw_checkpoints(world, camera_with_shake, now)
+
         # draw the guide NPC in final stage (if present and not yet betrayed)
         if self.guide_present and not self.guide_betrayed:
             # draw a simple guide sprite (circle + name) at guide_pos
@@ -596,63 +708,127 @@ class GameStateManager:
             # only draw if on screen
             if -32 <= draw_x <= VIRTUAL_WIDTH + 32:
                 # guide body
-                pygame.draw.circle(surf, (180, 220, 255), (int(draw_x), int(draw_y)), 10)
+                world.draw(pygame.draw.circle, (180, 220, 255), (int(draw_x), int(draw_y)), 10)
                 # robe
-                pygame.draw.circle(surf, (120, 180, 220), (int(draw_x), int(draw_y)+6), 8)
+                world.draw(pygame.draw.circle, (120, 180, 220), (int(draw_x), int(draw_y)+6), 8)
                 # label
-                font = pygame.font.SysFont('consolas', 12)
-                lbl = font.render('Guide', True, (240,240,240))
-                surf.blit(lbl, (draw_x - lbl.get_width()//2, draw_y - 24))
+                lbl = guide_label()
+                self.overlay.add_label(lbl, draw_x - lbl.get_width()//2, draw_y - 24)
 
         for e in self.enemies:
             camera_adjusted_rect = e.rect.copy()
             camera_adjusted_rect.x -= camera_with_shake
             # Only draw if on screen
             if -camera_adjusted_rect.width <= camera_adjusted_rect.x <= VIRTUAL_WIDTH:
-                e.draw(surf, camera_with_shake, shake_y)
+                e.draw(surf, camera_with_shake, shake_y, self.overlay, queue)
 
         # draw worry spheres
-        for ws in getattr(self, 'worry_spheres', []):
-            ws.draw(surf, camera_with_shake, shake_y)
+        queue.layer(LAYER_EFFECTS).draw(self.aoe.draw, camera_with_shake, shake_y)
+        self.projectiles.draw(queue.layer(LAYER_EFFECTS), camera_with_shake, shake_y, VIRTUAL_WIDTH)
         
         # boss (with camera offset)
         if self.boss:
             boss_rect = self.boss.rect.copy()
             boss_rect.x -= camera_with_shake
             if -boss_rect.width <= boss_rect.x <= VIRTUAL_WIDTH:
-                self.boss.draw(surf, camera_with_shake, shake_y)
+                queue.layer(LAYER_BOSS).draw(self.boss.draw, camera_with_shake, shake_y, self.overlay)
         
         # player (with camera offset)
         player_rect = self.player.rect.copy()
         player_rect.x -= camera_with_shake
-        self.player.draw(surf, camera_x=camera_with_shake, shake_y=shake_y)
+        self.player.draw(surf, camera_x=camera_with_shake, shake_y=shake_y, queue=queue)
+
+        # world-space overlay: every health bar and label in one batched pass
+        queue.layer(LAYER_OVERLAY).draw(self.overlay.flush)
         
-        # Draw damage numbers (no camera offset - world space already applied)
-        font = pygame.font.SysFont('consolas', 14, bold=True)
-        for dmg in self.damage_numbers:
-            alpha = int(255 * dmg['life'])
-            text = font.render(str(dmg['amount']), True, dmg['color'])
-            text.set_alpha(alpha)
-            surf.blit(text, (int(dmg['x'] - camera_with_shake), int(dmg['y'] + shake_y)))
+        # Draw damage numbers (world space, composed from cached digit glyphs)
+        queue.layer(LAYER_TEXT).draw(self.damage_numbers.draw, camera_with_shake, shake_y)
+
+        # submit everything above, back to front
+        queue.flush(surf)
         
         # HUD and guide text (no camera offset - stays fixed on screen)
         draw_hud(surf, self.player, self.stage_index+1, self.guide_text, lives=self.lives)
 
-        # Fade overlay for death/respawn
+        # Screen-space effects over the whole frame
+        now = game_clock.now()
+        fx = self.postfx
+        if self.cutscene_active:
+            fx.set_tint(*CUTSCENE_TINT)
+        else:
+            fx.set_tint(None, 0)
+        health = self.player.health / max(1, self.player.max_health)
+        fx.vignette_strength = 0.0 if self.player.dead else max(0.0, 1.0 - health / LOW_HEALTH_FRACTION)
+        # Fade for death/respawn
+        fx.fade_alpha = 0
         if self.fade_state:
-            now = time.time()
             t = min(1.0, (now - self.fade_start) / max(0.0001, self.fade_duration))
             if self.fade_state == 'out':
-                alpha = int(255 * t)
+                fx.fade_alpha = int(255 * t)
             else:  # 'in'
-                alpha = int(255 * (1.0 - t))
-            fade_surf = pygame.Surface((VIRTUAL_WIDTH, VIRTUAL_HEIGHT))
-            fade_surf.fill((0, 0, 0))
-            fade_surf.set_alpha(alpha)
-            surf.blit(fade_surf, (0, 0))
+                fx.fade_alpha = int(255 * (1.0 - t))
             # finish fade-in state
             if self.fade_state == 'in' and t >= 1.0:
                 self.fade_state = None
+        fx.apply(surf, now)
+
+    def draw_checkpoints(self, out, camera_x, now):
+        """Checkpoint posts with activation ring, glow and tick mark."""
+        for cp in self.checkpoints:
+            draw_x = cp['rect'].x - camera_x
+            draw_y = cp['rect'].y
+            if -32 <= draw_x <= VIRTUAL_WIDTH:
+                activation_time = cp.get('activation_time', now)
+
+                if cp['activated']:
+                    # Fade from gray to green over 1 second
+                    progress = min(1.0, (now - activation_time))
+                    green = int(180 + (75 * progress))  # 180 -> 255
+                    gray = int(180 - (80 * progress))   # 180 -> 100
+                    color = (gray, green, gray)
+
+                    # Expanding activation ring
+                    ring_size = int(20 * progress)
+                    if progress < 1.0:
+                        ring_rect = (
+                            draw_x - ring_size//2,
+                            draw_y - ring_size//2,
+                            cp['rect'].width + ring_size,
+                            cp['rect'].height + ring_size
+                        )
+                        out.draw(pygame.draw.rect, (100, 255, 100), ring_rect, 2)
+
+                    # Pulsing glow effect
+                    if quality.tier().checkpoint_glow:
+                        pulse = (math.sin(now * 4) + 1) / 2
+                        glow_alpha = int(60 + 40 * pulse)
+                        glow_surf = pygame.Surface((cp['rect'].width + 8, cp['rect'].height + 8))
+                        glow_surf.fill((100, 255, 100))
+                        glow_surf.set_alpha(glow_alpha)
+                        out.blit(glow_surf, (draw_x - 4, draw_y - 4))
+
+                    # Draw checkpoint symbol
+                    symbol_x = draw_x + cp['rect'].width // 2
+                    symbol_y = draw_y + cp['rect'].height // 2
+                    symbol_color = (50, 200, 50)
+                    points = [
+                        (symbol_x - 4, symbol_y),
+                        (symbol_x, symbol_y + 4),
+                        (symbol_x + 8, symbol_y - 8)
+                    ]
+                    out.draw(pygame.draw.lines, symbol_color, False, points, 2)
+                else:
+                    # Inactive checkpoint
+                    color = (180, 180, 180)
+                    # Subtle hover effect when player is near
+                    if self.player:
+                        dist_to_player = abs(self.player.rect.centerx - (cp['rect'].x + cp['rect'].width//2))
+                        if dist_to_player < 100:
+                            hover = (100 - dist_to_player) / 100
+                            color = (180, min(255, 180 + int(75 * hover)), 180)
+
+                # Draw main checkpoint rectangle
+                out.draw(pygame.draw.rect, color, (draw_x, draw_y, cp['rect'].width, cp['rect'].height))
 
     def advance_stage_or_end(self):
         # call to advance to next stage, or finish
@@ -666,9 +842,9 @@ class GameStateManager:
             # - if you saved/obeyed the guide, good ending
             # - if you drank it selfishly (e.g., killed many enemies?), neutral
             cp = self.player.choice_points + self.guide_help_count
-            if cp >= 5:
+            if cp >= self.good_ending_threshold:
                 self.ending = "Good Ending — Shared Water (Guide saved you)"
-            elif cp >= 2:
+            elif cp >= self.neutral_ending_threshold:
                 self.ending = "Neutral Ending — You drink alone"
             else:
                 self.ending = "Bad Ending — Guide betrays you and claims 41 Water"
@@ -687,8 +863,12 @@ class GameStateManager:
 
         # Spawn the boss at the guide's position, slightly above ground
         gx, gy = getattr(self, 'guide_pos', (int(self.level_width*0.5), VIRTUAL_HEIGHT - TILE_SIZE*3))
-        # place boss so it appears where the guide was standing
-        self.boss = Boss(gx - 32, gy - 48)
+        # place boss so it appears where the guide was standing, feet on the ground
+        ground = self.grid.ground_below(gx, gy) if self.grid else None
+        if ground is not None:
+            self.boss = Boss(gx - 32, ground - 64)
+        else:
+            self.boss = Boss(gx - 32, gy - 48)
         # tint boss to feel personal
         try:
             self.boss.color = (180, 70, 160)
@@ -708,7 +888,7 @@ class GameStateManager:
         # Begin a short cutscene: update guide text and prevent gameplay updates until cutscene ends
         if self.cutscene_active or self.guide_betrayed:
             return
-        now = time.time()
+        now = game_clock.now()
         self.cutscene_active = True
         self.cutscene_end_time = now + duration
         # Short dialog that will be shown during the cutscene
@@ -716,24 +896,35 @@ class GameStateManager:
     
     def trigger_hitstop(self, duration=0.1):
         """Freeze gameplay briefly for impact feel"""
-        self.hitstop_until = time.time() + duration
+        self.hitstop_until = max(self.hitstop_until, game_clock.now() + duration)
         
     def add_screen_shake(self, intensity=3):
         """Add screen shake effect"""
         self.screen_shake = max(self.screen_shake, intensity)
         
+    def on_damage_event(self, kind, t, x, y, value, tag):
+        """Damage feedback: floating number, hitstop and screen shake by source."""
+        color, hitstop, shake = DAMAGE_EFFECTS[tag]
+        if color:
+            self.spawn_damage_number(x, y, value, color)
+        if hitstop:
+            self.trigger_hitstop(hitstop)
+            self.add_screen_shake(shake)
+        if tag == DAMAGE_HURT:
+            self.postfx.flash(HURT_FLASH_COLOR, t)
+
     def spawn_damage_number(self, x, y, amount, color=(255, 200, 100)):
         """Create floating damage number"""
-        self.damage_numbers.append({
-            'x': x,
-            'y': y,
-            'amount': int(amount),
-            'color': color,
-            'life': 1.0,
-            'created': time.time(),
-            'vy': -2
-        })
+        self.damage_numbers.spawn(x, y, amount, color)
         
+    def snapshot(self):
+        """Pack the current game state into a compact bytes blob."""
+        return pack_state(self)
+
+    def restore(self, blob, restore_rng=True):
+        """Restore a state produced by snapshot(); timers resume with the same time left."""
+        unpack_state(self, blob, restore_rng=restore_rng)
+
     def record_choice(self, event_type, delta=1):
         """Track player morality choices"""
         if event_type == 'mercy':
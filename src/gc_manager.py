@@ -0,0 +1,102 @@
+# gc_manager.py
+# Frame-synchronous garbage collection. Automatic collection is switched off
+# during play; after each frame the main loop hands the collector whatever
+# time is left before the next deadline, and older generations wait for
+# frames where a pause cannot be seen (hitstop, cutscenes, fades) or for
+# stage loads. Everything alive right after a stage load is frozen, so later
+# collections do not rescan the level, sprites and caches.
+import gc
+import time
+from array import array
+
+YOUNG_THRESHOLD = 700   # gen0 allocations before a young collection is due
+GEN1_AFTER = 10         # young collections before gen1 is due outside quiet frames
+FORCE_FACTOR = 20       # past this many thresholds gen0 is collected even without slack
+QUIET_BUDGET = 0.008    # seconds a quiet frame may spend collecting
+PAUSE_SAMPLES = 1024    # recent pauses kept for percentiles
+
+# starting estimates of a collection's cost per generation, in seconds
+INITIAL_COST = (0.0002, 0.001, 0.004)
+
+
+class GCManager:
+    def __init__(self, threshold=YOUNG_THRESHOLD):
+        self.threshold = threshold
+        self.running = False
+        self.cost = list(INITIAL_COST)
+        self.collections = [0, 0, 0]
+        self.forced = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.pauses = array('d', [0.0] * PAUSE_SAMPLES)
+        self.count = 0
+        self._was_enabled = True
+
+    def start(self):
+        """Take over from the automatic collector."""
+        self._was_enabled = gc.isenabled()
+        gc.disable()
+        self.running = True
+
+    def stop(self):
+        self.running = False
+        gc.unfreeze()
+        if self._was_enabled:
+            gc.enable()
+
+    def collect(self, generation, forced=False):
+        t = time.perf_counter()
+        gc.collect(generation)
+        pause = time.perf_counter() - t
+        self.collections[generation] += 1
+        self.forced += forced
+        self.total += pause
+        self.longest = max(self.longest, pause)
+        self.pauses[self.count % PAUSE_SAMPLES] = pause
+        self.count += 1
+        # track the typical cost, but react quickly when collections get slower
+        self.cost[generation] = max(pause, self.cost[generation] * 0.9 + pause * 0.1)
+        return generation
+
+    def stage_loaded(self):
+        """Full collection, then freeze the survivors (level, player, caches). The
+        previous stage's frozen objects are thawed first so its garbage is freed."""
+        gc.unfreeze()
+        self.collect(2)
+        gc.freeze()
+
+    def idle(self, slack, quiet=False):
+        """Collect what is due and fits in `slack` seconds; quiet frames (pauses
+        hidden by hitstop, cutscenes or fades) may also run older generations.
+        Returns the generation collected, or None."""
+        if not self.running:
+            return None
+        budget = max(slack, QUIET_BUDGET) if quiet else slack
+        young, middle, old = gc.get_count()
+        if quiet:
+            if old and self.cost[2] <= budget:
+                return self.collect(2)
+            if middle and self.cost[1] <= budget:
+                return self.collect(1)
+        if young >= self.threshold:
+            if self.cost[0] <= budget:
+                return self.collect(0)
+            if young >= self.threshold * FORCE_FACTOR:
+                return self.collect(0, forced=True)
+        elif middle >= GEN1_AFTER and self.cost[1] <= budget:
+            return self.collect(1)
+        return None
+
+    def percentile(self, p):
+        n = min(self.count, PAUSE_SAMPLES)
+        if not n:
+            return 0.0
+        pauses = sorted(self.pauses[:n])
+        return pauses[min(n - 1, int(p / 100.0 * n))]
+
+    def report(self):
+        young, middle, old = self.collections
+        return (f"gc: {self.count} collections (gen0 {young}, gen1 {middle}, gen2 {old}, "
+                f"forced {self.forced}), {self.total * 1000:.1f} ms total; pause p50 "
+                f"{self.percentile(50) * 1000:.2f} ms, p99 {self.percentile(99) * 1000:.2f} ms, "
+                f"max {self.longest * 1000:.2f} ms; frozen objects {gc.get_freeze_count()}")
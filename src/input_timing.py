@@ -0,0 +1,85 @@
+# input_timing.py
+# Frame waiting, input sampling and input-to-present latency measurement.
+#
+# Late sampling (the default) waits for the next frame first and reads input
+# immediately before the simulation step. Early sampling reads input before
+# waiting, so a key pressed during the wait is only seen a frame later. When
+# measuring, the wait polls the event queue in short slices so every key press
+# gets an arrival time close to when it actually happened.
+import math
+import time
+import pygame
+
+class InputSampler:
+    def __init__(self, pacer, early=False, stamp_events=False):
+        self.pacer = pacer
+        self.early = early
+        self.stamp_events = stamp_events
+        self._held = []  # (event, arrival time) not yet handed to a frame
+
+    def _pump(self):
+        t = time.perf_counter()
+        for e in pygame.event.get():
+            self._held.append((e, t))
+
+    def wait(self):
+        """Wait for the next frame (see pacing.py); returns dt in seconds."""
+        return self.pacer.wait(self._pump if self.stamp_events else None)
+
+    def take(self):
+        """Events that arrived up to now, with their arrival times."""
+        self._pump()
+        events, self._held = self._held, []
+        return events
+
+    def frame(self, read_inputs):
+        """Wait for the next frame and sample input in the configured order.
+        read_inputs(events) builds the frame's inputs; returns (dt, events, inputs)."""
+        if self.early:
+            events = self.take()
+            inputs = read_inputs(events)
+            dt = self.wait()
+        else:
+            dt = self.wait()
+            events = self.take()
+            inputs = read_inputs(events)
+        return dt, events, inputs
+
+
+class LatencyProbe:
+    """Time from a key press arriving to the end of the flip of the first frame
+    that simulated it, per action."""
+    def __init__(self):
+        self.pending = []   # (action, arrival time)
+        self.samples = {}   # action -> [milliseconds]
+
+    def on_input(self, action, t):
+        self.pending.append((action, t))
+
+    def take_pending(self):
+        """Inputs simulated by the current frame, for presenting it later."""
+        pending, self.pending = self.pending, []
+        return pending
+
+    def on_present(self, t, pending=None):
+        if pending is None:
+            pending = self.take_pending()
+        for action, t_in in pending:
+            self.samples.setdefault(action, []).append((t - t_in) * 1000.0)
+
+    def report(self):
+        lines = ["input-to-present latency (ms)",
+                 f"{'action':<8} {'n':>5} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+        for action in sorted(self.samples):
+            ms = sorted(self.samples[action])
+            lines.append(f"{action:<8} {len(ms):>5} {percentile(ms, 50):>7.1f} "
+                         f"{percentile(ms, 95):>7.1f} {percentile(ms, 99):>7.1f} {ms[-1]:>7.1f}")
+        if len(lines) == 2:
+            lines.append("(no key presses recorded)")
+        return "\n".join(lines)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    k = math.ceil(p / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, k))]
@@ -1,5 +1,6 @@
 # level.py
 import pygame
+from bisect import bisect_left, bisect_right
 from assets import generate_tile
 from settings import VIRTUAL_WIDTH, VIRTUAL_HEIGHT
 from pygame import Rect
@@ -26,6 +27,120 @@ def build_level_from_array(arr):
                 tile_surfaces.append((surf, rect.topleft))
     return tiles, tile_surfaces
 
+# Tile codes stored in the occupancy grid (0 means empty)
+TILE_CODES = {"G": 1, "R": 2}
+
+class LevelGrid:
+    """Dense occupancy grid for a level, one byte per tile cell.
+
+    Cells store a tile code (0 = empty) so point, cell and rect queries are a
+    couple of index lookups instead of a scan over every tile rect. Cells
+    outside the grid count as empty, matching plain rect collision.
+    """
+    def __init__(self, cols, rows, cells, tile_size=TILE_SIZE):
+        self.cols = cols
+        self.rows = rows
+        self.cells = cells
+        self.tile_size = tile_size
+        self.width = cols * tile_size
+        self.height = rows * tile_size
+        # empty cells ordered by column then row, used to pick spawn spots
+        self.free_cells = [(cx, cy) for cx in range(cols) for cy in range(rows)
+                           if not cells[cy * cols + cx]]
+        self._free_cols = [cx for cx, _ in self.free_cells]
+        # per-column heightmap: pixel tops of every walkable surface (solid cell
+        # with an empty cell above), topmost first, plus the topmost on its own
+        self.surfaces = []
+        for cx in range(cols):
+            tops = []
+            for cy in range(rows):
+                if cells[cy * cols + cx] and (cy == 0 or not cells[(cy - 1) * cols + cx]):
+                    tops.append(cy * tile_size)
+            self.surfaces.append(tops)
+        self.heights = [tops[0] if tops else None for tops in self.surfaces]
+
+    @classmethod
+    def from_array(cls, arr, tile_size=TILE_SIZE):
+        rows = len(arr)
+        cols = max(len(r) for r in arr)
+        cells = bytearray(rows * cols)
+        for y, row in enumerate(arr):
+            for x, ch in enumerate(row):
+                cells[y * cols + x] = TILE_CODES.get(ch, 0)
+        return cls(cols, rows, cells, tile_size)
+
+    def cell_at(self, cx, cy):
+        """Tile code at a cell, 0 if empty or out of bounds."""
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return self.cells[cy * self.cols + cx]
+        return 0
+
+    def is_solid_cell(self, cx, cy):
+        return self.cell_at(cx, cy) != 0
+
+    def is_solid_at(self, x, y):
+        """True if the pixel (x, y) lies inside a solid tile."""
+        ts = self.tile_size
+        return self.cell_at(int(x) // ts, int(y) // ts) != 0
+
+    def rect_is_free(self, rect):
+        """True if rect overlaps no solid tile (same result as colliderect on every tile)."""
+        if rect.width <= 0 or rect.height <= 0:
+            return True
+        ts = self.tile_size
+        x0 = max(0, rect.left // ts)
+        x1 = min(self.cols - 1, (rect.right - 1) // ts)
+        y0 = max(0, rect.top // ts)
+        y1 = min(self.rows - 1, (rect.bottom - 1) // ts)
+        cols = self.cols
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            base = cy * cols
+            for cx in range(x0, x1 + 1):
+                if cells[base + cx]:
+                    return False
+        return True
+
+    def free_cells_in(self, x0, x1, y0, y1):
+        """Empty cells whose top-left pixel lies inside [x0, x1] x [y0, y1]."""
+        ts = self.tile_size
+        lo = bisect_left(self._free_cols, -(-x0 // ts))
+        hi = bisect_right(self._free_cols, x1 // ts)
+        return [(cx, cy) for cx, cy in self.free_cells[lo:hi] if y0 <= cy * ts <= y1]
+
+    def ground_at(self, x):
+        """Pixel y of the topmost surface in the column containing x, or None."""
+        cx = int(x) // self.tile_size
+        if 0 <= cx < self.cols:
+            return self.heights[cx]
+        return None
+
+    def ground_below(self, x, y):
+        """Pixel y of the first surface at or below y in the column containing x, or None."""
+        cx = int(x) // self.tile_size
+        if 0 <= cx < self.cols:
+            for top in self.surfaces[cx]:
+                if top >= y:
+                    return top
+        return None
+
+    def cell_topleft(self, cx, cy):
+        return (cx * self.tile_size, cy * self.tile_size)
+
+    def ground_ahead(self, rect, direction):
+        """True if there is solid ground just past the leading bottom corner of rect."""
+        x = rect.right if direction > 0 else rect.left - 1
+        return self.is_solid_at(x, rect.bottom)
+
+    def wall_ahead(self, rect, direction):
+        """True if a solid tile touches the leading side of rect."""
+        ts = self.tile_size
+        cx = (rect.right if direction > 0 else rect.left - 1) // ts
+        for cy in range(rect.top // ts, (rect.bottom - 1) // ts + 1):
+            if self.cell_at(cx, cy):
+                return True
+        return False
+
 # Sample levels: each is a small array of strings
 LEVELS = []
 
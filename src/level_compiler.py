@@ -0,0 +1,199 @@
+# level_compiler.py
+# Compiles LEVELS into compact binary artifacts cached on disk, so stage loads
+# skip string parsing, tile generation and collision setup after the first run.
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+import tempfile
+import pygame
+from assets import generate_tile
+from level import LEVELS, TILE_SIZE, TILE_CODES, LevelGrid
+from settings import PIXEL_SCALE, LEVEL_WIDTH, LEVEL_CACHE_DIR
+
+# Bump when the artifact layout changes
+FORMAT_VERSION = 1
+MAGIC = b"41WL"
+
+# magic, version, cols, rows, tile size, has spawn, spawn x, spawn y,
+# rect count, checkpoint count, image count
+HEADER = struct.Struct("<4sHHHHBiiHHH")
+RECT = struct.Struct("<iiii")        # x, y, w, h
+CHECKPOINT = struct.Struct("<ii")    # x, ground y (-1 if no ground)
+IMAGE = struct.Struct("<BHHI")       # tile code, width, height, byte count
+
+TILE_KINDS = {code: ch for ch, code in TILE_CODES.items()}
+TILE_NAMES = {"G": "grass", "R": "rock"}
+
+# Relative x positions of the automatic checkpoints
+CHECKPOINT_FRACTIONS = (0.33, 0.66)
+
+_tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+_frombytes = getattr(pygame.image, "frombytes", None) or pygame.image.fromstring
+
+# Levels already loaded in this process, keyed by content hash
+_loaded = {}
+
+
+class CompiledLevel:
+    """Everything load_stage needs for one level, ready to use."""
+    def __init__(self, grid, rects, spawn, checkpoints, tile_images):
+        self.grid = grid
+        self.rects = rects              # merged collision rects
+        self.spawn = spawn              # (x, y) of 'P', or None
+        self.checkpoints = checkpoints  # list of (x, ground_y or None)
+        self.tile_images = tile_images  # tile code -> Surface
+        # one shared surface per tile kind, positioned per solid cell
+        ts = grid.tile_size
+        cols = grid.cols
+        self.tile_surfaces = [(tile_images[code], ((i % cols) * ts, (i // cols) * ts))
+                              for i, code in enumerate(grid.cells) if code]
+
+
+def level_hash(arr):
+    """Content hash of a level's source and the settings its artifact depends on."""
+    h = hashlib.sha1()
+    h.update("\n".join(arr).encode("utf-8"))
+    h.update(struct.pack("<IIII", FORMAT_VERSION, TILE_SIZE, PIXEL_SCALE, LEVEL_WIDTH))
+    try:
+        # baked tile images go stale if the tile generator changes
+        h.update(inspect.getsource(generate_tile).encode("utf-8"))
+    except (OSError, TypeError):
+        pass
+    return h.hexdigest()
+
+
+def merge_rects(grid):
+    """Merge solid cells into few rects: horizontal runs, then equal runs stacked vertically."""
+    ts = grid.tile_size
+    cols = grid.cols
+    cells = grid.cells
+    open_runs = {}  # (x0, x1) -> [x0, y0, x1, y1] still growing downwards
+    rects = []
+    for cy in range(grid.rows):
+        runs = []
+        cx = 0
+        while cx < cols:
+            if cells[cy * cols + cx]:
+                start = cx
+                while cx < cols and cells[cy * cols + cx]:
+                    cx += 1
+                runs.append((start, cx))
+            else:
+                cx += 1
+        next_open = {}
+        for run in runs:
+            r = open_runs.pop(run, None)
+            if r is None:
+                r = [run[0], cy, run[1], cy + 1]
+            else:
+                r[3] = cy + 1
+            next_open[run] = r
+        rects.extend(open_runs.values())
+        open_runs = next_open
+    rects.extend(open_runs.values())
+    rects.sort(key=lambda r: (r[1], r[0]))
+    return [pygame.Rect(x0 * ts, y0 * ts, (x1 - x0) * ts, (y1 - y0) * ts) for x0, y0, x1, y1 in rects]
+
+
+def compile_level(arr):
+    """Build a CompiledLevel from a level's string array."""
+    grid = LevelGrid.from_array(arr)
+    spawn = None
+    for y, row in enumerate(arr):
+        for x, ch in enumerate(row):
+            if ch == "P":
+                spawn = (x * TILE_SIZE, y * TILE_SIZE)
+    checkpoints = []
+    for frac in CHECKPOINT_FRACTIONS:
+        cx = int(LEVEL_WIDTH * frac)
+        checkpoints.append((cx, grid.ground_at(cx)))
+    tile_images = {code: generate_tile(TILE_NAMES[ch]) for code, ch in TILE_KINDS.items()
+                   if code in grid.cells}
+    return CompiledLevel(grid, merge_rects(grid), spawn, checkpoints, tile_images)
+
+
+def serialize(level):
+    """Pack a CompiledLevel into the binary artifact format."""
+    grid = level.grid
+    spawn = level.spawn or (0, 0)
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, grid.cols, grid.rows, grid.tile_size,
+                         level.spawn is not None, spawn[0], spawn[1],
+                         len(level.rects), len(level.checkpoints), len(level.tile_images)),
+             bytes(grid.cells)]
+    for r in level.rects:
+        parts.append(RECT.pack(r.x, r.y, r.width, r.height))
+    for x, ground in level.checkpoints:
+        parts.append(CHECKPOINT.pack(x, -1 if ground is None else ground))
+    for code, surf in level.tile_images.items():
+        raw = _tobytes(surf, "RGBA")
+        parts.append(IMAGE.pack(code, surf.get_width(), surf.get_height(), len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def deserialize(buf):
+    """Rebuild a CompiledLevel from an artifact buffer (bytes or mmap)."""
+    (magic, version, cols, rows, tile_size, has_spawn, sx, sy,
+     n_rects, n_checkpoints, n_images) = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a compiled level artifact")
+    off = HEADER.size
+    cells = bytearray(buf[off:off + cols * rows])
+    off += cols * rows
+    rects = []
+    for _ in range(n_rects):
+        rects.append(pygame.Rect(RECT.unpack_from(buf, off)))
+        off += RECT.size
+    checkpoints = []
+    for _ in range(n_checkpoints):
+        x, ground = CHECKPOINT.unpack_from(buf, off)
+        checkpoints.append((x, None if ground < 0 else ground))
+        off += CHECKPOINT.size
+    tile_images = {}
+    for _ in range(n_images):
+        code, w, h, n = IMAGE.unpack_from(buf, off)
+        off += IMAGE.size
+        tile_images[code] = _frombytes(bytes(buf[off:off + n]), (w, h), "RGBA")
+        off += n
+    grid = LevelGrid(cols, rows, cells, tile_size)
+    spawn = (sx, sy) if has_spawn else None
+    return CompiledLevel(grid, rects, spawn, checkpoints, tile_images)
+
+
+def cache_path(key):
+    return os.path.join(LEVEL_CACHE_DIR, f"level-{key}.bin")
+
+
+def load_level(idx):
+    """Return the CompiledLevel for LEVELS[idx], compiling and caching it if needed."""
+    arr = LEVELS[idx]
+    key = level_hash(arr)
+    level = _loaded.get(key)
+    if level is not None:
+        return level
+    path = cache_path(key)
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                level = deserialize(mm)
+    except (OSError, ValueError, struct.error):
+        level = compile_level(arr)
+        try:
+            os.makedirs(LEVEL_CACHE_DIR, exist_ok=True)
+            # a temp file of its own: the warm-up and preload threads can both
+            # compile the same level at once
+            fd, tmp = tempfile.mkstemp(dir=LEVEL_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(serialize(level))
+                os.replace(tmp, path)
+            except OSError:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            # read-only install: keep the in-memory result only
+            pass
+    _loaded[key] = level
+    return level
@@ -1,43 +1,136 @@
 # main.py
+from startup import TIMER, start_warm_up
 import pygame, sys, time
+import argparse
 from settings import *
 from game_states import GameStateManager
-from ui import draw_hud
+from events import TelemetryExporter
+from input_timing import InputSampler, LatencyProbe
+from pacing import FramePacer, PACING_MODES
+import quality
+from soak import AllocationProfiler
+from gc_manager import GCManager
+from present import Presenter
+from ui import draw_hud, get_font
 from pygame.locals import *
 import os
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print time from process launch to the first interactive frames")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="record combat and progress events to a telemetry file")
+    parser.add_argument("--early-input", action="store_true",
+                        help="sample input before the frame wait instead of right before the simulation step")
+    parser.add_argument("--latency-report", action="store_true",
+                        help="measure key press to frame present latency and print it on exit")
+    parser.add_argument("--pacing", choices=PACING_MODES, default="sleep",
+                        help="frame pacing: sleep, sleep then busy-wait (hybrid), or display vsync")
+    parser.add_argument("--frame-report", action="store_true",
+                        help="print a frame-time histogram and stutter count on exit")
+    parser.add_argument("--quality", choices=["auto"] + [str(i) for i in range(quality.MAX_LEVEL + 1)],
+                        default="auto", help="effect quality level, or auto to follow the frame budget")
+    parser.add_argument("--alloc-report", action="store_true",
+                        help="trace allocations and print per-frame figures by call site on exit")
+    parser.add_argument("--gc", choices=["frame", "auto"], default="frame",
+                        help="collect garbage in frame slack time (frame) or leave it to Python (auto)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="scale and flip each frame on a worker thread while the next one is simulated")
+    parser.add_argument("--gc-report", action="store_true",
+                        help="print garbage collection counts and pause times on exit")
+    return parser.parse_args(argv)
+
+# Keys reported by --latency-report
+ACTION_KEYS = {K_LEFT: "left", K_a: "left", K_RIGHT: "right", K_d: "right",
+               K_UP: "jump", K_w: "jump", K_SPACE: "jump", K_k: "dash", K_j: "attack"}
+
+def read_inputs(events):
+    """Held keys plus any press seen this frame, so taps shorter than a frame count."""
+    keys = pygame.key.get_pressed()
+    pressed = {ACTION_KEYS[e.key] for e, _ in events if e.type == KEYDOWN and e.key in ACTION_KEYS}
+    return {
+        "left": keys[K_LEFT] or keys[K_a] or "left" in pressed,
+        "right": keys[K_RIGHT] or keys[K_d] or "right" in pressed,
+        "jump": (keys[K_UP] or keys[K_w] or keys[K_SPACE]) or "jump" in pressed,
+        "dash": keys[K_k] or "dash" in pressed,
+        "attack": keys[K_j] or "attack" in pressed
+    }
+
+def open_display(pacing):
+    """Create the window and return (screen, pacing mode actually in use).
+    vsync needs a renderer-backed (SCALED) display; without it, fall back to sleep."""
+    if pacing == "vsync":
+        try:
+            return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1), pacing
+        except pygame.error as exc:
+            print(f"vsync unavailable ({exc}); using sleep pacing", file=sys.stderr)
+            pacing = "sleep"
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT)), pacing
+
+def main(argv=None):
+    args = parse_args(argv)
+    TIMER.mark("main entered")
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    TIMER.mark("pygame.init")
+    # build fonts, sprites and levels in the background while the menu is up
+    start_warm_up(PLAYER_CLASSES)
+    screen, pacing = open_display(args.pacing)
     pygame.display.set_caption(TITLE)
-    clock = pygame.time.Clock()
+    TIMER.mark("display ready")
 
     # create a low-resolution surface then scale up for pixel effect
     virtual = pygame.Surface((VIRTUAL_WIDTH, VIRTUAL_HEIGHT))
 
     gsm = GameStateManager(virtual)
+    gcm = None
+    if args.gc == "frame":
+        gcm = GCManager()
+        gsm.gc_manager = gcm
+    exporter = None
+    if args.telemetry:
+        exporter = TelemetryExporter(args.telemetry, time.time())
+        exporter.attach(gsm.events)
 
     # start menu: choose class
     char_class = class_select(screen, virtual)
+    TIMER.mark("class chosen")
+    if gcm:
+        gcm.start()
     gsm.start_new(char_class)
+    TIMER.mark("stage loaded")
+    first_frame = True
 
     running = True
     show_end = False
     guide_dialog_on = True
-    last_attack_pressed = False
+    probe = LatencyProbe() if args.latency_report else None
+    presenter = None
+    if args.pipeline:
+        presenter = Presenter(screen, (VIRTUAL_WIDTH, VIRTUAL_HEIGHT),
+                              probe.on_present if probe else None)
+    pacer = FramePacer(FPS, pacing)
+    sampler = InputSampler(pacer, early=args.early_input, stamp_events=probe is not None)
+    frames = render_blits = render_batches = 0
+    governor = None
+    if args.quality == "auto":
+        governor = quality.QualityGovernor(FPS)
+    else:
+        quality.set_level(int(args.quality))
+    profiler = None
+    if args.alloc_report:
+        profiler = AllocationProfiler()
+        profiler.start()
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        # input handling
-        keys = pygame.key.get_pressed()
-        inputs = {
-            "left": keys[K_LEFT] or keys[K_a],
-            "right": keys[K_RIGHT] or keys[K_d],
-            "jump": (keys[K_UP] or keys[K_w] or keys[K_SPACE]),
-            "dash": keys[K_k],
-            "attack": keys[K_j]
-        }
-        for e in pygame.event.get():
+        # frame wait and input sampling, late unless --early-input
+        dt, events, inputs = sampler.frame(read_inputs)
+        work_start = time.perf_counter()
+        if profiler:
+            profiler.begin_frame()
+        for e, t in events:
+            if probe and e.type == KEYDOWN and e.key in ACTION_KEYS:
+                probe.on_input(ACTION_KEYS[e.key], t)
             if e.type == QUIT:
                 running = False
             if e.type == KEYDOWN:
@@ -51,52 +144,78 @@ def main():
                         show_end = done
             # handle clicks etc if needed
 
-        # update game
-        gsm.update(dt, inputs)
-
-        # attacks
-        # handle attack press (only when pressed, not held)
-        if inputs["attack"] and not last_attack_pressed:
-            did = gsm.player_attack_check()
-            if did:
-                # if you attack the guide (we don't have direct guide sprite), but we can simulate:
-                # if there are few enemies and you still attack rapidly, reduce guide trust
-                if len(gsm.enemies) == 0:
-                    gsm.player.choice_points -= 1
-        last_attack_pressed = inputs["attack"]
-
-        # dash collisions
-        gsm.dash_collision_check()
-
-        # simple rule: if all enemies cleared in this stage, player can progress (via ENTER)
-        # win check for boss
-        if gsm.boss and gsm.boss.health <= 0:
-            # show guide betrayal: set guide text and allow Enter to finish
-            gsm.guide_text = "I guided you... but I needed 41 Water more than you."
-            # reveal ending when ENTER pressed handled above
-
-        # draw to virtual surface
-        gsm.draw(virtual)
-
-        # scale virtual to screen
-        scaled = pygame.transform.scale(virtual, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(scaled, (0,0))
-        pygame.display.flip()
+        # update game: simulation, attack press and dash contact
+        gsm.tick(dt, inputs)
+
+        # draw to virtual surface (with --pipeline, the free one of two buffers)
+        frame_surf = presenter.back() if presenter else virtual
+        gsm.draw(frame_surf)
+
+        if not presenter:
+            # scale virtual to screen
+            scaled = pygame.transform.scale(virtual, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            screen.blit(scaled, (0,0))
+        frames += 1
+        render_blits += gsm.render_queue.blits
+        render_batches += gsm.render_queue.batches
+        # work time stops before the flip, which blocks on the display with vsync
+        if profiler:
+            profiler.end_frame()
+        frame_ready = time.perf_counter()
+        if presenter:
+            # flips the previous frame, then scales this one on the present thread
+            # while the next frame runs
+            presenter.submit(probe.take_pending() if probe else None)
+        else:
+            pygame.display.flip()
+            if probe:
+                probe.on_present(time.perf_counter())
+        if governor:
+            governor.observe(frame_ready - work_start)
+        if gcm:
+            gcm.idle(pacer.remaining(), gsm.quiet_frame())
+
+        if first_frame:
+            first_frame = False
+            TIMER.mark("first game frame")
+            if args.startup_report:
+                print(TIMER.report())
 
         if gsm.ending:
             # show ending screen
+            if presenter:
+                presenter.finish()
             show_ending(screen, virtual, gsm.ending)
             running = False
 
+    if presenter:
+        presenter.close()
+    if exporter:
+        exporter.close()
+    if probe:
+        print(probe.report())
+    if args.frame_report:
+        print(pacer.stats.report())
+        if frames:
+            print(f"render queue: {render_blits / frames:.1f} blits in "
+                  f"{render_batches / frames:.1f} batches per frame")
+    if profiler:
+        print(profiler.report())
+        profiler.stop()
+    if gcm:
+        if args.gc_report:
+            print(gcm.report())
+        gcm.stop()
     pygame.quit()
     sys.exit()
 
 def class_select(screen, virtual):
     """Simple text-based class selection screen"""
-    font = pygame.font.SysFont("consolas", 20)
-    options = ["Wizard", "Worrier", "Warrior", "Ranger"]
+    font = get_font(20)
+    options = list(PLAYER_CLASSES)
     sel = 0
     clock = pygame.time.Clock()
+    first_frame = True
     while True:
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
@@ -130,10 +249,13 @@ def class_select(screen, virtual):
         scaled = pygame.transform.scale(virtual, (SCREEN_WIDTH, SCREEN_HEIGHT))
         screen.blit(scaled, (0,0))
         pygame.display.flip()
+        if first_frame:
+            first_frame = False
+            TIMER.mark("first interactive frame")
         clock.tick(15)
 
 def show_ending(screen, virtual, text):
-    font = pygame.font.SysFont("consolas", 28)
+    font = get_font(28)
     clock = pygame.time.Clock()
     t0 = time.time()
     while time.time() - t0 < 5:
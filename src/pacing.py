@@ -0,0 +1,121 @@
+# pacing.py
+# Frame pacing and frame-time statistics.
+#
+#   sleep  - sleep until the frame deadline (cheap, wakes up late by the OS
+#            timer slack)
+#   hybrid - sleep until SPIN_TAIL before the deadline, then busy-wait (more
+#            CPU, tighter frames)
+#   vsync  - do not wait at all; the display flip blocks on the refresh
+#
+# Deadlines advance by exactly one budget per frame, so a late frame is
+# followed by a shorter wait instead of drifting the whole schedule.
+import time
+from collections import deque
+from array import array
+
+PACING_MODES = ("sleep", "hybrid", "vsync")
+SPIN_TAIL = 0.002      # seconds busy-waited at the end of a hybrid wait
+POLL_INTERVAL = 0.001  # sleep slice while a poll callback is active
+HISTOGRAM_MS = 50      # 1 ms bins up to this, then one overflow bin
+STUTTER_FACTOR = 1.5   # frames longer than this many budgets count as stutter
+STUTTER_LOG = 256      # most recent stutters kept for the report
+
+
+class FrameStats:
+    """Fixed-bin frame-time histogram plus a short log of stutters."""
+    def __init__(self, budget):
+        self.budget = budget
+        self.bins = array('L', [0] * (HISTOGRAM_MS + 1))
+        self.frames = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.stutters = 0
+        self.stutter_log = deque(maxlen=STUTTER_LOG)  # (frame index, ms)
+
+    def record(self, frame_time):
+        ms = frame_time * 1000.0
+        self.bins[min(int(ms), HISTOGRAM_MS)] += 1
+        self.frames += 1
+        self.total += frame_time
+        self.worst = max(self.worst, ms)
+        if frame_time > self.budget * STUTTER_FACTOR:
+            self.stutters += 1
+            self.stutter_log.append((self.frames, ms))
+
+    def percentile(self, p):
+        """Upper edge (ms) of the bin holding the p-th percentile frame."""
+        if not self.frames:
+            return 0.0
+        rank = p / 100.0 * self.frames
+        seen = 0
+        for i, count in enumerate(self.bins):
+            seen += count
+            if seen >= rank:
+                return float(i + 1) if i < HISTOGRAM_MS else self.worst
+        return self.worst
+
+    def report(self, width=40):
+        if not self.frames:
+            return "frame times: no frames recorded"
+        budget_ms = self.budget * 1000.0
+        lines = [f"frame times over {self.frames} frames (budget {budget_ms:.1f} ms)",
+                 f"mean {self.total / self.frames * 1000.0:.2f} ms  p50 <{self.percentile(50):.0f}"
+                 f"  p95 <{self.percentile(95):.0f}  p99 <{self.percentile(99):.0f}  worst {self.worst:.1f} ms",
+                 f"stutters (> {STUTTER_FACTOR}x budget): {self.stutters}"
+                 f" ({100.0 * self.stutters / self.frames:.2f}%)"]
+        peak = max(self.bins)
+        first = next(i for i, c in enumerate(self.bins) if c)
+        last = max(i for i, c in enumerate(self.bins) if c)
+        for i in range(first, last + 1):
+            label = f"{i:>3}-{i + 1:<3}" if i < HISTOGRAM_MS else f"{HISTOGRAM_MS:>3}+   "
+            bar = "#" * int(round(width * self.bins[i] / peak))
+            lines.append(f"{label} ms {self.bins[i]:>7} {bar}")
+        if self.stutter_log:
+            recent = ", ".join(f"#{n}:{ms:.0f}" for n, ms in list(self.stutter_log)[-8:])
+            lines.append(f"latest stutters (frame:ms): {recent}")
+        return "\n".join(lines)
+
+
+class FramePacer:
+    def __init__(self, fps, mode="sleep"):
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}")
+        self.mode = mode
+        self.budget = 1.0 / fps
+        self.stats = FrameStats(self.budget)
+        self._last = time.perf_counter()
+        self._deadline = self._last + self.budget
+
+    def remaining(self):
+        """Seconds left until the next frame is due."""
+        return self._deadline - time.perf_counter()
+
+    def wait(self, poll=None):
+        """Block until the next frame is due, calling poll() every POLL_INTERVAL
+        while waiting if given. Returns dt since the previous frame in seconds."""
+        if self.mode != "vsync":
+            deadline = self._deadline
+            spin_from = deadline - SPIN_TAIL if self.mode == "hybrid" else deadline
+            while True:
+                if poll:
+                    poll()
+                now = time.perf_counter()
+                if now >= spin_from:
+                    break
+                time.sleep(min(POLL_INTERVAL, spin_from - now) if poll else spin_from - now)
+            while now < deadline:
+                if poll:
+                    poll()
+                now = time.perf_counter()
+        else:
+            if poll:
+                poll()
+            now = time.perf_counter()
+        dt = now - self._last
+        self._last = now
+        self.stats.record(dt)
+        self._deadline += self.budget
+        if self._deadline < now:
+            # fell more than a frame behind: restart the schedule from now
+            self._deadline = now + self.budget
+        return dt
@@ -0,0 +1,114 @@
+# physics.py
+# Swept tile collision shared by the player, enemies and the boss. Bodies
+# keep a sub-pixel remainder next to their integer rect, and each axis is
+# swept to the first tile in its path instead of being moved and pushed out,
+# so nothing tunnels through thin geometry however far it moves in a step.
+import math
+import pygame
+
+# Longest move per sub-step; long diagonal moves are split so the
+# x-then-y sweep stays close to the straight path
+MAX_STEP = 16
+
+
+def sweep_x(rect, d, tiles):
+    """Furthest left edge rect can reach moving d pixels along x, or None if
+    no tile is in the way. Tiles already overlapping rect count as blocking
+    in the direction of travel, which pushes rect out of them."""
+    if d > 0:
+        area = pygame.Rect(rect.left, rect.top, rect.width + math.ceil(d), rect.height)
+    elif d < 0:
+        reach = math.ceil(-d)
+        area = pygame.Rect(rect.left - reach, rect.top, rect.width + reach, rect.height)
+    else:
+        return None
+    limit = None
+    for i in area.collidelistall(tiles):
+        t = tiles[i]
+        if d > 0:
+            c = t.left - rect.width
+            if limit is None or c < limit:
+                limit = c
+        else:
+            c = t.right
+            if limit is None or c > limit:
+                limit = c
+    return limit
+
+
+def sweep_y(rect, d, tiles):
+    """Furthest top edge rect can reach moving d pixels along y, or None."""
+    if d > 0:
+        area = pygame.Rect(rect.left, rect.top, rect.width, rect.height + math.ceil(d))
+    elif d < 0:
+        reach = math.ceil(-d)
+        area = pygame.Rect(rect.left, rect.top - reach, rect.width, rect.height + reach)
+    else:
+        return None
+    limit = None
+    for i in area.collidelistall(tiles):
+        t = tiles[i]
+        if d > 0:
+            c = t.top - rect.height
+            if limit is None or c < limit:
+                limit = c
+        else:
+            c = t.bottom
+            if limit is None or c > limit:
+                limit = c
+    return limit
+
+
+class Body:
+    """Sub-pixel position remainder for an entity's rect. The rect holds the
+    integer part; code that sets the rect directly (respawns, knockback) just
+    keeps the current remainder."""
+    __slots__ = ("sub_x", "sub_y")
+
+    def __init__(self):
+        self.sub_x = 0.0
+        self.sub_y = 0.0
+
+    def move(self, rect, dx, dy, tiles, max_step=MAX_STEP):
+        """Move rect by (dx, dy) pixels, stopping at the first tile on each axis.
+        Returns (hit_x, hit_y): the sign of the blocked direction per axis, 0 if
+        that axis moved freely."""
+        if -max_step <= dx <= max_step and -max_step <= dy <= max_step:
+            # the usual per-frame move: one step, skip the sub-step bookkeeping
+            return (self._step_x(rect, dx, tiles) if dx else 0,
+                    self._step_y(rect, dy, tiles) if dy else 0)
+        steps = max(1, math.ceil(max(abs(dx), abs(dy)) / max_step))
+        sx = dx / steps
+        sy = dy / steps
+        hit_x = hit_y = 0
+        for _ in range(steps):
+            if not hit_x and sx:
+                hit_x = self._step_x(rect, sx, tiles)
+            if not hit_y and sy:
+                hit_y = self._step_y(rect, sy, tiles)
+            if hit_x and hit_y:
+                break
+        return hit_x, hit_y
+
+    def _step_x(self, rect, d, tiles):
+        pos = rect.x + self.sub_x + d
+        # sweep the distance from the rect's integer edge, not just d
+        limit = sweep_x(rect, pos - rect.x, tiles) if d > 0 or pos < rect.x else None
+        if limit is not None and (pos > limit if d > 0 else pos < limit):
+            rect.x = limit
+            self.sub_x = 0.0
+            return 1 if d > 0 else -1
+        rect.x = math.floor(pos)
+        self.sub_x = pos - rect.x
+        return 0
+
+    def _step_y(self, rect, d, tiles):
+        pos = rect.y + self.sub_y + d
+        limit = sweep_y(rect, pos - rect.y, tiles) if d > 0 or pos < rect.y else None
+        if limit is not None and (pos > limit if d > 0 else pos < limit):
+            rect.y = limit
+            self.sub_y = 0.0
+            return 1 if d > 0 else -1
+        rect.y = math.floor(pos)
+        self.sub_y = pos - rect.y
+        return 0
@@ -5,7 +5,14 @@ import math
 from settings import (PLAYER_SPEED, PLAYER_JUMP_SPEED, GRAVITY, TERMINAL_VEL, 
                      PLAYER_WIDTH, PLAYER_HEIGHT, VIRTUAL_WIDTH)
 from assets import generate_player_sprite
-import time
+from aoe_fx import tier_rings, ring_phase
+import quality
+from render_queue import target, LAYER_PLAYER
+from physics import Body
+import game_clock
+
+# sparkles and attack sparks drawn per quality tier, kept off the gameplay RNG
+_draw_rng = random.Random()
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y, char_class="Wizard"):
@@ -15,6 +22,7 @@ class Player(pygame.sprite.Sprite):
         self.image = self.idle_surf
         self.current_sprite = self.idle_surf  # For animation handling
         self.rect = self.image.get_rect(topleft=(x,y))
+        self.body = Body()
         # physics
         self.vx = 0
         self.vy = 0
@@ -26,7 +34,7 @@ class Player(pygame.sprite.Sprite):
         self.attacking = False
         self.attack_frame = 0
         self.spawn_protection = 2.0  # 2 seconds of spawn protection
-        self.spawn_time = time.time()
+        self.spawn_time = game_clock.now()
         # particles
         self.particles = []
         self.dash_particles = []
@@ -63,6 +71,14 @@ class Player(pygame.sprite.Sprite):
             self.defense = 40
             self.speed = 1.8
             self.special_ability = "Worry Sphere"
+        elif char_class == "Ranger":
+            self.max_health = 90
+            self.health = 90
+            self.attack_cooldown = 0.3
+            self.magic_power = 20
+            self.defense = 20
+            self.speed = 2.4
+            self.special_ability = "Quick Shot"
         
         # choices (for endings)
         self.choice_points = 0
@@ -82,14 +98,14 @@ class Player(pygame.sprite.Sprite):
             self.facing = 1 if dx > 0 else -1
 
     def jump(self):
-        now = time.time()
+        now = game_clock.now()
         # Allow jump from ground or within coyote time window after leaving ground
         if self.on_ground or (now - getattr(self, 'last_ground_time', 0) <= getattr(self, 'coyote_time', 0)):
             self.vy = PLAYER_JUMP_SPEED
             self.on_ground = False
 
     def start_dash(self):
-        now = time.time()
+        now = game_clock.now()
         # Calculate cooldown progress (0 to 1)
         cooldown_progress = min(1.0, (now - getattr(self, 'last_dash_time', 0)) / 1.0)
         
@@ -112,7 +128,7 @@ class Player(pygame.sprite.Sprite):
                 self.dash_speed = 9
 
     def attack(self):
-        now = time.time()
+        now = game_clock.now()
         if now - self.last_attack >= self.attack_cooldown:
             self.last_attack = now
             self.attacking = True
@@ -129,6 +145,9 @@ class Player(pygame.sprite.Sprite):
                 self.attack_range = 40
                 self.attack_height = 80
                 self.attack_frame = 12
+            elif self.char_class == "Ranger":
+                # Bow shot - the arrow is a projectile, only the draw pose is timed here
+                self.attack_frame = 8
             return True
         return False
         
@@ -139,6 +158,10 @@ class Player(pygame.sprite.Sprite):
             
         progress = self.attack_frame / 12.0
         
+        if self.char_class == "Ranger":
+            # Arrows hit through the projectile system, not a melee box
+            return None
+
         if self.char_class == "Worrier":
             # Worry Sphere - circular AOE expanding from center
             sphere_radius = int(self.attack_range * progress)
@@ -164,7 +187,7 @@ class Player(pygame.sprite.Sprite):
             return pygame.Rect(x, y, max(1, width), height)
 
     def update(self, dt, tiles):
-        now = time.time()
+        now = game_clock.now()
         self.was_on_ground = self.on_ground
         self.on_ground = False  # Will be set true in collision check if needed
 
@@ -209,11 +232,8 @@ class Player(pygame.sprite.Sprite):
         # Update particles
         self.dash_particles = [p for p in self.dash_particles if now - p['created'] < p['life']]
         
-        # Movement integration with subpixel precision
-        self.rect.x += int(self.vx)
-        self.resolve_collisions('x', tiles)
-        self.rect.y += int(self.vy)
-        self.resolve_collisions('y', tiles)
+        # Swept movement with subpixel precision
+        self.move_and_collide(self.vx, self.vy, tiles)
         
         # Update coyote time after collisions so we detect leaving ground correctly
         if self.was_on_ground and not self.on_ground:
@@ -234,59 +254,51 @@ class Player(pygame.sprite.Sprite):
         if not self.dashing:
             self.vx = 0
 
-    def resolve_collisions(self, axis, tiles):
-        # tiles: list of rects
-        for t in tiles:
-            if self.rect.colliderect(t):
-                if axis == 'x':
-                    if self.vx > 0:
-                        self.rect.right = t.left
-                    elif self.vx < 0:
-                        self.rect.left = t.right
-                elif axis == 'y':
-                    if self.vy > 0:
-                        self.rect.bottom = t.top
-                        self.on_ground = True
-                        self.vy = 0
-                    elif self.vy < 0:
-                        self.rect.top = t.bottom
-                        self.vy = 0
+    def move_and_collide(self, dx, dy, tiles):
+        _, hit_y = self.body.move(self.rect, dx, dy, tiles)
+        if hit_y > 0:
+            self.on_ground = True
+            self.vy = 0
+        elif hit_y < 0:
+            self.vy = 0
 
-    def draw(self, surface, camera_x=0, shake_y=0):
-        now = time.time()
+    def draw(self, surface, camera_x=0, shake_y=0, queue=None):
+        now = game_clock.now()
+        out = target(surface, queue, LAYER_PLAYER)
+        fx = quality.tier()
         
         # Draw dash particles with trails
-        for particle in self.dash_particles:
+        for particle in self.dash_particles[::fx.dash_particle_stride]:
             particle_x = particle['x'] - camera_x
             if -particle['size'] <= particle_x <= VIRTUAL_WIDTH:
                 life_progress = (now - particle['created']) / particle['life']
                 # Fade out
                 alpha = int(255 * (1 - life_progress))
                 # Trail effect - draw multiple fading copies
-                for i in range(3):
+                for i in range(fx.dash_trail):
                     trail_x = particle_x - (i * 2 * self.facing)
                     trail_alpha = alpha // (i + 1)
                     trail_surf = pygame.Surface((particle['size'], particle['size']))
                     trail_surf.fill(particle['color'])
                     trail_surf.set_alpha(trail_alpha)
-                    surface.blit(trail_surf, (trail_x, particle['y'] + shake_y))
+                    out.blit(trail_surf, (trail_x, particle['y'] + shake_y))
         
         # Draw the player with special effects
         draw_pos = (self.rect.x - camera_x, self.rect.y + shake_y)
         base_image = self.image.copy()
         
         # Add class-specific idle effects
-        if not self.attacking and not self.dashing:
+        if not self.attacking and not self.dashing and fx.idle_effects:
             if self.char_class == "Wizard":
                 # Magical sparkle effect
-                if random.random() < 0.1:
-                    sparkle_x = draw_pos[0] + random.randint(-5, self.rect.width + 5)
-                    sparkle_y = draw_pos[1] + random.randint(-5, self.rect.height + 5)
-                    sparkle_size = random.randint(1, 3)
+                if _draw_rng.random() < 0.1:
+                    sparkle_x = draw_pos[0] + _draw_rng.randint(-5, self.rect.width + 5)
+                    sparkle_y = draw_pos[1] + _draw_rng.randint(-5, self.rect.height + 5)
+                    sparkle_size = _draw_rng.randint(1, 3)
                     sparkle_surf = pygame.Surface((sparkle_size, sparkle_size))
                     sparkle_surf.fill((200, 200, 255))
-                    sparkle_surf.set_alpha(random.randint(100, 200))
-                    surface.blit(sparkle_surf, (sparkle_x, sparkle_y))
+                    sparkle_surf.set_alpha(_draw_rng.randint(100, 200))
+                    out.blit(sparkle_surf, (sparkle_x, sparkle_y))
             elif self.char_class == "Worrier":
                 # Battle aura when health is low
                 if self.health < self.max_health * 0.3:
@@ -294,71 +306,30 @@ class Player(pygame.sprite.Sprite):
                     aura_surf = base_image.copy()
                     aura_surf.fill((200, 0, 0), special_flags=pygame.BLEND_RGB_ADD)
                     aura_surf.set_alpha(int(100 * aura_pulse))
-                    surface.blit(aura_surf, draw_pos)
+                    out.blit(aura_surf, draw_pos)
             elif self.char_class == "Ranger":
                 # Speed trail when moving
                 if abs(self.vx) > 0:
                     trail_surf = base_image.copy()
                     trail_surf.set_alpha(80)
                     trail_x = draw_pos[0] - (self.facing * 4)
-                    surface.blit(trail_surf, (trail_x, draw_pos[1]))
+                    out.blit(trail_surf, (trail_x, draw_pos[1]))
         
         # Draw the base player sprite
-        surface.blit(base_image, draw_pos)
+        out.blit(base_image, draw_pos)
         
         # Enhanced attack effect
         if self.attacking and self.attack_frame > 0:
             progress = self.attack_frame / 12.0
             
             if self.char_class == "Worrier":
-                # Draw worry sphere - ONLY (no arrow)
-                sphere_radius = int(self.attack_range * progress)
+                # Draw worry sphere rings - ONLY (no arrow), from pre-rendered frames
                 center_x = draw_pos[0] + self.rect.width//2
                 center_y = self.rect.centery
+                rings = tier_rings(self.attack_range, fx)
+                rings.blit(out, center_x, center_y, self.attack_frame, ring_phase(now))
                 
-                # Draw multiple expanding rings
-                for i in range(3):
-                    ring_progress = progress * (1 - i * 0.2)
-                    if ring_progress <= 0: continue
-                    
-                    ring_radius = int(sphere_radius * (1 - i * 0.2))
-                    ring_alpha = int(200 * ring_progress)
-                    
-                    # Create surface for the ring
-                    ring_size = ring_radius * 2 + 4
-                    ring_surf = pygame.Surface((ring_size, ring_size), pygame.SRCALPHA)
-                    
-                    # Draw expanding ring
-                    pygame.draw.circle(ring_surf, (255, 180, 180, ring_alpha), 
-                                    (ring_radius + 2, ring_radius + 2), ring_radius, 3)
-                    
-                    # Add energy particles
-                    for _ in range(5):
-                        particle_angle = random.uniform(0, math.pi * 2)
-                        particle_dist = random.uniform(0.5, 0.9) * ring_radius
-                        particle_x = ring_radius + 2 + math.cos(particle_angle) * particle_dist
-                        particle_y = ring_radius + 2 + math.sin(particle_angle) * particle_dist
-                        particle_size = random.randint(2, 4)
-                        pygame.draw.circle(ring_surf, (255, 80, 80, ring_alpha),
-                                        (int(particle_x), int(particle_y)), particle_size)
-                    
-                    # Draw aura waves
-                    wave_points = []
-                    num_points = 20
-                    for j in range(num_points):
-                        angle = j * (2 * math.pi / num_points)
-                        wave = math.sin(angle * 4 + now * 10) * 5
-                        x = ring_radius + 2 + math.cos(angle) * (ring_radius + wave)
-                        y = ring_radius + 2 + math.sin(angle) * (ring_radius + wave)
-                        wave_points.append((x, y))
-                    
-                    if len(wave_points) > 2:
-                        pygame.draw.lines(ring_surf, (255, 120, 120, ring_alpha), True, wave_points, 2)
-                    
-                    # Blit the ring
-                    surface.blit(ring_surf, (center_x - ring_radius - 2, center_y - ring_radius - 2))
-                
-            else:  # Wizard
+            elif self.char_class != "Ranger":  # Wizard (Ranger fires arrows instead)
                 # Main attack swish
                 attack_width = int(self.attack_range * progress)
                 attack_height = 20 + int(10 * (1 - progress))  # Varies height for more dynamic feel
@@ -369,7 +340,7 @@ class Player(pygame.sprite.Sprite):
                     attack_x = (self.rect.left - attack_width - camera_x)
                 
                 # Draw standard magic attack
-                for i in range(3):
+                for i in range(fx.wizard_layers):
                     layer_progress = progress * (1 - i * 0.2)
                     if layer_progress <= 0: continue
                     
@@ -384,18 +355,18 @@ class Player(pygame.sprite.Sprite):
                     alpha_surf = pygame.Surface((attack_rect.width, attack_rect.height))
                     alpha_surf.fill((100, 100, 255))
                     alpha_surf.set_alpha(alpha)
-                    surface.blit(alpha_surf, attack_rect)
+                    out.blit(alpha_surf, attack_rect)
                 
                 # Add particles at the attack point
                 if progress > 0.2:
-                    for _ in range(3):
-                        particle_x = attack_x + (attack_width * 0.7 * random.random())
-                        particle_y = self.rect.centery + random.randint(-15, 15)
-                        size = random.randint(2, 4)
+                    for _ in range(fx.wizard_particles):
+                        particle_x = attack_x + (attack_width * 0.7 * _draw_rng.random())
+                        particle_y = self.rect.centery + _draw_rng.randint(-15, 15)
+                        size = _draw_rng.randint(2, 4)
                         p_surf = pygame.Surface((size, size))
                         p_surf.fill((100, 100, 255))  # Blue magic
                         p_surf.set_alpha(int(200 * progress))
-                        surface.blit(p_surf, (particle_x, particle_y))
+                        out.blit(p_surf, (particle_x, particle_y))
                     
         # Draw dash cooldown indicator
         cooldown_progress = min(1.0, (now - getattr(self, 'last_dash_time', 0)) / 1.0)
@@ -406,13 +377,13 @@ class Player(pygame.sprite.Sprite):
             center_y = draw_pos[1] - indicator_radius - 5
             
             # Background circle
-            pygame.draw.circle(surface, (50, 50, 50, 128), (center_x, center_y), indicator_radius)
+            out.draw(pygame.draw.circle, (50, 50, 50, 128), (center_x, center_y), indicator_radius)
             
             # Progress arc (from full to empty)
             start_angle = -90  # Start from top
             end_angle = start_angle + (360 * (1 - cooldown_progress))
             if end_angle != start_angle:  # Only draw if there's a visible arc
-                pygame.draw.arc(surface, (200, 200, 255), 
+                out.draw(pygame.draw.arc, (200, 200, 255), 
                               (center_x - indicator_radius, center_y - indicator_radius,
                                indicator_radius * 2, indicator_radius * 2),
                               math.radians(start_angle), math.radians(end_angle), 3)
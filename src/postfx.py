@@ -0,0 +1,96 @@
+# postfx.py
+# Screen-space effects composited over the finished frame. Every overlay
+# buffer is allocated once; per frame only alphas and offsets change.
+# Order: shake (offset picked before the world is drawn), then tint,
+# vignette, flash and fade on top of everything including the HUD.
+import random
+import pygame
+from settings import VIRTUAL_WIDTH, VIRTUAL_HEIGHT
+
+VIGNETTE_STEPS = 12
+VIGNETTE_MAX_ALPHA = 170
+
+
+class PostFX:
+    def __init__(self, size=(VIRTUAL_WIDTH, VIRTUAL_HEIGHT), seed=None):
+        self.size = size
+        # own RNG so drawing never disturbs the gameplay random stream
+        self.rng = random.Random(seed)
+        self._fade = pygame.Surface(size)
+        self._fade.fill((0, 0, 0))
+        self._flash = pygame.Surface(size)
+        self._flash_color = None
+        self._tint = pygame.Surface(size)
+        self._tint_color = None
+        self._vignette = None
+
+        self.shake_offset = (0, 0)
+        self.fade_alpha = 0
+        self.flash_start = 0.0
+        self.flash_duration = 0.0
+        self.flash_strength = 0
+        self.tint_alpha = 0
+        self.vignette_strength = 0.0
+
+    def begin_frame(self, shake):
+        """Pick this frame's shake offset; returns (dx, dy) for the world draw."""
+        s = int(shake)
+        if s > 0:
+            self.shake_offset = (self.rng.randint(-s, s), self.rng.randint(-s, s))
+        else:
+            self.shake_offset = (0, 0)
+        return self.shake_offset
+
+    def flash(self, color, now, duration=0.15, strength=140):
+        if color != self._flash_color:
+            self._flash.fill(color)
+            self._flash_color = color
+        self.flash_start = now
+        self.flash_duration = duration
+        self.flash_strength = strength
+
+    def set_tint(self, color, alpha):
+        """Tint the whole frame; alpha 0 turns it off."""
+        if color is not None and color != self._tint_color:
+            self._tint.fill(color)
+            self._tint_color = color
+        self.tint_alpha = alpha if color is not None else 0
+
+    def vignette(self):
+        if self._vignette is None:
+            self._vignette = build_vignette(self.size)
+        return self._vignette
+
+    def apply(self, surf, now):
+        if self.tint_alpha > 0:
+            self._tint.set_alpha(self.tint_alpha)
+            surf.blit(self._tint, (0, 0))
+        if self.vignette_strength > 0:
+            vignette = self.vignette()
+            vignette.set_alpha(int(255 * min(1.0, self.vignette_strength)))
+            surf.blit(vignette, (0, 0))
+        if self.flash_duration > 0:
+            t = (now - self.flash_start) / self.flash_duration
+            if t < 1.0:
+                self._flash.set_alpha(int(self.flash_strength * (1.0 - t)))
+                surf.blit(self._flash, (0, 0))
+            else:
+                self.flash_duration = 0.0
+        if self.fade_alpha > 0:
+            self._fade.set_alpha(self.fade_alpha)
+            surf.blit(self._fade, (0, 0))
+
+
+def build_vignette(size):
+    """Transparent center darkening towards the edges, as nested ellipses."""
+    w, h = size
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill((0, 0, 0, VIGNETTE_MAX_ALPHA))
+    for i in range(VIGNETTE_STEPS + 1):
+        f = i / VIGNETTE_STEPS
+        alpha = int(VIGNETTE_MAX_ALPHA * (1.0 - f) ** 2)
+        # ellipses shrink from slightly past the corners to 60% of the screen
+        scale = 1.4 - 0.8 * f
+        ew, eh = int(w * scale), int(h * scale)
+        pygame.draw.ellipse(surf, (0, 0, 0, alpha), ((w - ew) // 2, (h - eh) // 2, ew, eh))
+    return surf
@@ -0,0 +1,85 @@
+# present.py
+# Pipelined presentation. The game draws each frame into one of two
+# virtual-resolution buffers and hands it over; a worker thread scales the
+# finished buffer into the window surface while the main thread already
+# simulates and draws the next frame into the other buffer. Scaling releases
+# the GIL, so the two overlap on multi-core machines. The flip itself stays
+# on the main thread: window and GL contexts belong to the thread that made
+# them on most platforms.
+import threading
+import time
+import pygame
+
+
+class Presenter:
+    """Double-buffered scaling on a worker thread. At most one frame is in
+    flight, so the buffer returned by back() is never the one being scaled."""
+    def __init__(self, screen, virtual_size, on_present=None):
+        self.screen = screen
+        self.size = screen.get_size()
+        self.buffers = [pygame.Surface(virtual_size), pygame.Surface(virtual_size)]
+        self.index = 0
+        self.on_present = on_present  # on_present(flip end time, payload)
+        self.presented = 0
+        self.error = None             # exception raised on the worker, re-raised by finish()
+        self._job = None              # (buffer index, payload) being scaled
+        self._done = None             # (payload,) scaled and waiting for its flip
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="present", daemon=True)
+        self._thread.start()
+
+    def back(self):
+        """The buffer to draw the next frame into."""
+        return self.buffers[self.index]
+
+    def submit(self, payload=None):
+        """Flip the previous frame once it is scaled, then start scaling the one
+        just drawn into back() and switch buffers. payload is passed to
+        on_present when this frame is flipped."""
+        self.finish()
+        with self._cond:
+            self._job = (self.index, payload)
+            self._cond.notify_all()
+        self.index ^= 1
+
+    def finish(self):
+        """Wait for the frame in flight and flip it."""
+        with self._cond:
+            while self._job is not None:
+                self._cond.wait()
+            done, self._done = self._done, None
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+        if done is not None:
+            pygame.display.flip()
+            self.presented += 1
+            if self.on_present:
+                self.on_present(time.perf_counter(), done[0])
+
+    def close(self):
+        self.finish()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._job is None and not self._closing:
+                    self._cond.wait()
+                if self._job is None:
+                    return
+                index, payload = self._job
+            try:
+                pygame.transform.scale(self.buffers[index], self.size, self.screen)
+                done = (payload,)
+            except Exception as exc:
+                self.error = exc
+                done = None
+            with self._cond:
+                self._job = None
+                self._done = done
+                self._cond.notify_all()
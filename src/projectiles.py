@@ -0,0 +1,156 @@
+# projectiles.py
+# Pooled projectiles (Ranger arrows, spider webs, boss shots). All live
+# projectiles sit packed in parallel arrays; movement, tile collision and
+# hit tests are single passes over those arrays, so hundreds in flight cost
+# a few tight loops per frame and no per-shot objects.
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import pygame
+
+# Owners: who a projectile can hurt
+OWNER_PLAYER = 0   # hits enemies and the boss
+OWNER_ENEMY = 1    # hits the player
+
+# Projectile kinds
+ARROW = 0
+WEB = 1
+BOSS_SHOT = 2
+
+ProjectileKind = namedtuple("ProjectileKind", ["owner", "speed", "damage", "width", "height",
+                                               "gravity", "lifetime", "color"])
+
+# speeds and gravity in pixels per frame, lifetime in frames
+PROJECTILE_KINDS = {
+    ARROW: ProjectileKind(OWNER_PLAYER, 7.0, 18, 8, 2, 0.04, 90, (230, 210, 150)),
+    WEB: ProjectileKind(OWNER_ENEMY, 3.5, 6, 6, 6, 0.08, 120, (235, 235, 235)),
+    BOSS_SHOT: ProjectileKind(OWNER_ENEMY, 4.0, 12, 8, 8, 0.0, 180, (220, 60, 200)),
+}
+
+POOL_SIZE = 512
+
+_images = {}
+
+
+def projectile_image(kind):
+    image = _images.get(kind)
+    if image is None:
+        k = PROJECTILE_KINDS[kind]
+        image = _images[kind] = pygame.Surface((k.width, k.height))
+        image.fill(k.color)
+    return image
+
+
+class ProjectilePool:
+    """Fixed-capacity projectile storage; slots [0, count) are live.
+    Positions are top-left corners in world pixels."""
+    def __init__(self, capacity=POOL_SIZE):
+        self.capacity = capacity
+        self.count = 0
+        self.xs = array('d', bytes(8 * capacity))
+        self.ys = array('d', bytes(8 * capacity))
+        self.vxs = array('d', bytes(8 * capacity))
+        self.vys = array('d', bytes(8 * capacity))
+        self.ttls = array('i', bytes(4 * capacity))
+        self.kinds = bytearray(capacity)
+        self.dropped = 0  # spawns refused because the pool was full
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, kind, x, y, dir_x, dir_y=0.0):
+        """Fire a projectile centered at (x, y) along (dir_x, dir_y); returns its slot or -1."""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return -1
+        k = PROJECTILE_KINDS[kind]
+        length = (dir_x * dir_x + dir_y * dir_y) ** 0.5 or 1.0
+        i = self.count
+        self.xs[i] = x - k.width / 2
+        self.ys[i] = y - k.height / 2
+        self.vxs[i] = dir_x / length * k.speed
+        self.vys[i] = dir_y / length * k.speed
+        self.ttls[i] = k.lifetime
+        self.kinds[i] = kind
+        self.count += 1
+        return i
+
+    def remove(self, i):
+        last = self.count - 1
+        if i != last:
+            self.xs[i] = self.xs[last]
+            self.ys[i] = self.ys[last]
+            self.vxs[i] = self.vxs[last]
+            self.vys[i] = self.vys[last]
+            self.ttls[i] = self.ttls[last]
+            self.kinds[i] = self.kinds[last]
+        self.count = last
+
+    def clear(self):
+        self.count = 0
+
+    def rect(self, i):
+        k = PROJECTILE_KINDS[self.kinds[i]]
+        return pygame.Rect(int(self.xs[i]), int(self.ys[i]), k.width, k.height)
+
+    def update(self, grid=None, level_width=None, level_height=None):
+        """Advance every projectile one frame; drop those that hit a solid tile,
+        leave the level or run out of lifetime."""
+        xs, ys, vxs, vys, ttls, kinds = self.xs, self.ys, self.vxs, self.vys, self.ttls, self.kinds
+        i = 0
+        while i < self.count:
+            k = PROJECTILE_KINDS[kinds[i]]
+            vys[i] += k.gravity
+            x = xs[i] + vxs[i]
+            y = ys[i] + vys[i]
+            xs[i] = x
+            ys[i] = y
+            ttls[i] -= 1
+            cx = x + k.width / 2
+            cy = y + k.height / 2
+            if (ttls[i] <= 0
+                    or (grid is not None and grid.is_solid_at(cx, cy))
+                    or (level_width is not None and not 0 <= cx < level_width)
+                    or (level_height is not None and cy >= level_height)):
+                self.remove(i)
+                continue
+            i += 1
+
+    def hits(self, owner, targets):
+        """Projectiles of owner overlapping any target, as (slot, target) pairs; each
+        projectile hits at most one target. Targets need a .rect."""
+        if not self.count or not targets:
+            return []
+        rects = [t.rect for t in targets]
+        order = sorted(range(len(rects)), key=lambda j: rects[j].left)
+        lefts = [rects[j].left for j in order]
+        max_width = max(r.width for r in rects)
+        out = []
+        for i in range(self.count):
+            k = PROJECTILE_KINDS[self.kinds[i]]
+            if k.owner != owner:
+                continue
+            x = self.xs[i]
+            y = self.ys[i]
+            # only targets whose left edge is within reach of this projectile
+            lo = bisect_left(lefts, x - max_width)
+            hi = bisect_right(lefts, x + k.width)
+            for s in range(lo, hi):
+                r = rects[order[s]]
+                if x < r.right and r.left < x + k.width and y < r.bottom and r.top < y + k.height:
+                    out.append((i, targets[order[s]]))
+                    break
+        return out
+
+    def remove_many(self, slots):
+        # highest first so swap-remove never moves a slot still to be removed
+        for i in sorted(set(slots), reverse=True):
+            self.remove(i)
+
+    def draw(self, out, camera_x=0, shake_y=0, view_width=None):
+        """Queue every visible projectile on out (a render_queue layer or Immediate)."""
+        for i in range(self.count):
+            x = self.xs[i] - camera_x
+            if view_width is not None and not -16 <= x <= view_width:
+                continue
+            out.blit(projectile_image(self.kinds[i]), (x, self.ys[i] + shake_y))
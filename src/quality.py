@@ -0,0 +1,86 @@
+# quality.py
+# Effect quality tiers and the governor that picks one from frame timings.
+# Draw code reads quality.tier() and scales its particles, trails, rings and
+# glows; gameplay never depends on the tier.
+from array import array
+from collections import namedtuple
+
+Tier = namedtuple("Tier", [
+    "dash_particle_stride",  # draw every n-th dash particle
+    "dash_trail",            # fading copies drawn per dash particle
+    "wizard_layers",         # layers in the Wizard attack swish
+    "wizard_particles",      # sparks at the Wizard attack point
+    "worrier_rings",         # rings in the Worrier attack
+    "ring_particles",        # energy particles per Worrier ring
+    "ring_wave",             # aura wave around each Worrier ring
+    "hit_particles",         # enemy hit particles drawn
+    "checkpoint_glow",       # pulsing glow on activated checkpoints
+    "idle_effects",          # sparkles / low-health aura / speed trail
+])
+
+# Lowest to highest; the last tier is the full effect set
+QUALITY_TIERS = (
+    Tier(3, 1, 1, 0, 1, 0, False, 1, False, False),
+    Tier(2, 1, 2, 1, 2, 2, False, 2, False, True),
+    Tier(1, 2, 3, 2, 2, 3, True, 3, True, True),
+    Tier(1, 3, 3, 3, 3, 5, True, 5, True, True),
+)
+MAX_LEVEL = len(QUALITY_TIERS) - 1
+
+_level = MAX_LEVEL
+
+
+def level():
+    return _level
+
+
+def tier():
+    """Effect settings for the current quality level."""
+    return QUALITY_TIERS[_level]
+
+
+def set_level(n):
+    global _level
+    _level = max(0, min(MAX_LEVEL, int(n)))
+
+
+# Governor tuning, as fractions of the frame budget
+WINDOW = 60          # frames per evaluation
+DOWN_AT = 0.85       # p90 work time above this drops a level
+UP_AT = 0.55         # p90 work time below this, for UP_AFTER windows, raises a level
+UP_AFTER = 3
+
+
+class QualityGovernor:
+    """Watches per-frame work time (update + draw + present, excluding the pacing
+    wait) and moves the quality level to keep it inside the frame budget."""
+    def __init__(self, fps, window=WINDOW):
+        self.budget = 1.0 / fps
+        self.window = window
+        self.samples = array('d', [0.0] * window)
+        self.count = 0
+        self.calm_windows = 0
+        self.changes = 0
+
+    def observe(self, work_time):
+        self.samples[self.count] = work_time
+        self.count += 1
+        if self.count == self.window:
+            self.count = 0
+            self.evaluate()
+
+    def evaluate(self):
+        p90 = sorted(self.samples)[int(self.window * 0.9) - 1]
+        if p90 > self.budget * DOWN_AT:
+            self.calm_windows = 0
+            if level() > 0:
+                set_level(level() - 1)
+                self.changes += 1
+        elif p90 < self.budget * UP_AT:
+            self.calm_windows += 1
+            if self.calm_windows >= UP_AFTER and level() < MAX_LEVEL:
+                set_level(level() + 1)
+                self.changes += 1
+                self.calm_windows = 0
+        else:
+            self.calm_windows = 0
@@ -0,0 +1,95 @@
+# render_queue.py
+# Per-frame render queue. Draw code records blits (and the occasional
+# primitive or deferred draw call) into layers; flush() replays the layers in
+# order and submits each run of consecutive blits with one Surface.blits call,
+# so the per-blit loop runs in C instead of Python.
+
+# Layers, back to front
+LAYER_TILES = 0
+LAYER_WORLD = 1      # checkpoints, guide
+LAYER_ENEMIES = 2
+LAYER_EFFECTS = 3    # worry spheres
+LAYER_BOSS = 4
+LAYER_PLAYER = 5
+LAYER_OVERLAY = 6    # health bars, labels
+LAYER_TEXT = 7       # damage numbers
+LAYER_COUNT = 8
+
+
+class Layer:
+    """Ordered list of blits and deferred calls for one layer."""
+    __slots__ = ("items",)
+
+    def __init__(self):
+        self.items = []
+
+    def blit(self, source, dest, area=None, flags=0):
+        if area is None and not flags:
+            self.items.append((source, dest))
+        else:
+            self.items.append((source, dest, area, flags))
+
+    def draw(self, fn, *args):
+        """Run fn(target, *args) at this point of the layer when flushed, e.g.
+        pygame.draw.circle or a whole draw method that is not queue-aware."""
+        self.items.append((None, fn, args))
+
+
+class Immediate:
+    """Same interface as Layer, drawing straight to a surface (no queue)."""
+    __slots__ = ("surf",)
+
+    def __init__(self, surf):
+        self.surf = surf
+
+    def blit(self, source, dest, area=None, flags=0):
+        self.surf.blit(source, dest, area, flags)
+
+    def draw(self, fn, *args):
+        fn(self.surf, *args)
+
+
+def target(surf, queue, layer):
+    """Where a draw method should send its output: a queue layer, or surf directly."""
+    return queue.layer(layer) if queue is not None else Immediate(surf)
+
+
+class RenderQueue:
+    def __init__(self, layer_count=LAYER_COUNT):
+        self.layers = [Layer() for _ in range(layer_count)]
+        self._run = []
+        # counters for the last flush
+        self.blits = 0    # surfaces blitted
+        self.batches = 0  # Surface.blits calls
+        self.calls = 0    # deferred draw calls
+
+    def layer(self, index):
+        return self.layers[index]
+
+    def __len__(self):
+        return sum(len(l.items) for l in self.layers)
+
+    def flush(self, surf):
+        """Draw every queued layer onto surf, back to front, and empty the queue."""
+        blits = batches = calls = 0
+        run = self._run
+        for layer in self.layers:
+            for item in layer.items:
+                if item[0] is None:
+                    if run:
+                        surf.blits(run, False)
+                        blits += len(run)
+                        batches += 1
+                        run.clear()
+                    item[1](surf, *item[2])
+                    calls += 1
+                else:
+                    run.append(item)
+            layer.items.clear()
+        if run:
+            surf.blits(run, False)
+            blits += len(run)
+            batches += 1
+            run.clear()
+        self.blits, self.batches, self.calls = blits, batches, calls
+        return blits
@@ -1,4 +1,5 @@
 # settings.py
+import os
 import pygame
 
 TITLE = "41 Water"
@@ -14,6 +15,9 @@ VIRTUAL_HEIGHT = SCREEN_HEIGHT // PIXEL_SCALE
 GRAVITY = 0.6
 TERMINAL_VEL = 12
 
+# Selectable player classes, in menu order
+PLAYER_CLASSES = ("Wizard", "Worrier", "Warrior", "Ranger")
+
 # Player tunables
 PLAYER_SPEED = 2.2
 PLAYER_JUMP_SPEED = -9.0
@@ -23,6 +27,8 @@ PLAYER_HEIGHT = 18
 # Level settings
 LEVEL_WIDTH = VIRTUAL_WIDTH * 3  # Level is 3 screens wide
 LEVEL_HEIGHT = VIRTUAL_HEIGHT
+# Compiled level artifacts (see level_compiler.py)
+LEVEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".level_cache")
 
 # Colors (in 0-255 tuples)
 WHITE = (255,255,255)
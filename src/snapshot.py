@@ -0,0 +1,259 @@
+# snapshot.py
+# Compact binary snapshots of a running game (player, enemies, boss,
+# checkpoints, worry spheres, timers and RNG state). Everything is
+# struct-packed; absolute timestamps are stored relative to the moment of the
+# snapshot so a restore resumes with the same time remaining on every timer.
+import math
+import random
+import struct
+import game_clock
+import pygame
+from archetypes import ENEMY_KINDS
+from settings import PLAYER_CLASSES
+
+MAGIC = b"41WS"
+VERSION = 1
+NAN = float("nan")
+
+# magic, version, stage, class index, lives, enemy count, guide text length,
+# checkpoint count, sphere count, flags, fade state
+HEADER = struct.Struct("<4sHBBbHHBBBB")
+# camera x, spawn point, defeated, to defeat, max enemies, spawn cooldown,
+# min spawn distance, guide help, mercy, aggression, secrets, guide pos,
+# screen shake, last spawn, hitstop until, cutscene end, respawn time,
+# fade start, fade duration
+WORLD = struct.Struct("<diiHHHdHhhhhiiddddddd")
+# x, y, vx, vy, health, max health, facing, attack frame, choice points,
+# flags, dash time, dash speed, attack range, spawn time, last attack,
+# dash start, last dash, last ground
+PLAYER = struct.Struct("<iiddddbhhBdddddddd")
+# kind, x, y, vx, vy, health, max health, flags, attack frame, last attack,
+# last hurt, burrow time, decision timer, decision interval, aggression,
+# confidence, then the kind-specific ENEMY_EXTRA values
+ENEMY_EXTRA = ("burrow_cooldown", "jump_cooldown", "web_cooldown", "web_charges",
+               "jump_timer", "phase_timer", "energy")
+ENEMY = struct.Struct("<BiiddddBbddddddd%dd" % len(ENEMY_EXTRA))
+# x, y, vx, vy, health, dead, attack timer, color
+BOSS = struct.Struct("<iidddBdBBB")
+# x, y, w, h, activated, activation time
+CHECKPOINT = struct.Struct("<iiHHBd")
+# x, y, max radius, lifetime, damage, tick, created
+SPHERE = struct.Struct("<iiHdddd")
+# Mersenne Twister state: 625 words plus the cached gauss value
+RNG = struct.Struct("<I625IBd")
+
+FADE_CODES = {None: 0, 'out': 1, 'in': 2}
+FADE_STATES = {v: k for k, v in FADE_CODES.items()}
+
+PLAYER_FLAGS = ("on_ground", "was_on_ground", "dashing", "attacking", "dead",
+                "invulnerable", "can_dash")
+ENEMY_FLAGS = ("on_ground", "attacking", "burrowed", "visible", "dead")
+
+
+def _rel(t, now):
+    return NAN if t is None else t - now
+
+def _abs(rel, now):
+    return None if math.isnan(rel) else now + rel
+
+def _num(v):
+    # health and counters are ints in play; keep them ints after a round trip
+    return int(v) if float(v).is_integer() else v
+
+def _pack_flags(obj, names):
+    bits = 0
+    for i, name in enumerate(names):
+        if getattr(obj, name, False):
+            bits |= 1 << i
+    return bits
+
+def _unpack_flags(obj, names, bits):
+    for i, name in enumerate(names):
+        if not hasattr(obj, name):
+            continue
+        setattr(obj, name, bool(bits & (1 << i)))
+
+
+def pack_state(gsm, now=None, include_rng=True):
+    """Serialize a GameStateManager into bytes."""
+    if now is None:
+        now = game_clock.now()
+    p = gsm.player
+    text = (gsm.guide_text or "").encode("utf-8")[:0xFFFF]
+    spheres = list(gsm.aoe)
+    flags = ((gsm.boss is not None) | gsm.guide_present << 1 | gsm.guide_betrayed << 2 |
+             gsm.cutscene_active << 3 | gsm.guide_alive << 4 | include_rng << 5)
+    class_idx = PLAYER_CLASSES.index(p.char_class) if p.char_class in PLAYER_CLASSES else 255
+    parts = [
+        HEADER.pack(MAGIC, VERSION, gsm.stage_index, class_idx, gsm.lives, len(gsm.enemies),
+                    len(text), len(gsm.checkpoints), len(spheres), flags,
+                    FADE_CODES.get(gsm.fade_state, 0)),
+        WORLD.pack(gsm.camera_x, gsm.spawn_point[0], gsm.spawn_point[1],
+                   gsm.enemies_defeated, gsm.enemies_to_defeat, gsm.max_enemies,
+                   gsm.spawn_cooldown, gsm.min_spawn_distance, gsm.guide_help_count,
+                   gsm.mercy_count, gsm.aggression_count, gsm.exploration_secrets,
+                   int(gsm.guide_pos[0]), int(gsm.guide_pos[1]), gsm.screen_shake,
+                   _rel(gsm.last_spawn_time, now), _rel(gsm.hitstop_until, now),
+                   _rel(gsm.cutscene_end_time, now), _rel(gsm.respawn_time, now),
+                   _rel(gsm.fade_start, now), gsm.fade_duration),
+        text,
+        PLAYER.pack(p.rect.x, p.rect.y, p.vx, p.vy, p.health, p.max_health, p.facing,
+                    p.attack_frame, p.choice_points, _pack_flags(p, PLAYER_FLAGS),
+                    p.dash_time, p.dash_speed, p.attack_range,
+                    _rel(p.spawn_time, now), _rel(p.last_attack, now), _rel(p.dash_start, now),
+                    _rel(getattr(p, 'last_dash_time', 0), now), _rel(p.last_ground_time, now)),
+    ]
+    for e in gsm.enemies:
+        parts.append(ENEMY.pack(ENEMY_KINDS.index(e.kind), e.rect.x, e.rect.y, e.vx, e.vy,
+                                e.health, e.max_health, _pack_flags(e, ENEMY_FLAGS),
+                                e.attack_frame, _rel(e.last_attack, now), _rel(e.last_hurt, now),
+                                _rel(getattr(e, 'burrow_time', now), now), e.decision_timer,
+                                e.decision_interval, e.aggression, e.confidence,
+                                *[getattr(e, name, 0.0) for name in ENEMY_EXTRA]))
+    for cp in gsm.checkpoints:
+        r = cp['rect']
+        parts.append(CHECKPOINT.pack(r.x, r.y, r.width, r.height, cp['activated'],
+                                     _rel(cp.get('activation_time'), now)))
+    for ws in spheres:
+        parts.append(SPHERE.pack(int(ws.x), int(ws.y), ws.max_radius, ws.lifetime, ws.damage,
+                                 ws.tick, _rel(ws.created, now)))
+    b = gsm.boss
+    if b is not None:
+        parts.append(BOSS.pack(b.rect.x, b.rect.y, b.vx, b.vy, b.health, b.dead,
+                               b.attack_timer, *b.color))
+    if include_rng:
+        version, words, gauss = random.getstate()
+        parts.append(RNG.pack(version, *words, gauss is not None, gauss or 0.0))
+    return b"".join(parts)
+
+
+def unpack_state(gsm, blob, now=None, restore_rng=True):
+    """Restore a GameStateManager from bytes produced by pack_state."""
+    # imported here: game_states imports this module
+    from boss import Boss
+    from worry_sphere import WorrySphere
+    from level_compiler import load_level
+    from game_states import STAGE_ENEMY_TYPES
+
+    if now is None:
+        now = game_clock.now()
+    (magic, version, stage, class_idx, lives, n_enemies, text_len, n_checkpoints,
+     n_spheres, flags, fade) = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a game snapshot")
+    off = HEADER.size
+    w = WORLD.unpack_from(blob, off)
+    off += WORLD.size
+    gsm.guide_text = bytes(blob[off:off + text_len]).decode("utf-8")
+    off += text_len
+
+    # level geometry only changes when the snapshot is from another stage
+    if gsm.stage_index != stage or gsm.grid is None:
+        gsm.set_level(load_level(stage))
+    gsm.stage_index = stage
+    gsm.enemy_types = STAGE_ENEMY_TYPES
+    gsm.lives = lives
+    gsm.guide_present = bool(flags & 2)
+    gsm.guide_betrayed = bool(flags & 4)
+    gsm.cutscene_active = bool(flags & 8)
+    gsm.guide_alive = bool(flags & 16)
+    gsm.fade_state = FADE_STATES.get(fade)
+    (gsm.camera_x, sx, sy, gsm.enemies_defeated, gsm.enemies_to_defeat, gsm.max_enemies,
+     gsm.spawn_cooldown, gsm.min_spawn_distance, gsm.guide_help_count, gsm.mercy_count,
+     gsm.aggression_count, gsm.exploration_secrets, gx, gy, gsm.screen_shake,
+     last_spawn, hitstop, cutscene_end, respawn, fade_start, gsm.fade_duration) = w
+    gsm.spawn_point = (sx, sy)
+    gsm.guide_pos = (gx, gy)
+    gsm.last_spawn_time = _abs(last_spawn, now)
+    gsm.hitstop_until = _abs(hitstop, now)
+    gsm.cutscene_end_time = _abs(cutscene_end, now)
+    gsm.respawn_time = _abs(respawn, now)
+    gsm.fade_start = _abs(fade_start, now)
+
+    (px, py, vx, vy, health, max_health, facing, attack_frame, choice_points, pflags,
+     dash_time, dash_speed, attack_range, spawn_time, last_attack, dash_start, last_dash,
+     last_ground) = PLAYER.unpack_from(blob, off)
+    off += PLAYER.size
+    char_class = PLAYER_CLASSES[class_idx] if class_idx < len(PLAYER_CLASSES) else "Wizard"
+    p = gsm.player
+    if p is None or p.char_class != char_class:
+        p = gsm.player = gsm.make_player(char_class, px, py)
+    p.rect.topleft = (px, py)
+    p.vx, p.vy = vx, vy
+    p.health = _num(health)
+    p.max_health = _num(max_health)
+    p.facing = facing
+    p.attack_frame = attack_frame
+    p.choice_points = choice_points
+    _unpack_flags(p, PLAYER_FLAGS, pflags)
+    p.dash_time, p.dash_speed, p.attack_range = dash_time, dash_speed, _num(attack_range)
+    p.spawn_time = _abs(spawn_time, now)
+    p.last_attack = _abs(last_attack, now)
+    p.dash_start = _abs(dash_start, now)
+    p.last_dash_time = _abs(last_dash, now)
+    p.last_ground_time = _abs(last_ground, now)
+    p.lives = lives
+
+    enemies = []
+    for _ in range(n_enemies):
+        v = ENEMY.unpack_from(blob, off)
+        off += ENEMY.size
+        e = gsm.make_enemy(v[1], v[2], ENEMY_KINDS[v[0]])
+        e.vx, e.vy = v[3], v[4]
+        e.health = _num(v[5])
+        e.max_health = _num(v[6])
+        _unpack_flags(e, ENEMY_FLAGS, v[7])
+        e.attack_frame = v[8]
+        e.last_attack = _abs(v[9], now)
+        e.last_hurt = _abs(v[10], now)
+        if hasattr(e, 'burrow_time'):
+            e.burrow_time = _abs(v[11], now)
+        e.decision_timer, e.decision_interval, e.aggression, e.confidence = v[12:16]
+        for name, value in zip(ENEMY_EXTRA, v[16:]):
+            if hasattr(e, name):
+                setattr(e, name, _num(value) if name == "web_charges" else value)
+        e.last_ability_time = e.last_think = now
+        enemies.append(e)
+    gsm.enemies = enemies
+
+    gsm.checkpoints = []
+    for _ in range(n_checkpoints):
+        x, y, cw, ch, activated, act_time = CHECKPOINT.unpack_from(blob, off)
+        off += CHECKPOINT.size
+        cp = {'rect': pygame.Rect(x, y, cw, ch), 'activated': bool(activated)}
+        if not math.isnan(act_time):
+            cp['activation_time'] = now + act_time
+        gsm.checkpoints.append(cp)
+
+    gsm.aoe.clear()
+    for _ in range(n_spheres):
+        x, y, max_radius, lifetime, damage, tick, created = SPHERE.unpack_from(blob, off)
+        off += SPHERE.size
+        ws = WorrySphere(x, y, max_radius=max_radius, lifetime=lifetime,
+                         damage=_num(damage), tick=tick)
+        ws.created = now + created
+        gsm.aoe.add(ws)
+
+    gsm.boss = None
+    if flags & 1:
+        x, y, bvx, bvy, bhealth, dead, attack_timer, r, g, b = BOSS.unpack_from(blob, off)
+        off += BOSS.size
+        boss = Boss(x, y)
+        boss.vx, boss.vy = _num(bvx), bvy
+        boss.health = _num(bhealth)
+        boss.dead = bool(dead)
+        boss.attack_timer = attack_timer
+        boss.color = (r, g, b)
+        gsm.boss = boss
+
+    # effects that only exist on screen are not part of the snapshot
+    gsm.damage_numbers.clear()
+    gsm.projectiles.clear()
+
+    # last: rebuilding enemies above consumed random numbers
+    if flags & 32:
+        state = RNG.unpack_from(blob, off)
+        off += RNG.size
+        if restore_rng:
+            random.setstate((state[0], tuple(state[1:626]), state[627] if state[626] else None))
+    return gsm
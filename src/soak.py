@@ -0,0 +1,256 @@
+# soak.py
+# Allocation profiling and long-run leak detection. AllocationProfiler wraps
+# frames with tracemalloc; soak() plays the headless game for hours of
+# simulated time, restarting it after every ending like a kiosk would, and
+# samples live object counts and surface memory to flag steady growth.
+#
+#   python soak.py --hours 6 --sample 120
+#   python soak.py --hours 0.1 --alloc-report
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from array import array
+from collections import Counter
+
+import game_clock
+from settings import FPS, PLAYER_CLASSES, VIRTUAL_WIDTH, VIRTUAL_HEIGHT
+
+# tracemalloc bookkeeping that should not show up as game allocations
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>",
+                  "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+class AllocationProfiler:
+    """Per-frame allocation figures from tracemalloc. Each frame records its
+    peak (everything allocated and still alive at the worst point, temporaries
+    included) and what it left behind; every `window` frames the memory held
+    per call site is compared with the window start, giving bytes and blocks
+    retained per frame by source line."""
+    def __init__(self, window=300, top=10, depth=1):
+        self.window = window
+        self.top = top
+        self.depth = depth
+        self.peaks = array('q', [0] * window)
+        self.retained = array('q', [0] * window)
+        self.count = 0
+        self.frames = 0
+        self.sites = []   # [(site, bytes per frame, blocks per frame)] from the last window
+        self._frame_start = 0
+        self._snapshot = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+        self._snapshot = self._take()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def _take(self):
+        filters = [tracemalloc.Filter(False, f) for f in _IGNORED_FILES]
+        return tracemalloc.take_snapshot().filter_traces(filters)
+
+    def begin_frame(self):
+        tracemalloc.reset_peak()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.peaks[self.count] = peak - self._frame_start
+        self.retained[self.count] = current - self._frame_start
+        self.count += 1
+        self.frames += 1
+        if self.count == self.window:
+            self.count = 0
+            snapshot = self._take()
+            stats = snapshot.compare_to(self._snapshot, "lineno")
+            self._snapshot = snapshot
+            self.sites = [(str(s.traceback[0]), s.size_diff / self.window, s.count_diff / self.window)
+                          for s in stats[:self.top] if s.size_diff > 0]
+
+    def report(self):
+        n = self.window if self.frames >= self.window else self.count
+        if not n:
+            return "allocations: no frames recorded"
+        peaks = sorted(self.peaks[:n])
+        retained = sum(self.retained[:n]) / n
+        lines = [f"allocations over the last {n} frames: peak per frame "
+                 f"median {peaks[n // 2] / 1024:.1f} KiB, max {peaks[-1] / 1024:.1f} KiB; "
+                 f"retained {retained:+.0f} B/frame"]
+        if self.sites:
+            lines.append("retained per frame by call site:")
+            for site, size, blocks in self.sites:
+                lines.append(f"  {size:+9.1f} B {blocks:+7.2f} blocks  {site}")
+        return "\n".join(lines)
+
+
+def surface_memory():
+    """(count, bytes) of pixel memory owned by live pygame Surfaces. Surfaces are
+    not tracked by the GC themselves, so they are found through the objects that
+    hold them; subsurfaces share their parent's pixels and are skipped."""
+    import pygame
+    seen = {}
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if type(ref) is pygame.Surface and id(ref) not in seen:
+                seen[id(ref)] = ref
+    total = 0
+    for s in seen.values():
+        if s.get_parent() is None:
+            total += s.get_pitch() * s.get_height()
+    return len(seen), total
+
+
+def object_counts():
+    """Live GC-tracked objects per type name."""
+    return Counter(type(o).__name__ for o in gc.get_objects())
+
+
+class GrowthDetector:
+    """Flags series that keep growing: after `warmup` samples (caches filling
+    up), a key is flagged when it never decreased across the last `span`
+    samples and grew by at least `min_growth` over them."""
+    def __init__(self, span=6, warmup=2, min_growth=64):
+        self.span = span
+        self.warmup = warmup
+        self.min_growth = min_growth
+        self.samples = 0
+        self.series = {}
+
+    def add(self, values):
+        self.samples += 1
+        if self.samples <= self.warmup:
+            return
+        for key, series in self.series.items():
+            if key not in values:
+                series.append(0)
+        for key, value in values.items():
+            series = self.series.setdefault(key, [])
+            series.append(value)
+            if len(series) > self.span:
+                del series[0]
+
+    def growing(self):
+        """[(key, first, last)] for every steadily growing series."""
+        out = []
+        for key, series in self.series.items():
+            if len(series) < self.span:
+                continue
+            if (all(a <= b for a, b in zip(series, series[1:]))
+                    and series[-1] - series[0] >= self.min_growth):
+                out.append((key, series[0], series[-1]))
+        return sorted(out, key=lambda g: g[2] - g[1], reverse=True)
+
+
+def take_sample():
+    gc.collect()
+    values = dict(object_counts())
+    surfaces, surface_bytes = surface_memory()
+    values["pygame.Surface"] = surfaces
+    values["surface bytes"] = surface_bytes
+    return values
+
+
+def soak(seed=0, hours=1.0, sample_every=60.0, char_class="Wizard", draw=True,
+         detector=None, profiler=None, on_sample=None, params=None):
+    """Play headless games back to back for `hours` of simulated time. Every
+    `sample_every` simulated seconds the live objects are counted and fed to
+    the detector; on_sample(sim_time, games, values) is called with each sample.
+    params are sweep-style overrides ("gsm.lives", "enemy.grub.damage", ...)
+    applied to every game."""
+    import pygame
+    from game_states import GameStateManager
+    from sweep import Bot, apply_params
+
+    detector = detector or GrowthDetector()
+    clock = game_clock.SimClock()
+    game_clock.install(clock)
+    try:
+        random.seed(seed)
+        surf = pygame.Surface((VIRTUAL_WIDTH, VIRTUAL_HEIGHT))
+
+        def new_game():
+            # a fresh manager per game: start_new() only rewinds the stage, it
+            # leaves the ending, lives, player and morality counters in place
+            gsm = GameStateManager(surf)
+            gsm.thinker.budget_us = None
+            apply_params(gsm, params or {})
+            gsm.start_new(char_class)
+            return gsm
+
+        gsm = new_game()
+        bot = Bot(seed)
+        dt = 1.0 / FPS
+        frames_per_sample = max(1, int(sample_every * FPS))
+        total_frames = int(hours * 3600 * FPS)
+        games = 1
+        if profiler:
+            profiler.start()
+        for frame in range(1, total_frames + 1):
+            if profiler:
+                profiler.begin_frame()
+            clock.advance(dt)
+            gsm.tick(dt, bot.inputs(gsm))
+            if gsm.boss and gsm.boss.health <= 0:
+                gsm.advance_stage_or_end()
+            if draw:
+                gsm.draw(surf)
+            if gsm.ending:
+                gsm = new_game()
+                games += 1
+            if profiler:
+                profiler.end_frame()
+            if frame % frames_per_sample == 0:
+                values = take_sample()
+                detector.add(values)
+                if on_sample:
+                    on_sample(frame * dt, games, values)
+        return {"frames": total_frames, "games": games, "growing": detector.growing()}
+    finally:
+        if profiler:
+            profiler.stop()
+        game_clock.install(None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless soak test for 41 Water")
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated hours to play")
+    parser.add_argument("--sample", type=float, default=60.0,
+                        help="simulated seconds between object counts")
+    parser.add_argument("--span", type=int, default=6,
+                        help="consecutive growing samples before a type is flagged")
+    parser.add_argument("--class", dest="char_class", default="Wizard", choices=PLAYER_CLASSES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-draw", action="store_true", help="skip rendering (simulation only)")
+    parser.add_argument("--alloc-report", action="store_true",
+                        help="trace allocations and print per-frame figures by call site")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    profiler = AllocationProfiler() if args.alloc_report else None
+
+    def on_sample(t, games, values):
+        total = sum(v for k, v in values.items() if k not in ("pygame.Surface", "surface bytes"))
+        print(f"{t / 60:8.1f} min  games {games:4d}  objects {total:8d}  "
+              f"surfaces {values['pygame.Surface']:6d} ({values['surface bytes'] / 2**20:.1f} MiB)")
+        if profiler and profiler.frames >= profiler.window:
+            print(profiler.report())
+
+    result = soak(args.seed, args.hours, args.sample, args.char_class, not args.no_draw,
+                  GrowthDetector(span=args.span), profiler, on_sample)
+    print(f"{result['frames']} frames, {result['games']} games")
+    if not result["growing"]:
+        print("no steadily growing object counts")
+        return 0
+    print("steadily growing:")
+    for key, first, last in result["growing"]:
+        print(f"  {key}: {first} -> {last}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# stage_loader.py
+# Background preloading of the next stage, so a stage transition only swaps
+# in level data that is already built. Once startup warm-up has compiled every
+# level, load_level is a cache hit; the work left for the worker is the stage's
+# flow field, built toward the spawn point.
+import threading
+import pygame
+from level import LEVELS, TILE_SIZE
+from level_compiler import load_level
+from flow_field import FlowField
+
+# Start preloading once this many defeats remain before the stage is clear
+PRELOAD_MARGIN = 3
+
+
+class StagePreloader:
+    """Loads one stage's compiled level and flow field on a worker thread ahead
+    of time."""
+    def __init__(self):
+        self.idx = None
+        self.level = None
+        self.flow = None
+        self.error = None
+        self._thread = None
+        # guards idx/level/flow/error against a superseded worker finishing late
+        self._lock = threading.Lock()
+
+    def request(self, idx, size=(TILE_SIZE, TILE_SIZE)):
+        """Start preparing stage idx unless it is already prepared or in flight.
+        size is the player's rect size, used to aim the flow field at the spawn."""
+        if idx == self.idx or not 0 <= idx < len(LEVELS):
+            return
+        with self._lock:
+            self.idx = idx
+            self.level = None
+            self.flow = None
+            self.error = None
+        self._thread = threading.Thread(target=self._run, args=(idx, size),
+                                        name=f"stage-preload-{idx}", daemon=True)
+        self._thread.start()
+
+    def _run(self, idx, size):
+        level = flow = error = None
+        try:
+            level = load_level(idx)
+            flow = FlowField(level.grid)
+            # the player starts the stage at the spawn (same fallback as load_stage)
+            flow.update(pygame.Rect(level.spawn or (32, 32), size))
+        except Exception as exc:  # surfaced on take(), which retries synchronously
+            error = exc
+        with self._lock:
+            # a later request() moved on to another stage: drop this result
+            if self.idx == idx:
+                self.level = level
+                self.flow = flow
+                self.error = error
+
+    def ready(self, idx):
+        return self.idx == idx and self.level is not None
+
+    def take(self, idx):
+        """Return (level, flow) for idx, using the preload when there is one; flow
+        is None when the level had to be loaded here."""
+        if self.idx == idx and self._thread is not None:
+            # normally finished long ago; join covers a transition right after request()
+            self._thread.join()
+            level, flow = self.level, self.flow
+            self.idx = None
+            self.level = None
+            self.flow = None
+            self._thread = None
+            if level is not None:
+                return level, flow
+        return load_level(idx), None
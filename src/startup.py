@@ -0,0 +1,96 @@
+# startup.py
+# Cold-start helpers: a background warm-up that builds fonts, sprites, levels
+# and effect frames while the class selection screen is up, and a timing
+# report from process launch to the first interactive frame.
+import os
+import sys
+import threading
+import time
+
+
+def _process_start():
+    """perf_counter() value at process launch (Linux), else at first import."""
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as f:
+            # field 22 is the start time in clock ticks since boot; the command
+            # name (field 2) may contain spaces, so split after its ')'
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        elapsed = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+        if 0 <= elapsed < 60:
+            return now - elapsed
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return now
+
+
+class StartupTimer:
+    """Named timestamps measured from process launch."""
+    def __init__(self):
+        self.start = _process_start()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def elapsed(self, name):
+        for mark, t in self.marks:
+            if mark == name:
+                return t - self.start
+        return None
+
+    def report(self):
+        lines = ["Startup timing (ms since process launch):"]
+        prev = self.start
+        for name, t in sorted(self.marks, key=lambda m: m[1]):
+            lines.append(f"  {name:<24} {(t - self.start) * 1000:8.1f}  (+{(t - prev) * 1000:.1f})")
+            prev = t
+        return "\n".join(lines)
+
+
+TIMER = StartupTimer()
+TIMER.mark("startup module imported")
+
+
+def warm_up(char_classes, done=None):
+    """Build everything the first stage needs so start_new() only looks things up."""
+    from ui import get_font
+    from assets import generate_player_sprite, generate_enemy_sprite, ENEMY_KINDS
+    from level import LEVELS
+    from level_compiler import load_level
+    from aoe_fx import sphere_animation, tier_rings
+    from quality import QUALITY_TIERS
+
+    # system font scan first: the menu is waiting on it
+    for size, bold in ((20, False), (12, False), (14, True), (28, False)):
+        get_font(size, bold)
+    for char_class in char_classes:
+        generate_player_sprite(char_class)
+    for kind in ENEMY_KINDS:
+        generate_enemy_sprite(kind)
+    for idx in range(len(LEVELS)):
+        load_level(idx)
+    sphere_animation(80)
+    # every tier, so a quality drop mid-fight does not render a ring set
+    for fx in QUALITY_TIERS:
+        tier_rings(40, fx)
+    TIMER.mark("asset warm-up done")
+    if done is not None:
+        done.set()
+
+
+def start_warm_up(char_classes):
+    """Run warm_up() on a daemon thread; returns an Event set when it finishes."""
+    done = threading.Event()
+
+    def run():
+        try:
+            warm_up(char_classes, done)
+        except Exception as exc:  # warm-up is best effort, the game builds lazily anyway
+            print(f"asset warm-up failed: {exc}", file=sys.stderr)
+            done.set()
+
+    threading.Thread(target=run, name="asset-warmup", daemon=True).start()
+    return done
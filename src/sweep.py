@@ -0,0 +1,249 @@
+# sweep.py
+# Headless balance sweeps: runs many independent, seeded GameStateManager
+# simulations across all CPU cores and aggregates the outcomes per
+# parameter point.
+#
+#   python sweep.py --runs 500 --param stage.enemies_to_defeat=8,10,12 \
+#       --param enemy.grub.damage=8,12 --param gsm.good_ending_threshold=4,5
+#
+# Parameters are "gsm.<attr>" (set once at start), "stage.<attr>" (set after
+# every load_stage) or "enemy.<kind>.<attr>" (set on each spawned enemy of that
+# kind; use '*' for every kind).
+import argparse
+import csv
+import itertools
+import os
+import random
+import statistics
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import game_clock
+from settings import FPS, PLAYER_CLASSES
+
+ENDING_LABELS = ("Good", "Neutral", "Bad", "Game Over", "Timeout")
+
+
+class Bot:
+    """Scripted player: walks to the nearest threat, attacks and dashes in range,
+    and jumps over walls. Randomness comes from its own seeded RNG."""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.last_x = None
+        self.stuck_frames = 0
+        self.detour_frames = 0
+
+    def inputs(self, gsm):
+        p = gsm.player.rect
+        # no horizontal progress for a while: walk the other way for a bit
+        self.stuck_frames = self.stuck_frames + 1 if p.x == self.last_x else 0
+        self.last_x = p.x
+        if self.stuck_frames > 45:
+            self.stuck_frames = 0
+            self.detour_frames = 90
+        targets = [e.rect for e in gsm.enemies]
+        if gsm.boss and not gsm.boss.dead:
+            targets.append(gsm.boss.rect)
+        cleared = gsm.enemies_defeated >= gsm.enemies_to_defeat
+        if targets and not (cleared and not gsm.boss):
+            target = min(targets, key=lambda r: abs(r.centerx - p.centerx))
+            dx = target.centerx - p.centerx
+            direction = 1 if dx > 0 else -1
+            near = abs(dx) < 70 and abs(target.centery - p.centery) < 60
+        elif cleared or gsm.guide_present:
+            direction, near = 1, False
+        else:
+            # nothing to fight yet: back off so enemies spawn ahead of the camera
+            direction, near = -1, False
+        if self.detour_frames > 0:
+            self.detour_frames -= 1
+            direction = -direction
+        wall = gsm.grid.wall_ahead(p, direction) if gsm.grid else False
+        return {
+            "left": direction < 0,
+            "right": direction > 0,
+            "jump": wall or self.rng.random() < 0.02,
+            "dash": near and self.rng.random() < 0.05,
+            # released at random so the edge-triggered attack keeps firing
+            "attack": near and self.rng.random() < 0.5,
+        }
+
+
+def apply_params(gsm, params):
+    for key, value in params.items():
+        scope, _, rest = key.partition(".")
+        if scope == "gsm":
+            setattr(gsm, rest, value)
+        elif scope == "stage":
+            gsm.stage_overrides[rest] = value
+        elif scope == "enemy":
+            kind, _, attr = rest.partition(".")
+            gsm.enemy_overrides.setdefault(kind, {})[attr] = value
+        else:
+            raise ValueError(f"unknown parameter scope in {key!r}")
+
+
+def ending_label(ending):
+    if not ending:
+        return "Timeout"
+    for label in ENDING_LABELS:
+        if ending.startswith(label):
+            return label
+    return ending
+
+
+def simulate(seed, params=None, char_class="Wizard", max_time=600.0, fps=FPS):
+    """Play one headless game with a fixed timestep and return its outcome."""
+    # imported here so worker processes pick up the dummy video driver first
+    import pygame
+    from game_states import GameStateManager
+
+    clock = game_clock.SimClock()
+    game_clock.install(clock)
+    try:
+        random.seed(seed)
+        gsm = GameStateManager(pygame.Surface((1, 1)))
+        # think by count only, so outcomes do not depend on machine speed
+        gsm.thinker.budget_us = None
+        apply_params(gsm, params or {})
+        gsm.start_new(char_class)
+        bot = Bot(seed)
+        dt = 1.0 / fps
+        start_lives = gsm.lives
+        damage_taken = 0
+        prev_health = gsm.player.health
+        frames = 0
+        while not gsm.ending and clock.t - 1000.0 < max_time:
+            clock.advance(dt)
+            gsm.tick(dt, bot.inputs(gsm))
+            if gsm.boss and gsm.boss.health <= 0:
+                # the player presses Enter once the boss is down
+                gsm.advance_stage_or_end()
+            health = gsm.player.health
+            if not gsm.player.dead and health < prev_health:
+                damage_taken += prev_health - health
+            prev_health = health
+            frames += 1
+        label = ending_label(gsm.ending)
+        return {
+            "seed": seed,
+            "params": params or {},
+            "ending": label,
+            "cleared": label in ("Good", "Neutral", "Bad"),
+            "time": frames * dt,
+            "stage": gsm.stage_index + 1,
+            "deaths": start_lives - gsm.lives,
+            "damage_taken": damage_taken,
+        }
+    finally:
+        game_clock.install(None)
+
+
+def _run(job):
+    return simulate(*job)
+
+
+def _init_worker():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def parse_param(text):
+    key, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"expected name=v1,v2,... got {text!r}")
+    return key.strip(), [_parse_value(v) for v in values.split(",")]
+
+
+def _parse_value(v):
+    v = v.strip()
+    for cast in (int, float):
+        try:
+            return cast(v)
+        except ValueError:
+            pass
+    return v
+
+
+def param_points(param_specs):
+    """Cartesian product of the swept values, as a list of dicts."""
+    keys = [k for k, _ in param_specs]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*[v for _, v in param_specs])]
+
+
+def run_sweep(points, runs, char_class="Wizard", max_time=600.0, workers=None, seed=0):
+    jobs = [(seed + i, point, char_class, max_time) for point in points for i in range(runs)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker()
+        return [_run(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_run, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+
+
+def summarize(results):
+    """Aggregate results per parameter point into rows of summary columns."""
+    groups = {}
+    for r in results:
+        groups.setdefault(tuple(sorted(r["params"].items())), []).append(r)
+    rows = []
+    for key, rs in groups.items():
+        clear_times = [r["time"] for r in rs if r["cleared"]]
+        endings = Counter(r["ending"] for r in rs)
+        rows.append({
+            "params": ", ".join(f"{k}={v}" for k, v in key) or "(defaults)",
+            "runs": len(rs),
+            "clear%": 100.0 * len(clear_times) / len(rs),
+            "time_med": statistics.median(clear_times) if clear_times else float("nan"),
+            "deaths": statistics.mean(r["deaths"] for r in rs),
+            "damage": statistics.mean(r["damage_taken"] for r in rs),
+            **{label: endings.get(label, 0) for label in ENDING_LABELS},
+        })
+    return rows
+
+
+def format_table(rows):
+    if not rows:
+        return "(no results)"
+    cols = list(rows[0])
+    cells = [[_fmt(row[c]) for c in cols] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(cols)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(cols, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for r in cells:
+        lines.append("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+    return "\n".join(lines)
+
+
+def _fmt(v):
+    return f"{v:.1f}" if isinstance(v, float) else str(v)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless balance sweep for 41 Water")
+    parser.add_argument("--runs", type=int, default=100, help="runs per parameter point")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="name=v1,v2,... (repeatable; the sweep is their product)")
+    parser.add_argument("--class", dest="char_class", default="Wizard", choices=PLAYER_CLASSES)
+    parser.add_argument("--max-time", type=float, default=600.0, help="simulated seconds per run")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; run i uses seed+i")
+    parser.add_argument("--csv", help="also write every run to this CSV file")
+    args = parser.parse_args(argv)
+
+    results = run_sweep(param_points(args.param), args.runs, args.char_class,
+                        args.max_time, args.workers, args.seed)
+    print(format_table(summarize(results)))
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            fields = ["seed", "params", "ending", "cleared", "time", "stage", "deaths", "damage_taken"]
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for r in results:
+                writer.writerow({**r, "params": ";".join(f"{k}={v}" for k, v in r["params"].items())})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
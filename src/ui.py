@@ -1,10 +1,27 @@
 # ui.py
+import threading
 import pygame
 from settings import WHITE, UI_BG, PIXEL_SCALE
-pygame.font.init()
-FONT = pygame.font.SysFont("consolas", 12)
+
+# Fonts are created on first use: SysFont scans the system fonts, which is
+# slow, so it must not run at import time (see startup.py for the warm-up).
+_fonts = {}
+_font_lock = threading.Lock()
+
+def get_font(size=12, bold=False):
+    """Return a cached consolas font, initializing pygame.font if needed."""
+    font = _fonts.get((size, bold))
+    if font is None:
+        with _font_lock:
+            font = _fonts.get((size, bold))
+            if font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                font = _fonts[(size, bold)] = pygame.font.SysFont("consolas", size, bold=bold)
+    return font
 
 def draw_hud(surf, player, stage, guide_text=None, lives=None):
+    FONT = get_font(12)
     # Enhanced HUD at top-left with stat bar
     # background bar - made wider and taller for stats
     pygame.draw.rect(surf, UI_BG, (2, 2, 220, 100))
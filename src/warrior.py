@@ -1,7 +1,8 @@
-import time
+import game_clock
 import pygame
 import math
 from player import Player
+from render_queue import target, LAYER_PLAYER
 
 
 class Warrior(Player):
@@ -25,7 +26,7 @@ class Warrior(Player):
         self.attack_range = 48
 
     def attack(self):
-        now = time.time()
+        now = game_clock.now()
         if now - self.last_attack >= self.attack_cooldown:
             self.last_attack = now
             self.attacking = True
@@ -53,9 +54,9 @@ class Warrior(Player):
 
         return pygame.Rect(x, y, max(1, reach), height)
 
-    def draw(self, surface, camera_x=0):
+    def draw(self, surface, camera_x=0, shake_y=0, queue=None):
         # reuse base drawing then draw sword when attacking
-        super().draw(surface, camera_x)
+        super().draw(surface, camera_x, shake_y, queue)
 
         if self.attacking and self.attack_frame > 0:
             hb = self.get_attack_hitbox()
@@ -64,5 +65,5 @@ class Warrior(Player):
                 draw_rect.x -= camera_x
                 s = pygame.Surface((draw_rect.width, draw_rect.height), pygame.SRCALPHA)
                 s.fill((220, 220, 200, 200))
-                surface.blit(s, (draw_rect.x, draw_rect.y))
+                target(surface, queue, LAYER_PLAYER).blit(s, (draw_rect.x, draw_rect.y))
 
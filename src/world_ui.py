@@ -0,0 +1,71 @@
+# world_ui.py
+# World-space overlay (health bars, name labels) drawn in one batched pass
+# after all entities. Bars come from a small cache of pre-rendered frames,
+# one per style and health bucket, so a bar costs one queued blit.
+import math
+from collections import namedtuple
+import pygame
+
+# Health is quantized to this many steps per bar
+BAR_BUCKETS = 24
+
+# fills: (min fraction, color) checked in order, first match wins
+BarStyle = namedtuple("BarStyle", ["width", "height", "background", "fills", "border"])
+
+ENEMY_BAR = BarStyle(24, 3, (60, 60, 60),
+                     ((0.5, (100, 255, 100)), (0.2, (255, 255, 100)), (0.0, (255, 100, 100))),
+                     (0, 0, 0))
+BOSS_BAR = BarStyle(64, 5, None, ((0.0, (255, 0, 0)),), None)
+
+_bar_frames = {}
+
+
+def health_bucket(fraction):
+    """0 only for no health left; any health left shows at least one step."""
+    return max(0, min(BAR_BUCKETS, math.ceil(fraction * BAR_BUCKETS)))
+
+
+def _render_bar(style, bucket):
+    s = pygame.Surface((style.width, style.height), pygame.SRCALPHA)
+    if style.background:
+        s.fill(style.background)
+    fraction = bucket / BAR_BUCKETS
+    fill_width = int(style.width * fraction)
+    if fill_width > 0:
+        color = next(c for threshold, c in style.fills if fraction > threshold)
+        s.fill(color, (0, 0, fill_width, style.height))
+    if style.border:
+        pygame.draw.rect(s, style.border, s.get_rect(), 1)
+    return s
+
+
+def bar_frame(style, fraction):
+    """Cached bar surface for a health fraction."""
+    key = (style, health_bucket(fraction))
+    frame = _bar_frames.get(key)
+    if frame is None:
+        frame = _bar_frames[key] = _render_bar(style, key[1])
+    return frame
+
+
+class WorldOverlay:
+    """Collects overlay blits during the entity pass and submits them at once."""
+    def __init__(self):
+        self.entries = []
+        self.submitted = 0  # blits in the last flush
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_bar(self, style, x, y, fraction):
+        self.entries.append((bar_frame(style, fraction), (int(x), int(y))))
+
+    def add_label(self, image, x, y):
+        self.entries.append((image, (int(x), int(y))))
+
+    def flush(self, surf):
+        if self.entries:
+            surf.blits(self.entries, False)
+        self.submitted = len(self.entries)
+        self.entries.clear()
+        return self.submitted
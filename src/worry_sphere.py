@@ -1,5 +1,7 @@
 import pygame
-import time
+import game_clock
+from aoe import resolve_hits
+from aoe_fx import sphere_animation, sphere_index
 
 class WorrySphere:
     """Expanding AOE entity spawned by the Worrier class.
@@ -10,7 +12,7 @@ class WorrySphere:
     def __init__(self, x, y, max_radius=80, lifetime=1.2, damage=30, tick=0.25):
         self.x = x
         self.y = y
-        self.created = time.time()
+        self.created = game_clock.now()
         self.lifetime = lifetime
         self.max_radius = max_radius
         self.damage = damage
@@ -18,46 +20,42 @@ class WorrySphere:
         self.last_tick = {}
         self.dead = False
 
-    def age(self):
-        return time.time() - self.created
-
-    def progress(self):
-        return min(1.0, max(0.0, self.age() / self.lifetime))
-
-    def radius(self):
-        return int(self.max_radius * self.progress())
-
-    def update(self, enemies):
+    def age(self, now=None):
+        if now is None:
+            now = game_clock.now()
+        return now - self.created
+
+    def progress(self, now=None):
+        return min(1.0, max(0.0, self.age(now) / self.lifetime))
+
+    def radius(self, now=None):
+        return int(self.max_radius * self.progress(now))
+
+    def expired(self, now=None):
+        return self.age(now) >= self.lifetime
+
+    def hit(self, target, now):
+        """Damage target unless it was hit less than `tick` seconds ago; returns
+        True if it was damaged."""
+        key = id(target)
+        if now - self.last_tick.get(key, 0) >= self.tick:
+            target.take_damage(self.damage)
+            self.last_tick[key] = now
+            return True
+        return False
+
+    def update(self, enemies, now=None):
+        if now is None:
+            now = game_clock.now()
         # expire after lifetime
-        if self.age() >= self.lifetime:
+        if self.expired(now):
             self.dead = True
             return
 
         # damage enemies in range, respecting per-enemy tick cooldown
-        r = self.radius()
-        if r <= 0:
-            return
-
-        for e in enemies:
-            # use enemy center
-            ex = e.rect.centerx
-            ey = e.rect.centery
-            dx = ex - self.x
-            dy = ey - self.y
-            if dx*dx + dy*dy <= r*r:
-                now = time.time()
-                last = self.last_tick.get(id(e), 0)
-                if now - last >= self.tick:
-                    e.take_damage(self.damage)
-                    self.last_tick[id(e)] = now
+        resolve_hits([self], enemies, now)
 
     def draw(self, surf, camera_x=0, shake_y=0):
-        # draw expanding translucent sphere
-        r = self.radius()
-        if r <= 0:
-            return
-        s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-        alpha = int(200 * (1 - self.progress()))
-        color = (255, 160, 180, alpha)
-        pygame.draw.circle(s, color, (r, r), r)
-        surf.blit(s, (self.x - r - camera_x, self.y - r + shake_y))
+        # draw expanding translucent sphere from pre-rendered frames
+        anim = sphere_animation(self.max_radius)
+        anim.blit(surf, self.x - camera_x, self.y + shake_y, sphere_index(self.progress()))
@@ -0,0 +1,121 @@
+import unittest
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import game_clock
+from ai_scheduler import ThinkScheduler, think_time
+from enemy import Enemy
+from flow_field import FlowField
+from level import LevelGrid
+
+
+class TestThinkScheduler(unittest.TestCase):
+    def run_tick(self, scheduler, items):
+        return [item for item, think in scheduler.schedule(items) if think]
+
+    def test_everyone_thinks_when_under_the_cap(self):
+        scheduler = ThinkScheduler(per_tick=8, budget_us=None)
+        items = list(range(5))
+        self.assertEqual(self.run_tick(scheduler, items), items)
+        self.assertEqual(self.run_tick(scheduler, items), items)
+        self.assertEqual(scheduler.deferred, 0)
+
+    def test_round_robin_over_the_cap(self):
+        scheduler = ThinkScheduler(per_tick=3, budget_us=None)
+        items = list(range(7))
+        self.assertEqual(self.run_tick(scheduler, items), [0, 1, 2])
+        self.assertEqual(self.run_tick(scheduler, items), [3, 4, 5])
+        self.assertEqual(self.run_tick(scheduler, items), [6, 0, 1])
+        self.assertEqual(scheduler.deferred, 4)
+
+    def test_every_item_yielded_once(self):
+        scheduler = ThinkScheduler(per_tick=2, budget_us=None)
+        items = list(range(5))
+        self.assertEqual(sorted(i for i, _ in scheduler.schedule(items)), items)
+
+    def test_budget_keeps_the_minimum(self):
+        scheduler = ThinkScheduler(per_tick=10, budget_us=0, min_per_tick=2)
+        self.assertEqual(len(self.run_tick(scheduler, list(range(6)))), 2)
+
+    def test_only_reported_cost_counts(self):
+        scheduler = ThinkScheduler(per_tick=10, budget_us=1500, min_per_tick=0)
+        items = list(range(6))
+        self.assertEqual(len([i for i, think in scheduler.schedule(items, lambda i: 0.001) if think]), 2)
+        self.assertAlmostEqual(scheduler.spent_us, 2000)
+        # time the caller spends outside thinking is not charged
+        thinking = []
+        for i, think in scheduler.schedule(items, lambda i: 0.0):
+            if think:
+                thinking.append(i)
+                time.sleep(0.001)
+        self.assertEqual(len(thinking), 6)
+
+    def test_empty(self):
+        scheduler = ThinkScheduler()
+        self.assertEqual(list(scheduler.schedule([])), [])
+
+
+class TestEnemyThinking(unittest.TestCase):
+    def setUp(self):
+        self.clock = game_clock.SimClock()
+        game_clock.install(self.clock)
+
+    def tearDown(self):
+        game_clock.install(None)
+
+    def test_skipped_ticks_make_no_decisions(self):
+        e = Enemy(100, 100, "spider")
+        e.vx = 0
+        player = pygame.Rect(150, 100, 20, 20)  # well inside chase range
+        for _ in range(5):
+            self.clock.advance(1 / 60)
+            self.assertFalse(e.update([], player, think=False))
+        self.assertEqual(e.vx, 0)
+        self.assertFalse(e.attacking)
+        self.clock.advance(1 / 60)
+        e.update([], player, think=True)
+        self.assertNotEqual(e.vx, 0)
+        self.assertGreater(think_time(e), 0)
+
+    def test_think_timers_cover_skipped_ticks(self):
+        e = Enemy(100, 100, "slime")
+        player = pygame.Rect(900, 100, 20, 20)
+        for _ in range(30):
+            self.clock.advance(1 / 60)
+            e.update([], player, think=False)
+        self.assertEqual(e.jump_timer, 0)
+        e.think(player, game_clock.now())
+        self.assertAlmostEqual(e.jump_timer, 0.5)
+
+    def test_steering_keeps_to_the_path_off_a_ledge(self):
+        grid = LevelGrid.from_array([
+            "......",
+            "......",
+            "GGG...",
+            "GGGGGG",
+        ])
+        ts = grid.tile_size
+        flow = FlowField(grid)
+        flow.update(pygame.Rect(4 * ts, 2 * ts, ts, ts))  # player on the lower floor
+        e = Enemy(2 * ts, ts, "grub")  # at the ledge, walking toward the drop
+        e.grid = grid
+        e.on_ground = True
+        e.vx = 0.8
+        e.steer()
+        self.assertEqual(e.vx, -0.8)  # no path: turn at the ledge
+        e.vx = 0.8
+        e.flow = flow
+        e.steer()
+        self.assertEqual(e.vx, 0.8)
+        flow.update(pygame.Rect(0, ts, ts, ts))  # player behind, up on the ledge
+        e.steer()
+        self.assertEqual(e.vx, -0.8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import random
+from unittest.mock import Mock
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aoe import AOESystem
+from worry_sphere import WorrySphere
+
+
+def make_enemy(x, y):
+    enemy = Mock()
+    enemy.rect = Mock()
+    enemy.rect.centerx = x
+    enemy.rect.centery = y
+    enemy.take_damage = Mock()
+    return enemy
+
+
+class TestAOESystem(unittest.TestCase):
+
+    def setUp(self):
+        self.system = AOESystem()
+
+    def add_sphere(self, x, y, created=0.0, **kw):
+        sphere = WorrySphere(x, y, **kw)
+        sphere.created = created
+        return self.system.add(sphere)
+
+    def test_hits_match_brute_force(self):
+        rng = random.Random(7)
+        spheres = [self.add_sphere(rng.randint(0, 1000), rng.randint(0, 300)) for _ in range(20)]
+        enemies = [make_enemy(rng.randint(0, 1000), rng.randint(0, 300)) for _ in range(200)]
+        now = 0.6
+        hits = self.system.update(enemies, now)
+        self.assertEqual(len(hits), sum(e.take_damage.call_count for e in enemies))
+        for e in enemies:
+            expected = 0
+            for s in spheres:
+                r = s.radius(now)
+                dx = e.rect.centerx - s.x
+                dy = e.rect.centery - s.y
+                if dx*dx + dy*dy <= r*r:
+                    expected += 1
+            self.assertEqual(e.take_damage.call_count, expected)
+
+    def test_tick_cooldown_per_sphere(self):
+        self.add_sphere(100, 100)
+        enemy = make_enemy(100, 100)
+        self.assertEqual(self.system.update([enemy], 0.3), [(self.system.effects[0], enemy)])
+        self.assertEqual(self.system.update([enemy], 0.4), [])
+        self.assertEqual(enemy.take_damage.call_count, 1)
+        self.system.update([enemy], 0.6)
+        self.assertEqual(enemy.take_damage.call_count, 2)
+
+    def test_expired_effects_removed(self):
+        sphere = self.add_sphere(100, 100, lifetime=1.0)
+        self.system.update([], 1.5)
+        self.assertTrue(sphere.dead)
+        self.assertEqual(len(self.system), 0)
+
+    def test_cooldowns_pruned_for_missing_targets(self):
+        sphere = self.add_sphere(100, 100)
+        a = make_enemy(100, 100)
+        b = make_enemy(101, 100)
+        self.system.update([a, b], 0.5)
+        self.assertEqual(len(sphere.last_tick), 2)
+        self.system.update([a], 0.55)
+        self.assertEqual(set(sphere.last_tick), {id(a)})
+
+    def test_clear(self):
+        self.add_sphere(0, 0)
+        self.system.clear()
+        self.assertEqual(len(self.system), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import math
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import aoe_fx
+from aoe_fx import (sphere_animation, ring_animation, tier_rings, ring_phase,
+                    RING_PHASES, WAVE_AMPLITUDE)
+from quality import QUALITY_TIERS
+
+
+def frame_bytes(anim):
+    return [[None if image is None else (pygame.image.tobytes(image, "RGBA"), offset)
+             for image, offset in variants]
+            for variants in anim.frames]
+
+
+class TestSphereAnimation(unittest.TestCase):
+    def test_frame_count_and_sizes(self):
+        anim = sphere_animation(50, steps=10)
+        self.assertEqual(len(anim), 11)
+        self.assertEqual(anim.frame(0), (None, 0))
+        for i in range(1, 11):
+            image, offset = anim.frame(i)
+            radius = int(50 * i / 10)
+            self.assertEqual(image.get_size(), (radius * 2, radius * 2))
+            self.assertEqual(offset, radius)
+
+    def test_cached_per_parameters(self):
+        self.assertIs(sphere_animation(50, steps=10), sphere_animation(50, steps=10))
+        self.assertIsNot(sphere_animation(50, steps=10), sphere_animation(60, steps=10))
+
+
+class TestRingAnimation(unittest.TestCase):
+    def test_deterministic_for_fixed_seed(self):
+        aoe_fx._animations.clear()
+        first = frame_bytes(ring_animation(40, attack_frames=4))
+        aoe_fx._animations.clear()
+        second = frame_bytes(ring_animation(40, attack_frames=4))
+        self.assertEqual(first, second)
+
+    def test_frames_and_phases(self):
+        anim = ring_animation(40, attack_frames=4)
+        self.assertEqual(len(anim), 5)
+        self.assertEqual(anim.frame(0), (None, 0))
+        self.assertEqual(len(anim.frames[4]), RING_PHASES)
+        image, offset = anim.frame(4)
+        size = 40 * 2 + 4 + WAVE_AMPLITUDE * 2
+        self.assertEqual(image.get_size(), (size, size))
+        self.assertEqual(offset, size // 2)
+
+
+class TestRingPhase(unittest.TestCase):
+    def test_wraps_around(self):
+        period = 2 * math.pi / 10
+        for now in (0.0, 0.3, 1.7, 1000.25):
+            self.assertEqual(ring_phase(now + period), ring_phase(now))
+            self.assertIn(ring_phase(now), range(RING_PHASES))
+
+    def test_steps_through_every_phase(self):
+        period = 2 * math.pi / 10
+        phases = {ring_phase((k + 0.5) * period / RING_PHASES) for k in range(RING_PHASES)}
+        self.assertEqual(phases, set(range(RING_PHASES)))
+
+
+class TestTierRings(unittest.TestCase):
+    def test_cached_per_tier(self):
+        for fx in QUALITY_TIERS:
+            self.assertIs(tier_rings(40, fx), tier_rings(40, fx))
+            self.assertIs(tier_rings(40, fx), ring_animation(
+                40, rings=fx.worrier_rings, particles=fx.ring_particles, wave=fx.ring_wave))
+        densities = {(fx.worrier_rings, fx.ring_particles, fx.ring_wave): tier_rings(40, fx)
+                     for fx in QUALITY_TIERS}
+        self.assertEqual(len({id(anim) for anim in densities.values()}), len(densities))
+
+
+if __name__ == '__main__':
+    unittest.main()
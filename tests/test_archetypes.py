@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import archetypes
+from archetypes import ARCHETYPES, ENEMY_KINDS, load_archetypes, parse_archetype
+from enemy import Enemy
+
+
+class TestArchetypes(unittest.TestCase):
+    def test_shipped_kinds(self):
+        self.assertEqual(ENEMY_KINDS, ("grub", "spider", "slime", "ghost"))
+        self.assertEqual(ARCHETYPES["spider"].max_fall, 10)
+        self.assertEqual(ARCHETYPES["slime"].gravity, 0.5)
+        self.assertTrue(ARCHETYPES["ghost"].phasing)
+
+    def test_missing_and_unknown_fields_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_archetype("blob", {"behavior": "bounce"})
+        spec = dict(ARCHETYPES["grub"]._asdict())
+        del spec["kind"]
+        spec["colour"] = "red"
+        with self.assertRaises(ValueError):
+            parse_archetype("blob", spec)
+        spec = {"behavior": "teleport", "max_health": 1, "speed": 1, "damage": 1,
+                "attack_range": 1, "attack_cooldown": 1}
+        with self.assertRaises(ValueError):
+            parse_archetype("blob", spec)
+
+    def test_load_from_file(self):
+        data = {"bat": {"behavior": "phase", "sprite": "ghost", "max_health": 8, "speed": 2.0,
+                        "damage": 4, "attack_range": 30, "attack_cooldown": 1.0,
+                        "phasing": True, "state": {"phase_timer": 0, "visible": True,
+                                                   "energy": 50, "energy_regen": 4}}}
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(data, f)
+        try:
+            loaded = load_archetypes(f.name)
+        finally:
+            os.unlink(f.name)
+        bat = loaded["bat"]
+        self.assertEqual(bat.sprite, "ghost")
+        self.assertEqual(bat.gravity, 0.7)
+        self.assertEqual(bat.hitbox, (4, 4, 4, 4))
+
+
+class TestEnemyFromArchetype(unittest.TestCase):
+    def test_stats_and_handlers_bound_at_spawn(self):
+        spider = Enemy(0, 0, "spider")
+        self.assertEqual((spider.max_health, spider.speed, spider.wall_jump), (25, 1.4, 0.3))
+        self.assertEqual(spider.web_charges, 2)
+        self.assertIs(spider.behave, Enemy.update_spider_behavior)
+
+    def test_hitboxes_match_kind_shapes(self):
+        slime = Enemy(10, 20, "slime")
+        r = slime.rect
+        self.assertEqual(slime.get_hitbox(),
+                         pygame.Rect(r.x + 2, r.y + r.height // 2, r.width - 4, r.height // 2))
+        grub = Enemy(10, 20, "grub")
+        self.assertEqual(grub.get_hitbox(), grub.rect.inflate(-8, -8))
+
+    def test_new_kind_is_a_data_change(self):
+        spec = {"behavior": "chase", "sprite": "spider", "max_health": 60, "speed": 1.0,
+                "damage": 20, "attack_range": 60, "attack_cooldown": 2.5,
+                "state": {"jump_cooldown": 0, "web_cooldown": 0, "web_charges": 0}}
+        archetypes.ARCHETYPES["brute"] = parse_archetype("brute", spec)
+        try:
+            brute = Enemy(0, 0, "brute")
+            brute.update([], pygame.Rect(100, 0, 20, 20))
+            self.assertEqual(brute.health, 60)
+            self.assertEqual(brute.gravity, 0.7)
+        finally:
+            del archetypes.ARCHETYPES["brute"]
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            Enemy(0, 0, "dragon")
+
+
+if __name__ == '__main__':
+    unittest.main()
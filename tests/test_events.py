@@ -0,0 +1,100 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import events
+from events import (EventBus, TelemetryExporter, read_telemetry, DAMAGE, KILL, SPAWN, DAMAGE_HURT,
+                    DAMAGE_SPHERE)
+from game_states import GameStateManager
+from worry_sphere import WorrySphere
+
+
+class TestEventBus(unittest.TestCase):
+
+    def test_dispatch_in_order_by_kind(self):
+        bus = EventBus(capacity=8)
+        seen = []
+        bus.subscribe(lambda kind, t, x, y, value, tag: seen.append((kind, value)), DAMAGE)
+        batches = []
+        bus.subscribe_batch(lambda: batches.append(1))
+        bus.emit(DAMAGE, 1.0, value=5)
+        bus.emit(KILL, 1.0)
+        bus.emit(DAMAGE, 1.0, value=7)
+        self.assertEqual(seen, [])
+        self.assertEqual(bus.dispatch(), 3)
+        self.assertEqual(seen, [(DAMAGE, 5), (DAMAGE, 7)])
+        self.assertEqual(bus.dispatch(), 0)
+        self.assertEqual(len(batches), 1)
+
+    def test_overflow_drops_oldest(self):
+        bus = EventBus(capacity=4)
+        seen = []
+        bus.subscribe(lambda kind, t, x, y, value, tag: seen.append(tag))
+        for i in range(6):
+            bus.emit(SPAWN, 0.0, tag=i)
+        bus.dispatch()
+        self.assertEqual(seen, [2, 3, 4, 5])
+        self.assertEqual(bus.dropped, 2)
+
+    def test_telemetry_roundtrip(self):
+        bus = EventBus()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "session.tlm")
+            exporter = TelemetryExporter(path, start_time=100.0, records_per_flush=4)
+            exporter.attach(bus)
+            for i in range(10):
+                bus.emit(DAMAGE, 100.0 + i, 1.0, 2.0, 3.0, DAMAGE_HURT)
+                bus.dispatch()
+            exporter.close()
+            rows = list(read_telemetry(path))
+            self.assertEqual(os.path.getsize(path), events.TELEMETRY_HEADER.size + 10 * events.RECORD.size)
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[3], (DAMAGE, DAMAGE_HURT, 3.0, 1.0, 2.0, 3.0))
+
+
+class TestCombatEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.gsm = GameStateManager(pygame.Surface((10, 10)))
+        self.gsm.start_new("Wizard")
+        self.gsm.events.dispatch()
+
+    def test_damage_feedback_applied_on_dispatch(self):
+        gsm = self.gsm
+        gsm.events.emit(DAMAGE, 0.0, 50, 60, 12, DAMAGE_HURT)
+        self.assertEqual(len(gsm.damage_numbers), 0)
+        gsm.events.dispatch()
+        self.assertEqual(len(gsm.damage_numbers), 1)
+        self.assertEqual(gsm.damage_numbers.amount(0), 12)
+        self.assertEqual(gsm.screen_shake, 4)
+        self.assertGreater(gsm.hitstop_until, 0)
+
+    def test_spawn_and_kill_recorded(self):
+        gsm = self.gsm
+        kinds = []
+        gsm.events.subscribe(lambda kind, t, x, y, value, tag: kinds.append(kind), SPAWN, KILL)
+        gsm.add_enemy(200, 100, "spider")
+        gsm.enemies[0].dead = True
+        gsm.tick(1 / 60, {})
+        self.assertEqual(kinds, [SPAWN, KILL])
+
+    def test_worry_sphere_damage_recorded(self):
+        gsm = self.gsm
+        damage = []
+        gsm.events.subscribe(lambda kind, t, x, y, value, tag: damage.append((value, tag)), DAMAGE)
+        gsm.add_enemy(600, 100, "grub")
+        e = gsm.enemies[-1]
+        gsm.aoe.add(WorrySphere(e.rect.centerx, e.rect.centery, damage=7))
+        sphere = gsm.aoe.effects[0]
+        sphere.created -= 0.5  # already grown past the enemy
+        gsm.tick(1 / 60, {})
+        self.assertIn((7, DAMAGE_SPHERE), damage)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from floating_text import FloatingTextPool, digit_atlas
+
+
+class TestFloatingText(unittest.TestCase):
+
+    def test_atlas_cached_per_color(self):
+        self.assertIs(digit_atlas((1, 2, 3)), digit_atlas([1, 2, 3]))
+        self.assertIsNot(digit_atlas((1, 2, 3)), digit_atlas((3, 2, 1)))
+        self.assertEqual(len(digit_atlas((1, 2, 3)).glyphs), 10)
+
+    def test_expired_entries_are_compacted(self):
+        pool = FloatingTextPool(capacity=4)
+        pool.spawn(0, 100, 25, (255, 0, 0))
+        pool.update(0.5)
+        pool.spawn(0, 100, 40, (255, 0, 0))
+        pool.update(0.6)
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.amount(0), 40)
+        self.assertEqual(pool.ys[0], 98)
+
+    def test_full_pool_replaces_oldest(self):
+        pool = FloatingTextPool(capacity=3)
+        for amount in (1, 2, 3):
+            pool.spawn(0, 0, amount, (255, 255, 255))
+            pool.update(0.1)
+        pool.spawn(0, 0, 99, (255, 255, 255))
+        self.assertEqual(len(pool), 3)
+        self.assertEqual(sorted(pool.amount(i) for i in range(3)), [2, 3, 99])
+
+    def test_draw(self):
+        pool = FloatingTextPool()
+        pool.spawn(5, 5, 120, (255, 200, 100))
+        surf = pygame.Surface((64, 32))
+        pool.draw(surf)
+        self.assertNotEqual(surf.get_bounding_rect().size, (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
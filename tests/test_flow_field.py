@@ -0,0 +1,153 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from level import LevelGrid, LEVELS, build_level_from_array
+from flow_field import FlowField
+from enemy import Enemy
+
+TS = 10
+
+
+def feet(cx, cy):
+    """A one-cell rect standing in cell (cx, cy)."""
+    return pygame.Rect(cx * TS, cy * TS, TS, TS)
+
+
+class TestFlowField(unittest.TestCase):
+    def setUp(self):
+        # a one-tile step at column 3 on the floor
+        self.grid = LevelGrid.from_array([
+            "........",
+            "........",
+            "........",
+            "...G....",
+            "GGGGGGGG",
+        ], tile_size=TS)
+        self.flow = FlowField(self.grid)
+
+    def test_walks_and_jumps_up_the_step(self):
+        self.flow.update(feet(6, 3))
+        self.assertEqual(self.flow.sample(feet(0, 3)), (1, 0))
+        self.assertEqual(self.flow.sample(feet(2, 3)), (1, TS))
+        self.assertEqual(self.flow.sample(feet(3, 2)), (1, 0))
+
+    def test_heads_back_from_the_other_side(self):
+        self.flow.update(feet(0, 3))
+        self.assertEqual(self.flow.sample(feet(6, 3)), (-1, 0))
+        self.assertEqual(self.flow.sample(feet(4, 3)), (-1, TS))
+
+    def test_rebuilds_only_on_cell_change(self):
+        self.assertTrue(self.flow.update(feet(6, 3)))
+        self.assertFalse(self.flow.update(feet(6, 3).move(3, 0)))
+        # airborne above the same spot still targets the ground cell
+        self.assertFalse(self.flow.update(feet(6, 1)))
+        self.assertTrue(self.flow.update(feet(5, 3)))
+        self.assertEqual(self.flow.builds, 2)
+
+    def test_unreachable_has_no_direction(self):
+        grid = LevelGrid.from_array([
+            "..G.....",
+            "..G.....",
+            "..G.....",
+            "GGGGGGGG",
+        ], tile_size=TS)
+        flow = FlowField(grid)
+        flow.update(feet(6, 2))
+        self.assertEqual(flow.sample(feet(0, 2)), (0, 0))
+
+
+class TestUnderPlatform(unittest.TestCase):
+    def setUp(self):
+        self.grid = LevelGrid.from_array([
+            "........",
+            "....GGGG",
+            "........",
+            "GGGGGGGG",
+        ], tile_size=TS)
+        self.flow = FlowField(self.grid)
+        self.flow.update(feet(6, 0))  # player on top of the platform
+
+    def test_leads_out_from_under_the_platform(self):
+        self.assertEqual(self.flow.sample(feet(6, 2)), (-1, 0))
+        self.assertEqual(self.flow.sample(feet(3, 2)), (1, 2 * TS))
+
+    def test_enemy_heading_follows_the_field(self):
+        e = Enemy(0, 0, "spider")
+        e.rect = feet(6, 2)
+        e.flow = self.flow
+        # player straight above: the old dx steering would walk right
+        self.assertEqual(e.path_heading(0), (-1, 0))
+        e.flow = None
+        self.assertEqual(e.path_heading(0), (1.0, 0))
+
+    def test_waits_to_jump_until_clear_of_the_ledge(self):
+        e = Enemy(0, 0, "spider")
+        e.flow = self.flow
+        e.rect = feet(3, 2).move(3, 0)  # overhangs the platform's column
+        self.assertFalse(e.clear_of_ledge(1))
+        self.assertTrue(e.clear_of_ledge(-1))
+        e.rect = feet(3, 2)
+        self.assertTrue(e.clear_of_ledge(1))
+
+
+class TestShippedLevels(unittest.TestCase):
+    """Default field on the stage layouts, with the player standing on platforms."""
+
+    def follow(self, flow, cx, cy):
+        """Walk the field from floor cell (cx, cy); returns the cell it ends on."""
+        ts, cols, cells = flow.grid.tile_size, flow.grid.cols, flow.grid.cells
+        for _ in range(200):
+            rect = pygame.Rect(cx * ts, cy * ts, ts, ts)
+            if flow.cell_of(rect) == flow.target:
+                break
+            direction, rise = flow.sample(rect)
+            if not direction:
+                break
+            cy -= rise // ts
+            cx += direction
+            while not flow.standable[cy * cols + cx] and not cells[(cy + 1) * cols + cx]:
+                cy += 1
+        return cx, cy
+
+    def test_floor_enemies_reach_platforms(self):
+        for idx, player_cells in ((1, [(15, 1), (58, 1)]), (2, [(16, 3), (48, 3), (15, 1)])):
+            flow = FlowField(LevelGrid.from_array(LEVELS[idx]))
+            ts = flow.grid.tile_size
+            for pcx, pcy in player_cells:
+                flow.update(pygame.Rect(pcx * ts, pcy * ts, ts, ts))
+                # standing right below the player, under the platform
+                self.assertNotEqual(flow.sample(pygame.Rect(pcx * ts, 5 * ts, ts, ts))[0], 0)
+                for cx in (pcx - 6, pcx, pcx + 6):
+                    self.assertEqual(self.follow(flow, cx, 5), (pcx, pcy), (idx, pcx, pcy, cx))
+
+    def test_path_jump_lands_on_the_ledge(self):
+        # level 2: jump 4 cells from the floor beside the platform at column 11
+        tiles, _ = build_level_from_array(LEVELS[1])
+        flow = FlowField(LevelGrid.from_array(LEVELS[1]))
+        ts = flow.grid.tile_size
+        flow.update(pygame.Rect(15 * ts, ts, ts, ts))
+        for kind in ("spider", "slime"):
+            e = Enemy(10 * ts, 5 * ts, kind)
+            e.flow = flow
+            e.on_ground = True
+            direction, rise = flow.sample(e.rect)
+            self.assertEqual((direction, rise), (1, 4 * ts))
+            self.assertTrue(e.clear_of_ledge(direction))
+            e.vx = direction * e.speed
+            e.vy = e.path_jump_speed(rise)
+            e.climb = direction
+            for _ in range(120):
+                e.apply_physics(tiles)
+                if e.on_ground:
+                    break
+            self.assertEqual(e.rect.bottom, 2 * ts, kind)
+            self.assertGreater(e.rect.right, 11 * ts)
+
+
+if __name__ == '__main__':
+    unittest.main()
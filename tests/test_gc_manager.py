@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import gc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from gc_manager import GCManager, FORCE_FACTOR
+
+
+class TestGCManager(unittest.TestCase):
+    def setUp(self):
+        self.junk = None
+        self.gcm = GCManager(threshold=100)
+        self.gcm.start()
+
+    def tearDown(self):
+        self.junk = None
+        self.gcm.stop()
+
+    def churn(self, n):
+        # gen0 counts allocations minus frees, so keep the objects alive
+        self.junk = [[] for _ in range(n)]
+
+    def test_takes_over_from_automatic_collection(self):
+        self.assertFalse(gc.isenabled())
+        self.gcm.stop()
+        self.assertTrue(gc.isenabled())
+        self.gcm.start()
+
+    def test_young_collection_needs_slack(self):
+        gc.collect()
+        self.churn(200)
+        self.assertIsNone(self.gcm.idle(0.0))
+        self.assertEqual(self.gcm.idle(0.01), 0)
+        self.assertEqual(self.gcm.collections[0], 1)
+
+    def test_nothing_due_nothing_collected(self):
+        gc.collect()
+        self.assertIsNone(self.gcm.idle(1.0))
+        self.assertEqual(self.gcm.count, 0)
+
+    def test_forced_when_far_behind(self):
+        gc.collect()
+        self.churn(100 * FORCE_FACTOR + 100)
+        self.assertEqual(self.gcm.idle(0.0), 0)
+        self.assertEqual(self.gcm.forced, 1)
+
+    def test_quiet_frame_runs_older_generation(self):
+        gc.collect()
+        self.churn(200)
+        self.gcm.collect(0)
+        self.assertEqual(self.gcm.idle(0.0, quiet=True), 1)
+
+    def test_stage_loaded_freezes_survivors(self):
+        self.gcm.stage_loaded()
+        self.assertGreater(gc.get_freeze_count(), 0)
+        self.assertEqual(self.gcm.collections[2], 1)
+        self.assertIn("gen2 1", self.gcm.report())
+
+
+class TestQuietFrame(unittest.TestCase):
+    def test_quiet_during_hitstop_and_fades(self):
+        from game_states import GameStateManager
+        gsm = GameStateManager(pygame.Surface((1, 1)))
+        self.assertFalse(gsm.quiet_frame())
+        gsm.trigger_hitstop(1.0)
+        self.assertTrue(gsm.quiet_frame())
+        gsm.hitstop_until = 0
+        gsm.fade_state = 'in'
+        self.assertTrue(gsm.quiet_frame())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from input_timing import InputSampler, LatencyProbe, percentile
+from pacing import FramePacer
+
+
+class TestInputTiming(unittest.TestCase):
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+
+    def test_probe_measures_to_next_present(self):
+        probe = LatencyProbe()
+        probe.on_input("dash", 1.000)
+        probe.on_input("attack", 1.004)
+        probe.on_present(1.020)
+        probe.on_present(1.040)
+        self.assertAlmostEqual(probe.samples["dash"][0], 20.0)
+        self.assertAlmostEqual(probe.samples["attack"][0], 16.0)
+        self.assertEqual(len(probe.samples["dash"]), 1)
+        self.assertIn("attack", probe.report())
+
+    def test_sampling_order(self):
+        pygame.display.set_mode((8, 8))
+        order = []
+        for early in (False, True):
+            sampler = InputSampler(FramePacer(1000), early=early, stamp_events=True)
+            sampler.wait = lambda: order.append("wait") or 0.001
+            sampler.frame(lambda events: order.append("sample"))
+        self.assertEqual(order, ["wait", "sample", "sample", "wait"])
+
+    def test_events_stamped_while_waiting(self):
+        pygame.display.set_mode((8, 8))
+        pygame.event.clear()
+        pacer = FramePacer(200)
+        sampler = InputSampler(pacer, stamp_events=True)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_j))
+        sampler.wait()
+        events = sampler.take()
+        keydowns = [t for e, t in events if e.type == pygame.KEYDOWN]
+        self.assertEqual(len(keydowns), 1)
+        self.assertLessEqual(keydowns[0], pacer._last)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from level import LevelGrid, LEVELS, TILE_SIZE, build_level_from_array
+
+
+class TestLevelGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.arr = [
+            "......",
+            "..GG..",
+            "......",
+            "RRRR..",
+        ]
+        self.grid = LevelGrid.from_array(self.arr)
+
+    def test_dimensions(self):
+        self.assertEqual(self.grid.cols, 6)
+        self.assertEqual(self.grid.rows, 4)
+        self.assertEqual(self.grid.width, 6 * TILE_SIZE)
+
+    def test_cell_queries(self):
+        self.assertTrue(self.grid.is_solid_cell(2, 1))
+        self.assertFalse(self.grid.is_solid_cell(1, 1))
+        self.assertNotEqual(self.grid.cell_at(0, 3), self.grid.cell_at(2, 1))
+        # out of bounds counts as empty
+        self.assertFalse(self.grid.is_solid_cell(-1, 0))
+        self.assertFalse(self.grid.is_solid_cell(0, 99))
+
+    def test_point_query(self):
+        self.assertTrue(self.grid.is_solid_at(2 * TILE_SIZE, TILE_SIZE + 5))
+        self.assertFalse(self.grid.is_solid_at(2 * TILE_SIZE - 1, TILE_SIZE + 5))
+
+    def test_rect_is_free_matches_tile_collision(self):
+        tiles, _ = build_level_from_array(self.arr)
+        for x in range(0, 6 * TILE_SIZE, 7):
+            for y in range(0, 4 * TILE_SIZE, 11):
+                rect = pygame.Rect(x, y, 32, 32)
+                expected = not any(rect.colliderect(t) for t in tiles)
+                self.assertEqual(self.grid.rect_is_free(rect), expected, rect)
+
+    def test_free_cells_in_range(self):
+        cells = self.grid.free_cells_in(0, TILE_SIZE * 2, 0, TILE_SIZE)
+        self.assertIn((0, 0), cells)
+        self.assertIn((2, 0), cells)
+        self.assertNotIn((2, 1), cells)
+        for cx, cy in cells:
+            self.assertFalse(self.grid.is_solid_cell(cx, cy))
+
+    def test_ledge_and_wall_probes(self):
+        # standing on the rock row, walking right towards its edge
+        on_rock = pygame.Rect(TILE_SIZE * 2, TILE_SIZE * 2, TILE_SIZE, TILE_SIZE)
+        self.assertTrue(self.grid.ground_ahead(on_rock, 1))
+        at_edge = pygame.Rect(TILE_SIZE * 3, TILE_SIZE * 2, TILE_SIZE, TILE_SIZE)
+        self.assertFalse(self.grid.ground_ahead(at_edge, 1))
+        below_platform = pygame.Rect(TILE_SIZE * 1, TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self.assertTrue(self.grid.wall_ahead(below_platform, 1))
+        self.assertFalse(self.grid.wall_ahead(below_platform, -1))
+
+    def test_heightmap_topmost_surface(self):
+        self.assertEqual(self.grid.ground_at(2 * TILE_SIZE + 3), TILE_SIZE)
+        self.assertEqual(self.grid.ground_at(0), 3 * TILE_SIZE)
+        self.assertIsNone(self.grid.ground_at(5 * TILE_SIZE))
+        self.assertIsNone(self.grid.ground_at(-10))
+
+    def test_heightmap_multi_platform_column(self):
+        self.assertEqual(self.grid.surfaces[2], [TILE_SIZE, 3 * TILE_SIZE])
+        self.assertEqual(self.grid.ground_below(2 * TILE_SIZE, 2 * TILE_SIZE), 3 * TILE_SIZE)
+        self.assertEqual(self.grid.ground_below(2 * TILE_SIZE, 0), TILE_SIZE)
+        self.assertIsNone(self.grid.ground_below(5 * TILE_SIZE, 0))
+
+    def test_builds_all_levels(self):
+        for arr in LEVELS:
+            grid = LevelGrid.from_array(arr)
+            self.assertEqual(grid.rows, len(arr))
+            self.assertTrue(grid.free_cells)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import tempfile
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import level_compiler
+from level import LEVELS, TILE_SIZE, build_level_from_array
+
+
+class TestLevelCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.old_dir = level_compiler.LEVEL_CACHE_DIR
+        level_compiler.LEVEL_CACHE_DIR = self.tmp.name
+        level_compiler._loaded.clear()
+
+    def tearDown(self):
+        level_compiler.LEVEL_CACHE_DIR = self.old_dir
+        level_compiler._loaded.clear()
+        self.tmp.cleanup()
+
+    def test_merged_rects_cover_same_area_as_tiles(self):
+        for arr in LEVELS:
+            tiles, _ = build_level_from_array(arr)
+            level = level_compiler.compile_level(arr)
+            self.assertLess(len(level.rects), len(tiles))
+            self.assertEqual(sum(r.width * r.height for r in level.rects),
+                             len(tiles) * TILE_SIZE * TILE_SIZE)
+            for t in tiles:
+                self.assertEqual(sum(1 for r in level.rects if r.contains(t)), 1)
+
+    def test_roundtrip(self):
+        level = level_compiler.compile_level(LEVELS[2])
+        loaded = level_compiler.deserialize(level_compiler.serialize(level))
+        self.assertEqual(bytes(loaded.grid.cells), bytes(level.grid.cells))
+        self.assertEqual(loaded.rects, level.rects)
+        self.assertEqual(loaded.spawn, level.spawn)
+        self.assertEqual(loaded.checkpoints, level.checkpoints)
+        self.assertEqual(len(loaded.tile_surfaces), len(level.tile_surfaces))
+        for code, surf in level.tile_images.items():
+            self.assertEqual(pygame.image.tobytes(loaded.tile_images[code], "RGBA"),
+                             pygame.image.tobytes(surf, "RGBA"))
+
+    def test_load_level_writes_and_reuses_cache(self):
+        level = level_compiler.load_level(0)
+        path = level_compiler.cache_path(level_compiler.level_hash(LEVELS[0]))
+        self.assertTrue(os.path.exists(path))
+        # a fresh process would read the artifact back from disk
+        level_compiler._loaded.clear()
+        cached = level_compiler.load_level(0)
+        self.assertIsNot(cached, level)
+        self.assertEqual(cached.rects, level.rects)
+        self.assertEqual(cached.spawn, level.spawn)
+
+    def test_corrupt_cache_is_recompiled(self):
+        path = level_compiler.cache_path(level_compiler.level_hash(LEVELS[1]))
+        with open(path, "wb") as f:
+            f.write(b"garbage")
+        level = level_compiler.load_level(1)
+        self.assertEqual(level.rects, level_compiler.compile_level(LEVELS[1]).rects)
+
+    def test_concurrent_loads_write_one_artifact(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(level_compiler.load_level(2)))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 4)
+        self.assertEqual(os.listdir(self.tmp.name),
+                         [os.path.basename(level_compiler.cache_path(level_compiler.level_hash(LEVELS[2])))])
+        level_compiler._loaded.clear()
+        self.assertEqual(level_compiler.load_level(2).rects, results[0].rects)
+
+    def test_hash_depends_on_source(self):
+        arr = list(LEVELS[0])
+        changed = arr[:-1] + [arr[-1][:-1] + "."]
+        self.assertNotEqual(level_compiler.level_hash(arr), level_compiler.level_hash(changed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import time
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pacing import FramePacer, FrameStats, HISTOGRAM_MS
+
+
+class TestFrameStats(unittest.TestCase):
+
+    def test_histogram_and_stutters(self):
+        stats = FrameStats(1 / 60)
+        for _ in range(98):
+            stats.record(0.0165)
+        stats.record(0.030)
+        stats.record(0.200)
+        self.assertEqual(stats.bins[16], 98)
+        self.assertEqual(stats.bins[HISTOGRAM_MS], 1)
+        self.assertEqual(stats.stutters, 2)
+        self.assertEqual(stats.percentile(50), 17.0)
+        self.assertAlmostEqual(stats.percentile(100), 200.0)
+        report = stats.report()
+        self.assertIn("stutters", report)
+        self.assertIn("#99:30", report)
+
+
+class TestFramePacer(unittest.TestCase):
+
+    def test_rejects_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            FramePacer(60, "bogus")
+
+    def test_modes_hold_frame_rate(self):
+        for mode in ("sleep", "hybrid"):
+            pacer = FramePacer(200, mode)
+            start = time.perf_counter()
+            for _ in range(20):
+                pacer.wait()
+            elapsed = time.perf_counter() - start
+            self.assertGreater(elapsed, 0.09, mode)
+            self.assertLess(elapsed, 0.2, mode)
+            self.assertEqual(pacer.stats.frames, 20)
+
+    def test_vsync_does_not_wait_but_polls(self):
+        pacer = FramePacer(10, "vsync")
+        calls = []
+        start = time.perf_counter()
+        pacer.wait(lambda: calls.append(1))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(calls, [1])
+
+    def test_schedule_resets_after_long_frame(self):
+        pacer = FramePacer(100)
+        time.sleep(0.05)
+        pacer.wait()
+        start = time.perf_counter()
+        pacer.wait()
+        self.assertGreater(time.perf_counter() - start, 0.005)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from physics import Body, sweep_x, sweep_y
+from player import Player
+
+
+class TestSweep(unittest.TestCase):
+    def test_nearest_tile_in_path_blocks(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        tiles = [pygame.Rect(40, 0, 4, 10), pygame.Rect(20, 0, 4, 10)]
+        self.assertEqual(sweep_x(rect, 50, tiles), 10)
+        self.assertIsNone(sweep_x(rect, 5, tiles))
+
+    def test_tiles_beside_the_path_are_ignored(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        floor = [pygame.Rect(0, 10, 100, 4)]
+        self.assertIsNone(sweep_x(rect, 30, floor))
+        self.assertEqual(sweep_y(rect, 30, floor), 0)
+
+
+class TestBody(unittest.TestCase):
+    def test_no_tunneling_through_thin_wall(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        wall = [pygame.Rect(15, 0, 2, 10)]
+        hit_x, hit_y = Body().move(rect, 40, 0, wall)
+        self.assertEqual(hit_x, 1)
+        self.assertEqual(hit_y, 0)
+        self.assertEqual(rect.right, 15)
+
+    def test_fractional_velocity_accumulates(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        body = Body()
+        for _ in range(12):
+            body.move(rect, 0.25, 0, [])
+        self.assertEqual(rect.x, 3)
+
+    def test_landing_and_ceiling(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        tiles = [pygame.Rect(0, 30, 20, 4), pygame.Rect(0, -8, 20, 4)]
+        body = Body()
+        self.assertEqual(body.move(rect, 0, 0.4, tiles), (0, 0))
+        self.assertEqual(body.move(rect, 0, 100, tiles), (0, 1))
+        self.assertEqual(rect.bottom, 30)
+        self.assertEqual(body.move(rect, 0, -100, tiles), (0, -1))
+        self.assertEqual(rect.top, -4)
+
+    def test_long_diagonal_move_is_substepped(self):
+        # x-then-y in one step would slide along y=0 past the block
+        rect = pygame.Rect(0, 0, 10, 10)
+        block = [pygame.Rect(40, 40, 10, 10)]
+        hit_x, hit_y = Body().move(rect, 60, 60, block)
+        self.assertTrue(hit_x or hit_y)
+        self.assertFalse(rect.colliderect(block[0]))
+
+
+class TestPlayerMovement(unittest.TestCase):
+    def test_terminal_velocity_lands_on_thin_floor(self):
+        player = Player(0, 0)
+        floor = [pygame.Rect(-20, player.rect.bottom + 20, 200, 2)]
+        player.vy = 12
+        for _ in range(5):
+            player.update(1 / 60, floor)
+        self.assertTrue(player.on_ground)
+        self.assertEqual(player.rect.bottom, floor[0].top)
+
+    def test_dash_stops_at_thin_wall(self):
+        player = Player(0, 0)
+        wall = [pygame.Rect(player.rect.right + 5, -100, 2, 300)]
+        player.move_and_collide(10, 0, wall)
+        self.assertEqual(player.rect.right, wall[0].left)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from postfx import PostFX
+
+
+class TestPostFX(unittest.TestCase):
+
+    def setUp(self):
+        self.fx = PostFX((32, 24), seed=1)
+        self.surf = pygame.Surface((32, 24))
+        self.surf.fill((200, 200, 200))
+
+    def test_idle_leaves_frame_untouched(self):
+        self.assertEqual(self.fx.begin_frame(0), (0, 0))
+        self.fx.apply(self.surf, 0.0)
+        self.assertEqual(self.surf.get_at((16, 12))[:3], (200, 200, 200))
+
+    def test_shake_stays_in_range(self):
+        for _ in range(50):
+            dx, dy = self.fx.begin_frame(3)
+            self.assertTrue(-3 <= dx <= 3 and -3 <= dy <= 3)
+
+    def test_full_fade_is_black(self):
+        self.fx.fade_alpha = 255
+        self.fx.apply(self.surf, 0.0)
+        self.assertEqual(self.surf.get_at((16, 12))[:3], (0, 0, 0))
+
+    def test_flash_decays(self):
+        self.fx.flash((255, 0, 0), now=10.0, duration=0.2)
+        self.fx.apply(self.surf, 10.05)
+        self.assertGreater(self.surf.get_at((16, 12)).r, 200)
+        self.assertLess(self.surf.get_at((16, 12)).g, 200)
+        self.fx.apply(self.surf, 10.5)
+        self.assertEqual(self.fx.flash_duration, 0.0)
+
+    def test_vignette_darkens_edges_only(self):
+        self.fx.vignette_strength = 1.0
+        self.fx.apply(self.surf, 0.0)
+        self.assertEqual(self.surf.get_at((16, 12))[:3], (200, 200, 200))
+        self.assertLess(self.surf.get_at((0, 0)).r, 150)
+
+    def test_no_surfaces_allocated_per_frame(self):
+        self.fx.fade_alpha = 100
+        self.fx.vignette_strength = 0.5
+        self.fx.set_tint((0, 0, 255), 40)
+        self.fx.apply(self.surf, 0.0)
+        buffers = (self.fx._fade, self.fx._tint, self.fx._vignette)
+        self.fx.apply(self.surf, 0.0)
+        self.assertEqual((self.fx._fade, self.fx._tint, self.fx._vignette), buffers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+pygame.init()
+
+from present import Presenter
+
+
+class TestPresenter(unittest.TestCase):
+    def setUp(self):
+        self.screen = pygame.display.set_mode((60, 40))
+        self.presented = []
+        self.presenter = Presenter(self.screen, (30, 20),
+                                   lambda t, payload: self.presented.append(payload))
+
+    def tearDown(self):
+        self.presenter.close()
+
+    def test_frames_presented_in_order(self):
+        for i in range(6):
+            self.presenter.back().fill((i * 40, 0, 0))
+            self.presenter.submit(i)
+        self.presenter.finish()
+        self.assertEqual(self.presented, list(range(6)))
+        self.assertEqual(self.presenter.presented, 6)
+
+    def test_last_frame_scaled_to_screen(self):
+        self.presenter.back().fill((0, 200, 0))
+        self.presenter.submit()
+        self.presenter.finish()
+        self.assertEqual(self.screen.get_at((59, 39))[:3], (0, 200, 0))
+
+    def test_buffers_alternate(self):
+        first = self.presenter.back()
+        self.presenter.submit()
+        self.assertIsNot(self.presenter.back(), first)
+        self.presenter.submit()
+        self.assertIs(self.presenter.back(), first)
+
+    def test_frame_flipped_on_next_submit(self):
+        self.presenter.submit("a")
+        self.presenter.submit("b")
+        self.assertEqual(self.presented, ["a"])
+        self.presenter.finish()
+        self.assertEqual(self.presented, ["a", "b"])
+
+    def test_worker_error_reaches_main_thread(self):
+        self.presenter.size = (10, 10)  # does not match the screen
+        self.presenter.submit()
+        with self.assertRaises(ValueError):
+            self.presenter.finish()
+        self.assertEqual(self.presented, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from projectiles import (ProjectilePool, PROJECTILE_KINDS, ARROW, WEB, BOSS_SHOT,
+                         OWNER_PLAYER, OWNER_ENEMY)
+from level import LevelGrid
+from boss import Boss
+import game_clock
+
+
+class Target:
+    def __init__(self, x, y, w=16, h=16):
+        self.rect = pygame.Rect(x, y, w, h)
+
+
+class TestProjectilePool(unittest.TestCase):
+
+    def test_spawn_moves_and_expires(self):
+        pool = ProjectilePool()
+        pool.spawn(BOSS_SHOT, 100, 100, 3, 4)
+        pool.update()
+        k = PROJECTILE_KINDS[BOSS_SHOT]
+        self.assertAlmostEqual(pool.xs[0], 100 - k.width / 2 + k.speed * 0.6)
+        self.assertAlmostEqual(pool.ys[0], 100 - k.height / 2 + k.speed * 0.8)
+        for _ in range(k.lifetime):
+            pool.update()
+        self.assertEqual(len(pool), 0)
+
+    def test_capacity_is_fixed(self):
+        pool = ProjectilePool(capacity=4)
+        for _ in range(6):
+            pool.spawn(ARROW, 0, 0, 1)
+        self.assertEqual(len(pool), 4)
+        self.assertEqual(pool.dropped, 2)
+
+    def test_solid_tile_and_level_bounds_stop_projectiles(self):
+        # one solid cell at column 3
+        grid = LevelGrid(6, 1, bytearray([0, 0, 0, 1, 0, 0]), tile_size=16)
+        pool = ProjectilePool()
+        pool.spawn(BOSS_SHOT, 20, 8, 1)
+        pool.spawn(BOSS_SHOT, 20, 8, -1)
+        for _ in range(10):
+            pool.update(grid, level_width=96)
+        self.assertEqual(len(pool), 0)
+
+    def test_hits_by_owner(self):
+        pool = ProjectilePool()
+        near, far = Target(50, 0), Target(400, 0)
+        pool.spawn(ARROW, 55, 8, 1)
+        pool.spawn(WEB, 405, 8, 1)
+        pool.spawn(ARROW, 200, 8, 1)
+        hits = pool.hits(OWNER_PLAYER, [far, near])
+        self.assertEqual(hits, [(0, near)])
+        self.assertEqual(pool.hits(OWNER_ENEMY, [far]), [(1, far)])
+        pool.remove_many([1, 0])
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.kinds[0], ARROW)
+
+    def test_many_projectiles_against_many_targets(self):
+        pool = ProjectilePool()
+        targets = [Target(x * 20, 0) for x in range(200)]
+        for x in range(400):
+            pool.spawn(ARROW, x * 10 + 3, 8, 1)
+        self.assertEqual(len(pool.hits(OWNER_PLAYER, targets)), 400)
+
+    def test_boss_fires_on_cooldown(self):
+        for step in (1 / 60, 1 / 30):
+            clock = game_clock.SimClock()
+            game_clock.install(clock)
+            try:
+                boss = Boss(100, 100)
+                # far enough that the boss cannot walk past the player before firing
+                player = pygame.Rect(2000, 100, 20, 20)
+                while not boss.shot and clock.t - 1000.0 < 5:
+                    clock.advance(step)
+                    boss.update([], player)
+                self.assertEqual(boss.shot[0], BOSS_SHOT)
+                self.assertGreater(boss.shot[1], 0)
+                # fires on game time, whatever the frame step
+                self.assertAlmostEqual(clock.t - 1000.0, boss.attack_cooldown, delta=step)
+            finally:
+                game_clock.install(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import pygame
+pygame.init()
+
+import quality
+from quality import QualityGovernor, QUALITY_TIERS, MAX_LEVEL
+from aoe_fx import ring_animation, tier_rings
+from player import Player
+
+
+class TestQuality(unittest.TestCase):
+
+    def tearDown(self):
+        quality.set_level(MAX_LEVEL)
+
+    def test_full_tier_matches_original_density(self):
+        full = QUALITY_TIERS[MAX_LEVEL]
+        self.assertEqual((full.dash_trail, full.wizard_layers, full.worrier_rings, full.hit_particles), (3, 3, 3, 5))
+        quality.set_level(99)
+        self.assertEqual(quality.level(), MAX_LEVEL)
+        quality.set_level(-1)
+        self.assertEqual(quality.tier(), QUALITY_TIERS[0])
+
+    def test_governor_steps_down_when_over_budget(self):
+        gov = QualityGovernor(60, window=10)
+        for _ in range(10):
+            gov.observe(0.020)
+        self.assertEqual(quality.level(), MAX_LEVEL - 1)
+
+    def test_governor_steps_up_only_after_calm_windows(self):
+        quality.set_level(0)
+        gov = QualityGovernor(60, window=10)
+        for _ in range(10 * (quality.UP_AFTER - 1)):
+            gov.observe(0.002)
+        self.assertEqual(quality.level(), 0)
+        for _ in range(10):
+            gov.observe(0.002)
+        self.assertEqual(quality.level(), 1)
+
+    def test_governor_holds_inside_band(self):
+        gov = QualityGovernor(60, window=10)
+        for _ in range(100):
+            gov.observe(0.012)
+        self.assertEqual(quality.level(), MAX_LEVEL)
+        self.assertEqual(gov.changes, 0)
+
+    def test_low_quality_rings_are_cached_separately(self):
+        low = QUALITY_TIERS[0]
+        self.assertIsNot(ring_animation(30, rings=low.worrier_rings, particles=0, wave=False), ring_animation(30))
+        self.assertIs(tier_rings(30, QUALITY_TIERS[MAX_LEVEL]), ring_animation(30))
+
+    def test_drawing_leaves_gameplay_rng_alone(self):
+        surf = pygame.Surface((200, 100))
+        for char_class in ("Wizard", "Worrier"):
+            player = Player(50, 40, char_class)
+            for level in range(MAX_LEVEL + 1):
+                quality.set_level(level)
+                random.seed(7)
+                state = random.getstate()
+                player.draw(surf)
+                player.attack()
+                player.draw(surf)
+                self.assertEqual(random.getstate(), state)
+
+
+if __name__ == '__main__':
+    unittest.main()
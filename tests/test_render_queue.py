@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from render_queue import RenderQueue, Immediate, target, LAYER_TILES, LAYER_PLAYER
+
+
+def solid(color, size=(4, 4)):
+    s = pygame.Surface(size)
+    s.fill(color)
+    return s
+
+
+class TestRenderQueue(unittest.TestCase):
+
+    def test_layers_flush_back_to_front(self):
+        queue = RenderQueue()
+        surf = pygame.Surface((8, 8))
+        queue.layer(LAYER_PLAYER).blit(solid((255, 0, 0)), (0, 0))
+        queue.layer(LAYER_TILES).blit(solid((0, 255, 0)), (0, 0))
+        queue.layer(LAYER_TILES).blit(solid((0, 0, 255)), (4, 4))
+        self.assertEqual(queue.flush(surf), 3)
+        self.assertEqual(surf.get_at((1, 1))[:3], (255, 0, 0))
+        self.assertEqual(surf.get_at((5, 5))[:3], (0, 0, 255))
+        self.assertEqual(len(queue), 0)
+
+    def test_deferred_calls_keep_their_place(self):
+        queue = RenderQueue()
+        surf = pygame.Surface((8, 8))
+        layer = queue.layer(LAYER_TILES)
+        layer.blit(solid((0, 255, 0)), (0, 0))
+        layer.draw(pygame.draw.rect, (255, 255, 255), (0, 0, 2, 2))
+        layer.blit(solid((0, 0, 255), (1, 1)), (0, 0))
+        queue.flush(surf)
+        self.assertEqual(surf.get_at((0, 0))[:3], (0, 0, 255))
+        self.assertEqual(surf.get_at((1, 1))[:3], (255, 255, 255))
+        self.assertEqual((queue.blits, queue.batches, queue.calls), (2, 2, 1))
+
+    def test_area_and_flags(self):
+        queue = RenderQueue()
+        surf = pygame.Surface((8, 8))
+        surf.fill((10, 10, 10))
+        queue.layer(LAYER_TILES).blit(solid((20, 0, 0)), (0, 0), None, pygame.BLEND_ADD)
+        queue.layer(LAYER_TILES).blit(solid((0, 50, 0)), (4, 4), pygame.Rect(0, 0, 1, 1))
+        queue.flush(surf)
+        self.assertEqual(surf.get_at((0, 0))[:3], (30, 10, 10))
+        self.assertEqual(surf.get_at((4, 4))[:3], (0, 50, 0))
+        self.assertEqual(surf.get_at((5, 5))[:3], (10, 10, 10))
+
+    def test_target_without_queue_draws_immediately(self):
+        surf = pygame.Surface((8, 8))
+        out = target(surf, None, LAYER_PLAYER)
+        self.assertIsInstance(out, Immediate)
+        out.blit(solid((255, 0, 0)), (0, 0))
+        out.draw(pygame.draw.rect, (0, 255, 0), (6, 6, 2, 2))
+        self.assertEqual(surf.get_at((0, 0))[:3], (255, 0, 0))
+        self.assertEqual(surf.get_at((7, 7))[:3], (0, 255, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
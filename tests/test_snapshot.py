@@ -0,0 +1,95 @@
+import unittest
+import random
+import time
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from game_states import GameStateManager
+from snapshot import pack_state, unpack_state
+from worry_sphere import WorrySphere
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1)
+        self.gsm = GameStateManager(pygame.Surface((10, 10)))
+        self.gsm.start_new("Worrier")
+        self.now = time.time()
+
+    def test_roundtrip_is_stable(self):
+        self.gsm.aoe.add(WorrySphere(100, 200))
+        self.gsm.player.health = 55
+        self.gsm.enemies[0].health = 12.5
+        self.gsm.checkpoints[0]['activated'] = True
+        self.gsm.checkpoints[0]['activation_time'] = self.now - 0.5
+        blob = pack_state(self.gsm, self.now)
+
+        other = GameStateManager(pygame.Surface((10, 10)))
+        unpack_state(other, blob, self.now)
+        self.assertEqual(pack_state(other, self.now), blob)
+        self.assertEqual(other.player.char_class, "Worrier")
+        self.assertEqual(other.player.health, 55)
+        self.assertEqual([e.kind for e in other.enemies], [e.kind for e in self.gsm.enemies])
+        self.assertEqual(other.enemies[0].health, 12.5)
+        self.assertEqual(len(other.aoe), 1)
+        self.assertTrue(other.checkpoints[0]['activated'])
+        self.assertEqual(other.tiles, self.gsm.tiles)
+
+    def test_timers_are_relative(self):
+        self.gsm.hitstop_until = self.now + 0.25
+        blob = pack_state(self.gsm, self.now)
+        unpack_state(self.gsm, blob, self.now + 10)
+        self.assertAlmostEqual(self.gsm.hitstop_until, self.now + 10.25)
+
+    def test_restore_rewinds_world(self):
+        blob = self.gsm.snapshot()
+        x, y = self.gsm.player.rect.topleft
+        defeated = self.gsm.enemies_defeated
+        self.gsm.player.rect.x += 300
+        self.gsm.enemies = []
+        self.gsm.enemies_defeated = 7
+        self.gsm.restore(blob)
+        self.assertEqual(self.gsm.player.rect.topleft, (x, y))
+        self.assertEqual(len(self.gsm.enemies), 3)
+        self.assertEqual(self.gsm.enemies_defeated, defeated)
+
+    def test_rng_state_restored(self):
+        blob = self.gsm.snapshot()
+        expected = [random.random() for _ in range(5)]
+        self.gsm.restore(blob)
+        self.assertEqual([random.random() for _ in range(5)], expected)
+
+    def test_respawn_restores_checkpoint(self):
+        gsm = self.gsm
+        gsm.enemies_defeated = 0
+        gsm.checkpoint_state = gsm.snapshot()
+        gsm.enemies_defeated = 5
+        gsm.player.health = 0
+        gsm.update(1 / 60, {})
+        lives = gsm.lives
+        gsm.respawn_time = time.time() - 1
+        gsm.update(1 / 60, {})
+        self.assertEqual(gsm.enemies_defeated, 0)
+        self.assertEqual(gsm.lives, lives)
+        self.assertEqual(gsm.player.health, gsm.player.max_health)
+
+    def test_snapshot_is_compact_and_fast(self):
+        blob = self.gsm.snapshot()
+        self.assertLess(len(blob), 4096)
+        t = time.perf_counter()
+        for _ in range(50):
+            self.gsm.restore(blob)
+        self.assertLess((time.perf_counter() - t) / 50, 0.005)
+
+    def test_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            self.gsm.restore(b"x" * 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from soak import AllocationProfiler, GrowthDetector, surface_memory, soak
+
+
+class TestGrowthDetector(unittest.TestCase):
+    def test_flags_steady_growth_only(self):
+        detector = GrowthDetector(span=4, warmup=1, min_growth=10)
+        for i in range(8):
+            detector.add({"leaky": 100 + 20 * i, "steady": 50 + (i % 2) * 30, "flat": 7})
+        growing = detector.growing()
+        self.assertEqual([g[0] for g in growing], ["leaky"])
+        self.assertEqual(growing[0][1:], (180, 240))
+
+    def test_needs_a_full_span(self):
+        detector = GrowthDetector(span=5, warmup=0, min_growth=1)
+        for i in range(4):
+            detector.add({"x": i * 100})
+        self.assertEqual(detector.growing(), [])
+
+    def test_warmup_samples_ignored(self):
+        detector = GrowthDetector(span=3, warmup=2, min_growth=1)
+        for value in (10, 500, 600, 600, 600):
+            detector.add({"cache": value})
+        self.assertEqual(detector.growing(), [])
+
+
+class TestMeasurements(unittest.TestCase):
+    def test_surface_memory_counts_held_surfaces(self):
+        before_count, before_bytes = surface_memory()
+        held = [pygame.Surface((100, 100), pygame.SRCALPHA)]
+        count, size = surface_memory()
+        self.assertEqual(count, before_count + 1)
+        self.assertGreaterEqual(size - before_bytes, 100 * 100 * 4)
+        del held
+
+    def test_profiler_reports_retained_site(self):
+        profiler = AllocationProfiler(window=5)
+        kept = []
+        profiler.start()
+        try:
+            for _ in range(5):
+                profiler.begin_frame()
+                kept.append(bytearray(10000))
+                profiler.end_frame()
+        finally:
+            profiler.stop()
+        self.assertTrue(all(r >= 10000 for r in profiler.retained))
+        self.assertTrue(any("test_soak.py" in site and size >= 10000
+                            for site, size, _ in profiler.sites))
+        self.assertIn("retained per frame by call site", profiler.report())
+
+
+class TestSoak(unittest.TestCase):
+    def test_short_soak_samples(self):
+        samples = []
+        result = soak(seed=1, hours=10 / 3600, sample_every=2.5,
+                      on_sample=lambda t, games, values: samples.append((t, values)))
+        self.assertEqual(result["frames"], 600)
+        self.assertEqual(len(samples), 4)
+        self.assertGreater(samples[-1][1]["pygame.Surface"], 0)
+
+    def test_next_game_plays_after_an_ending(self):
+        games = []
+        # one life and lethal enemies, so games end within seconds
+        result = soak(seed=1, hours=40 / 3600, sample_every=1.0, draw=False,
+                      params={"gsm.lives": 0, "enemy.*.damage": 1000},
+                      on_sample=lambda t, n, values: games.append(n))
+        self.assertGreaterEqual(result["games"], 2)
+        # the second game lasts seconds, not a frame per restart
+        self.assertGreater(games.count(2), 2)
+        self.assertLess(result["games"], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
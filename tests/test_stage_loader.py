@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import stage_loader
+from stage_loader import StagePreloader
+from level_compiler import load_level
+
+
+class TestStagePreloader(unittest.TestCase):
+    def setUp(self):
+        self.real_load = stage_loader.load_level
+        self.gates = {0: threading.Event(), 1: threading.Event()}
+
+        def slow_load(idx):
+            self.gates[idx].wait(5)
+            return self.real_load(idx)
+        stage_loader.load_level = slow_load
+
+    def tearDown(self):
+        stage_loader.load_level = self.real_load
+
+    def test_superseded_request_does_not_overwrite(self):
+        pre = StagePreloader()
+        pre.request(0)
+        first = pre._thread
+        pre.request(1)
+        self.gates[1].set()
+        pre._thread.join()
+        # the stale stage 0 load finishes last
+        self.gates[0].set()
+        first.join()
+        self.assertTrue(pre.ready(1))
+        level, flow = pre.take(1)
+        self.assertIs(level, load_level(1))
+        self.assertIs(flow.grid, level.grid)
+
+    def test_flow_field_built_toward_spawn(self):
+        pre = StagePreloader()
+        size = (36, 54)
+        pre.request(1, size)
+        self.gates[1].set()
+        level, flow = pre.take(1)
+        # the first update on the main thread finds the field already aimed
+        self.assertEqual(flow.builds, 1)
+        self.assertFalse(flow.update(pygame.Rect(level.spawn, size)))
+
+    def test_take_without_preload_loads_directly(self):
+        self.gates[0].set()
+        level, flow = StagePreloader().take(0)
+        self.assertIs(level, load_level(0))
+        self.assertIsNone(flow)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+import game_clock
+import sweep
+from game_states import GameStateManager
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_simulation_is_reproducible(self):
+        a = sweep.simulate(3, {}, "Wizard", max_time=20)
+        b = sweep.simulate(3, {}, "Wizard", max_time=20)
+        self.assertEqual(a, b)
+        self.assertEqual(a["ending"], "Timeout")
+        self.assertAlmostEqual(a["time"], 20, delta=0.1)
+
+    def test_simulation_restores_wall_clock(self):
+        sweep.simulate(1, {}, "Wizard", max_time=1)
+        self.assertGreater(game_clock.now(), 1e9)
+
+    def test_apply_params(self):
+        gsm = GameStateManager(pygame.Surface((1, 1)))
+        sweep.apply_params(gsm, {"gsm.good_ending_threshold": 3,
+                                 "stage.enemies_to_defeat": 4,
+                                 "enemy.grub.damage": 1})
+        gsm.start_new("Wizard")
+        self.assertEqual(gsm.good_ending_threshold, 3)
+        self.assertEqual(gsm.enemies_to_defeat, 4)
+        grub = gsm.make_enemy(0, 0, "grub")
+        self.assertEqual(grub.damage, 1)
+        self.assertNotEqual(gsm.make_enemy(0, 0, "spider").damage, 1)
+        with self.assertRaises(ValueError):
+            sweep.apply_params(gsm, {"bogus.x": 1})
+
+    def test_param_points_and_summary(self):
+        specs = [sweep.parse_param("stage.max_enemies=5,10"), sweep.parse_param("gsm.lives=1,2.5")]
+        points = sweep.param_points(specs)
+        self.assertEqual(len(points), 4)
+        self.assertIn({"stage.max_enemies": 10, "gsm.lives": 2.5}, points)
+        results = [
+            {"params": points[0], "ending": "Good", "cleared": True, "time": 10.0, "deaths": 1, "damage_taken": 5},
+            {"params": points[0], "ending": "Timeout", "cleared": False, "time": 60.0, "deaths": 0, "damage_taken": 1},
+        ]
+        rows = sweep.summarize(results)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["clear%"], 50.0)
+        self.assertEqual(rows[0]["Good"], 1)
+        self.assertIn("clear%", sweep.format_table(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+pygame.init()
+
+from world_ui import WorldOverlay, bar_frame, health_bucket, ENEMY_BAR, BOSS_BAR, BAR_BUCKETS
+from enemy import Enemy
+from boss import Boss
+
+
+class TestWorldUI(unittest.TestCase):
+
+    def test_buckets(self):
+        self.assertEqual(health_bucket(0), 0)
+        self.assertEqual(health_bucket(0.001), 1)
+        self.assertEqual(health_bucket(1.0), BAR_BUCKETS)
+        self.assertEqual(health_bucket(1.1), BAR_BUCKETS)
+        self.assertEqual(health_bucket(-0.5), 0)
+
+    def test_frames_are_cached_per_bucket(self):
+        self.assertIs(bar_frame(ENEMY_BAR, 0.50), bar_frame(ENEMY_BAR, 0.49))
+        self.assertIsNot(bar_frame(ENEMY_BAR, 0.5), bar_frame(BOSS_BAR, 0.5))
+
+    def test_bar_colors_follow_health(self):
+        full = bar_frame(ENEMY_BAR, 1.0)
+        low = bar_frame(ENEMY_BAR, 0.1)
+        self.assertEqual(full.get_at((2, 1))[:3], (100, 255, 100))
+        self.assertEqual(low.get_at((1, 1))[:3], (255, 100, 100))
+        self.assertEqual(low.get_at((20, 1))[:3], (60, 60, 60))
+
+    def test_entities_queue_bars_and_flush_once(self):
+        overlay = WorldOverlay()
+        surf = pygame.Surface((200, 100))
+        enemies = [Enemy(10 + 30 * i, 40) for i in range(4)]
+        for e in enemies:
+            e.draw(surf, 0, 0, overlay)
+        Boss(100, 30).draw(surf, 0, 0, overlay)
+        self.assertEqual(len(overlay), 5)
+        self.assertEqual(overlay.flush(surf), 5)
+        self.assertEqual(len(overlay), 0)
+        self.assertEqual(surf.get_at((16, 33))[:3], (100, 255, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()